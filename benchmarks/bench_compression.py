@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Benchmark compressed sru pages, bandwidth and time to the parsed records.
+
+The responses are streamed through the urllib3 decoder into the parser,
+like AlmaAPIBase.get_iter does. The transfer time is computed for the
+given bandwidth.
+
+Run it with: python -m benchmarks.bench_compression --mbit 20
+"""
+
+import zlib
+from gzip import compress
+from io import BytesIO
+from timeit import repeat
+
+from click import command, echo, option
+from urllib3.response import HTTPResponse
+
+from invenio_alma.services.sru import AlmaSRU
+
+from .payloads import mms_ids, sru_page
+
+
+def encode(page: bytes, encoding: str) -> bytes:
+    """Compress the page like a http server with the content encoding."""
+    if encoding == "gzip":
+        return compress(page, compresslevel=6)
+    if encoding == "deflate":
+        return zlib.compress(page, 6)
+    return page
+
+
+def stream_records(sru: AlmaSRU, body: bytes, encoding: str) -> int:
+    """Decompress the body while the records are parsed, get the record count."""
+    headers = {"content-encoding": encoding} if encoding != "identity" else {}
+    response = HTTPResponse(
+        body=BytesIO(body),
+        headers=headers,
+        preload_content=False,
+        decode_content=True,
+    )
+    return sum(1 for _ in sru.iter_alma_records(response))
+
+
+def best_of(sru: AlmaSRU, body: bytes, encoding: str, number: int) -> float:
+    """Get the best time to decode and parse the body in seconds."""
+    timings = repeat(lambda: stream_records(sru, body, encoding), number=number)
+    return min(timings) / number
+
+
+@command()
+@option("--records", default=50, help="records per sru page")
+@option("--mbit", default=20.0, help="bandwidth to the alma host in mbit/s")
+@option("--number", default=20, help="calls per measurement")
+def main(records: int, mbit: float, number: int) -> None:
+    """Compare the encodings of a sru page."""
+    sru = AlmaSRU()
+    page = sru_page(mms_ids(records)).encode("utf-8")
+    echo(f"sru page with {records} records at {mbit} mbit/s")
+
+    for encoding in ("identity", "gzip", "deflate"):
+        body = encode(page, encoding)
+        assert stream_records(sru, body, encoding) == records
+
+        parse = best_of(sru, body, encoding, number)
+        transfer = len(body) * 8 / (mbit * 1_000_000)
+
+        echo(
+            f"{encoding:>8}: {len(body) / 1024:7.1f} KiB "
+            f"({len(body) / len(page):4.0%}), transfer {transfer * 1000:7.2f} ms, "
+            f"decode+parse {parse * 1000:6.2f} ms, "
+            f"total {(transfer + parse) * 1000:7.2f} ms",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Benchmark the xml parser backends on marcxml payloads.
+
+Run it with: python -m benchmarks.bench_parsers
+"""
+
+from io import BytesIO
+from timeit import repeat
+
+from click import command, echo, option
+
+from invenio_alma.services.parsers import ElementTreeParser, LxmlParser, XMLParser
+from invenio_alma.services.sru import AlmaSRU
+
+from .payloads import SLIM, mms_ids, sru_page
+
+
+def best_of(func: object, number: int) -> float:
+    """Get the best time of one call in seconds."""
+    return min(repeat(func, number=number, repeat=5)) / number
+
+
+def bench_parser(parser: XMLParser, page: bytes, number: int) -> dict[str, float]:
+    """Measure parse, extraction and field lookup of one parser backend."""
+    sru = AlmaSRU(parser=parser)
+    root = sru.parse_alma_record(page)
+    path = f".//{{{SLIM}}}datafield[@tag='856']/{{{SLIM}}}subfield[@code='u']"
+
+    return {
+        "parse": best_of(lambda: sru.parse_alma_record(page), number),
+        "extract": best_of(lambda: sru.extract_alma_records(page), number),
+        "stream": best_of(lambda: list(sru.iter_alma_records(BytesIO(page))), number),
+        "lookup": best_of(lambda: root.findall(path), number),
+    }
+
+
+@command()
+@option("--records", default=50, help="records per sru page")
+@option("--number", default=20, help="calls per measurement")
+def main(records: int, number: int) -> None:
+    """Compare the parser backends."""
+    page = sru_page(mms_ids(records)).encode("utf-8")
+    echo(f"sru page with {records} records, {len(page) / 1024:.0f} KiB")
+
+    for parser in (ElementTreeParser(), LxmlParser()):
+        results = bench_parser(parser, page, number)
+        timings = ", ".join(
+            f"{name} {seconds * 1000:.2f} ms ({records / seconds:.0f} records/s)"
+            for name, seconds in results.items()
+        )
+        echo(f"{parser.name:>6}: {timings}")
+
+
+if __name__ == "__main__":
+    main()
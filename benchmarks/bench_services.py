@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Benchmark the alma services against the fake alma server.
+
+Measured are the latency of single calls, the throughput of the bulk
+calls, the parse cost per response and the peak memory of a streamed
+search. The latency of the fake server is added to every call, keep it at
+0 to measure the overhead of the services.
+
+Every measurement is the median of --repeat runs after a warm-up run.
+
+Run it with: python -m benchmarks.bench_services --save
+Compare with a release: python -m benchmarks.bench_services --compare 0.14.2
+"""
+
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict
+from datetime import date
+from statistics import mean
+from time import perf_counter
+
+from click import command, echo, option
+
+from invenio_alma.services import AlmaRESTService, AlmaSRUService
+from invenio_alma.services.config import (
+    AlmaRESTConfig,
+    AlmaRetryConfig,
+    AlmaSRUConfig,
+)
+from invenio_alma.services.metrics import AlmaMetrics, MemoryMetricsExporter
+from invenio_alma.services.retry import AlmaRetryPolicy
+
+from .payloads import mms_ids
+from .results import (
+    compare_results,
+    latency,
+    repeated,
+    results_path,
+    save_results,
+)
+from .server import FakeAlma, FakeAlmaConfig
+
+
+def timed(func: Callable[[], object], calls: int) -> list[float]:
+    """Call the function and get the duration of every call in seconds."""
+    timings = []
+    for _ in range(calls):
+        start = perf_counter()
+        func()
+        timings.append(perf_counter() - start)
+    return timings
+
+
+def throughput(func: Callable[[], int]) -> dict[str, float]:
+    """Get the records per second and the peak memory of the bulk call.
+
+    The memory is traced in a second call, tracing slows the call down.
+    """
+    start = perf_counter()
+    records = func()
+    elapsed = perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"records_per_s": records / elapsed, "peak_kib": peak / 1024}
+
+
+def parse_cost(exporter: MemoryMetricsExporter, api: str) -> dict[str, float]:
+    """Get the mean parse duration per response of the api in milliseconds."""
+    key = ("alma_parse_duration_seconds", ("operation", api))
+    return {"parse_ms": mean(exporter.observations[key]) * 1000}
+
+
+def bench_services(alma: FakeAlma, calls: int, records: int) -> dict[str, dict]:
+    """Run the benchmarks of the sru and rest service."""
+    exporter = MemoryMetricsExporter()
+    metrics = AlmaMetrics(exporter)
+    retry = AlmaRetryPolicy(AlmaRetryConfig(max_attempts=5, backoff_factor=0.01))
+
+    sru = AlmaSRUService(
+        AlmaSRUConfig("mms_id", alma.url, "INST"),
+        retry=retry,
+        metrics=metrics,
+    )
+    rest = AlmaRESTService(
+        AlmaRESTConfig("key", alma.url, "30"),
+        retry=retry,
+        metrics=metrics,
+    )
+    ids = mms_ids(calls)
+    cms_ids = [f"cms-{mms_id}" for mms_id in mms_ids(records)]
+    alma.config.modified_records = records
+
+    results = {
+        "sru_get_record": latency(timed(lambda: sru.get_record(ids[0]), calls)),
+        "rest_get_record": latency(timed(lambda: rest.get_record(ids[0]), calls)),
+    }
+    # before the bulk calls, their streamed pages include the reading
+    results["sru_get_record"].update(parse_cost(exporter, "sru"))
+    results["rest_get_record"].update(parse_cost(exporter, "rest"))
+
+    results["rest_update_field"] = latency(
+        timed(lambda: rest.update_field(ids[0], "856.4._.u", "new"), calls),
+    )
+    results["sru_get_records"] = throughput(
+        lambda: len(sru.get_records(cms_ids, "local_field_995")),
+    )
+    results["sru_search_modified"] = throughput(
+        lambda: sum(1 for _ in sru.search_modified_since(date(2026, 1, 1))),
+    )
+
+    sru.close()
+    rest.close()
+    return results
+
+
+@command()
+@option("--calls", default=100, help="calls per latency measurement")
+@option("--repeat", default=5, help="runs whose median is kept")
+@option("--records", default=500, help="records of the bulk calls")
+@option(
+    "--latency",
+    "delay",
+    default=0.0,
+    help="seconds the fake alma delays a response",
+)
+@option("--error-rate", default=0.0, help="share of requests answered with 503")
+@option("--fields", default=40, help="datafields per record")
+@option("--save", is_flag=True, help="store the results of this release")
+@option("--compare", default="", help="release to compare the results with")
+def main(
+    *,
+    calls: int,
+    repeat: int,
+    records: int,
+    delay: float,
+    error_rate: float,
+    fields: int,
+    save: bool,
+    compare: str,
+) -> None:
+    """Benchmark the alma services."""
+    config = FakeAlmaConfig(latency=delay, error_rate=error_rate, fields=fields)
+    options = {"calls": calls, "repeat": repeat, "records": records, **asdict(config)}
+
+    with FakeAlma(config) as alma:
+        results = repeated(lambda: bench_services(alma, calls, records), repeat)
+        echo(f"fake alma answered {alma.stats.requests}, {alma.stats.errors} errors")
+
+    for case, metrics in results.items():
+        values = ", ".join(f"{metric} {value:.2f}" for metric, value in metrics.items())
+        echo(f"{case:>20}: {values}")
+
+    if compare:
+        for line in compare_results(
+            "services",
+            results,
+            options,
+            results_path(compare),
+        ):
+            echo(line)
+
+    if save:
+        echo(f"stored in {save_results('services', results, options)}")
+
+
+if __name__ == "__main__":
+    main()
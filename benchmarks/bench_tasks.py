@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Benchmark the loops of the create and update tasks against the fake alma.
+
+The tasks run in the process like a celery worker runs them, without
+chunk sub-tasks. The update function fetches the alma record by the cms
+id, the create function checks for a duplicate and posts a new record.
+The repository side, records and indexing, is not part of it.
+
+Every measurement is the median of --repeat runs after a warm-up run.
+
+Run it with: python -m benchmarks.bench_tasks --concurrency 4 --save
+"""
+
+import tracemalloc
+from collections.abc import Iterator
+from time import perf_counter
+
+from click import command, echo, option
+from flask import Flask
+
+from invenio_alma.ext import InvenioAlma
+from invenio_alma.services import AlmaRESTService, AlmaSRUService
+from invenio_alma.services.metrics import MemoryMetricsExporter
+from invenio_alma.tasks import (
+    TaskEntry,
+    create_alma_records,
+    run_task,
+    update_repository_records,
+)
+from invenio_alma.utils import is_duplicate_in_alma
+
+from .payloads import marc_record, mms_ids
+from .results import compare_results, repeated, results_path, save_results
+from .server import FakeAlma, FakeAlmaConfig
+
+
+def update_func(_: object, __: str, cms_id: str, alma: AlmaSRUService) -> None:
+    """Fetch the alma record of the entry like an update function."""
+    alma.get_record(cms_id, "local_field_995")
+
+
+def create_func(_: object, pid: str, cms_id: str, alma: AlmaRESTService) -> None:
+    """Create the alma record of the entry if it is not a duplicate."""
+    if not is_duplicate_in_alma(cms_id):
+        alma.create_alma_record(alma.service.parse_alma_record(marc_record(pid)))
+
+
+def build_app(alma: FakeAlma, entries: int, concurrency: int, config: dict) -> Flask:
+    """Build the app with the benchmark workflows against the fake alma."""
+
+    def update_entries() -> Iterator[TaskEntry]:
+        return (TaskEntry(mms_id, f"cms-{mms_id}") for mms_id in mms_ids(entries))
+
+    def create_entries() -> Iterator[TaskEntry]:
+        return (TaskEntry(mms_id, f"new-{mms_id}") for mms_id in mms_ids(entries))
+
+    app = Flask("benchmarks")
+    app.config.update(
+        ALMA_API_KEY="key",
+        ALMA_API_HOST=alma.url,
+        ALMA_SRU_DOMAIN=alma.url,
+        ALMA_SRU_INSTITUTION_CODE="INST",
+        ALMA_TASK_CONCURRENCY=concurrency,
+        ALMA_RATE_LIMIT_PER_SECOND=10_000.0,
+        ALMA_RATE_LIMIT_BURST=10_000,
+        ALMA_RECORD_CACHE_TTL=0,
+        ALMA_METRICS_EXPORTER=MemoryMetricsExporter(),
+        ALMA_REPOSITORY_RECORDS_UPDATE_AGGREGATORS={"bench": update_entries},
+        ALMA_REPOSITORY_RECORDS_UPDATE_FUNCS={"bench": update_func},
+        ALMA_ALMA_RECORDS_CREATE_AGGREGATORS={"bench": create_entries},
+        ALMA_ALMA_RECORDS_CREATE_FUNCS={"bench": create_func},
+    )
+    app.config.update(config)
+    InvenioAlma(app)
+    return app
+
+
+def bench_tasks(alma: FakeAlma, entries: int, concurrency: int) -> dict[str, dict]:
+    """Run the update and create task loops, the duplicate index on and off.
+
+    Every case runs twice, the memory is traced in the second run, tracing
+    slows the run down.
+    """
+    results = {}
+    cases = {
+        "update_task": (update_repository_records, {}),
+        "create_task": (create_alma_records, {}),
+        "create_task_no_index": (
+            create_alma_records,
+            {"ALMA_DUPLICATE_INDEX_MAX_AGE": 0},
+        ),
+    }
+
+    for case, (task, config) in cases.items():
+        app = build_app(alma, entries, concurrency, config)
+        before = sum(alma.stats.requests.values())
+
+        with app.app_context():
+            kwargs = {
+                "workflow": "bench",
+                "run_id": case,
+                "chunk_size": 0,
+                "max_parallel_chunks": None,
+            }
+            start = perf_counter()
+            run_task(task, kwargs)
+            elapsed = perf_counter() - start
+            requests = sum(alma.stats.requests.values()) - before
+
+            tracemalloc.start()
+            run_task(task, kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        results[case] = {
+            "entries_per_s": entries / elapsed,
+            "requests_per_entry": requests / entries,
+            "peak_kib": peak / 1024,
+        }
+
+    return results
+
+
+@command()
+@option("--entries", default=500, help="entries of a task run")
+@option("--concurrency", default=1, help="ALMA_TASK_CONCURRENCY of the tasks")
+@option("--repeat", default=3, help="runs whose median is kept")
+@option("--latency", "delay", default=0.005, help="seconds alma delays a response")
+@option("--save", is_flag=True, help="store the results of this release")
+@option("--compare", default="", help="release to compare the results with")
+def main(
+    *,
+    entries: int,
+    concurrency: int,
+    repeat: int,
+    delay: float,
+    save: bool,
+    compare: str,
+) -> None:
+    """Benchmark the task loops."""
+    options = {
+        "entries": entries,
+        "concurrency": concurrency,
+        "repeat": repeat,
+        "latency": delay,
+    }
+
+    with FakeAlma(FakeAlmaConfig(latency=delay)) as alma:
+        results = repeated(lambda: bench_tasks(alma, entries, concurrency), repeat)
+
+    for case, metrics in results.items():
+        values = ", ".join(f"{metric} {value:.2f}" for metric, value in metrics.items())
+        echo(f"{case:>22}: {values}")
+
+    if compare:
+        for line in compare_results("tasks", results, options, results_path(compare)):
+            echo(line)
+
+    if save:
+        echo(f"stored in {save_results('tasks', results, options)}")
+
+
+if __name__ == "__main__":
+    main()
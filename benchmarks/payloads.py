@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Realistic MARCXML payloads for the benchmarks."""
+
+from random import Random
+
+SRW = "http://www.loc.gov/zing/srw/"
+SLIM = "http://www.loc.gov/MARC21/slim"
+
+
+def marc_record(mms_id: str, fields: int = 40, namespace: str = SLIM) -> str:
+    """Build a marc21 record with the typical fields of a thesis."""
+    rand = Random(mms_id)  # noqa: S311
+    xmlns = f' xmlns="{namespace}"' if namespace else ""
+    url = f"https://repository.example.org/records/{mms_id}"
+    datafields = [
+        (
+            '<datafield tag="856" ind1="4" ind2=" ">'
+            f'<subfield code="u">{url}</subfield>'
+            '<subfield code="x">Archivierte Online-Ausgabe</subfield>'
+            "</datafield>"
+        ),
+        (
+            '<datafield tag="995" ind1=" " ind2=" ">'
+            f'<subfield code="a">cms-{mms_id}</subfield>'
+            "</datafield>"
+        ),
+    ]
+    for index in range(fields):
+        tag = f"{rand.randint(100, 999)}"
+        subfields = "".join(
+            f'<subfield code="{code}">{"lorem ipsum dolor " * rand.randint(1, 6)}</subfield>'
+            for code in "abc"[: rand.randint(1, 3)]
+        )
+        datafields.append(
+            f'<datafield tag="{tag}" ind1="{index % 2}" ind2=" ">{subfields}</datafield>',
+        )
+
+    return (
+        f"<record{xmlns}>"
+        "<leader>00000nam a2200000 c 4500</leader>"
+        f'<controlfield tag="001">{mms_id}</controlfield>'
+        '<controlfield tag="005">20260101120000.0</controlfield>'
+        f'<controlfield tag="009">AC{mms_id[-8:]}</controlfield>'
+        f"{''.join(datafields)}"
+        "</record>"
+    )
+
+
+def sru_page(
+    mms_ids: list[str],
+    next_position: int | None = None,
+    fields: int = 40,
+) -> str:
+    """Build a sru searchRetrieve response page."""
+    records = "".join(
+        "<record><recordSchema>marcxml</recordSchema>"
+        "<recordPacking>xml</recordPacking>"
+        f"<recordData>{marc_record(mms_id, fields)}</recordData>"
+        f"<recordPosition>{position}</recordPosition></record>"
+        for position, mms_id in enumerate(mms_ids, start=1)
+    )
+    next_record = (
+        f"<nextRecordPosition>{next_position}</nextRecordPosition>"
+        if next_position
+        else ""
+    )
+    return (
+        f'<searchRetrieveResponse xmlns="{SRW}">'
+        "<version>1.2</version>"
+        f"<numberOfRecords>{len(mms_ids)}</numberOfRecords>"
+        f"<records>{records}</records>"
+        f"{next_record}"
+        "</searchRetrieveResponse>"
+    )
+
+
+def rest_bibs(mms_id: str, fields: int = 40) -> str:
+    """Build a rest api bibs response."""
+    return (
+        f"<bibs><bib><mms_id>{mms_id}</mms_id>"
+        f"{marc_record(mms_id, fields, namespace='')}</bib></bibs>"
+    )
+
+
+def mms_ids(count: int) -> list[str]:
+    """Build a list of mms ids."""
+    return [f"99{index:012}3346" for index in range(count)]
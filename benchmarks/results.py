@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Store the benchmark results per release and compare them.
+
+The results of a release are kept in results/<version>.json, one section
+per benchmark. Metrics ending with _per_s are better when higher, all
+others, durations and bytes, are better when lower.
+
+A benchmark runs several times after a warm-up run and keeps the median of
+every metric, a single run is too noisy to compare. The durations and
+throughputs still vary with the load of the machine, they have a wider
+threshold than the memory and the request counts.
+"""
+
+import json
+import platform
+from collections.abc import Callable
+from os import cpu_count
+from pathlib import Path
+from statistics import median, quantiles
+
+from invenio_alma import __version__
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+TIMING_THRESHOLD = 0.4
+"""Threshold of the metrics ending with _ms or _per_s for a regression."""
+
+
+def latency(timings: list[float]) -> dict[str, float]:
+    """Get the median and the 95th percentile of the timings in milliseconds."""
+    p95 = quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+    return {"median_ms": median(timings) * 1000, "p95_ms": p95 * 1000}
+
+
+def repeated(
+    run: Callable[[], dict[str, dict[str, float]]],
+    repeat: int,
+    warmup: int = 1,
+) -> dict[str, dict[str, float]]:
+    """Run the benchmark repeatedly and get the median of every metric.
+
+    The results of the warm-up runs are dropped, they include the first
+    connections and the imports.
+    """
+    for _ in range(warmup):
+        run()
+
+    runs = [run() for _ in range(max(1, repeat))]
+    return {
+        case: {metric: median(r[case][metric] for r in runs) for metric in metrics}
+        for case, metrics in runs[0].items()
+    }
+
+
+def machine() -> dict[str, str | int]:
+    """Get the machine the benchmarks ran on, results of others differ."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": cpu_count() or 0,
+    }
+
+
+def results_path(version: str = __version__) -> Path:
+    """Get the results file of the release."""
+    return RESULTS_DIR / f"{version}.json"
+
+
+def save_results(
+    benchmark: str,
+    results: dict,
+    options: dict,
+    path: Path | None = None,
+) -> Path:
+    """Store the results and the options of the benchmark for the release."""
+    path = path or results_path()
+    stored = json.loads(path.read_text()) if path.exists() else {}
+    stored["machine"] = machine()
+    stored[benchmark] = {**results, "options": options}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+    return path
+
+
+def is_regression(metric: str, baseline: float, value: float, threshold: float) -> bool:
+    """Check if the value is worse than the baseline by more than the threshold.
+
+    Timing metrics are compared with at least the TIMING_THRESHOLD.
+    """
+    if metric.endswith(("_ms", "_per_s")):
+        threshold = max(threshold, TIMING_THRESHOLD)
+    if metric.endswith("_per_s"):
+        return value < baseline * (1 - threshold)
+    return value > baseline * (1 + threshold)
+
+
+def compare_results(
+    benchmark: str,
+    results: dict,
+    options: dict,
+    baseline_path: Path,
+    threshold: float = 0.2,
+) -> list[str]:
+    """Compare the results with the baseline, get one line per metric.
+
+    Regressions are marked with REGRESSION. Results of other options are
+    not comparable, it is noted in the first line.
+    """
+    baseline = json.loads(baseline_path.read_text()).get(benchmark, {})
+    lines = []
+
+    if baseline.get("options", options) != options:
+        lines.append(f"baseline options differ: {baseline['options']}")
+
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            before = baseline.get(case, {}).get(metric)
+            if not before:
+                continue
+            mark = (
+                " REGRESSION" if is_regression(metric, before, value, threshold) else ""
+            )
+            lines.append(
+                f"{case}.{metric}: {before:.2f} -> {value:.2f} "
+                f"({value / before - 1:+.0%}){mark}",
+            )
+
+    return lines
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Local stand-in for the alma rest and sru apis.
+
+The server answers like alma with generated marcxml records, so the
+services can be measured over real http without the network to alma:
+
+    GET  /almaws/v1/bibs?mms_id=<mms_id>          rest record
+    PUT  /almaws/v1/bibs/<mms_id>                 rest update, echoes the record
+    POST /almaws/v1/bibs                          rest create
+    GET  /view/sru/<institution>?query=<cql>      sru page of the matching records
+
+An sru query of the form alma.<key>=<value> or ... returns one record per
+value, except for values starting with new-, alma does not know them. A
+query on alma.modification_date returns modified_records records page by
+page. Every response is delayed by latency seconds and a share of
+error_rate requests is answered with 503.
+
+Run it standalone with: python -m benchmarks.server --port 8000
+"""
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from random import Random
+from threading import Lock, Thread
+from time import sleep
+from types import TracebackType
+from typing import Self
+from urllib.parse import parse_qs, urlsplit
+
+from click import command, echo, option
+
+from .payloads import marc_record, mms_ids, rest_bibs, sru_page
+
+SRU_TERM = re.compile(r"alma\.(\w+)>?=(\S+)")
+
+
+@dataclass
+class FakeAlmaConfig:
+    """Behaviour of the fake alma server."""
+
+    latency: float = 0.0
+    error_rate: float = 0.0
+    fields: int = 40
+    modified_records: int = 200
+    seed: int = 0
+
+
+@dataclass
+class FakeAlmaStats:
+    """Requests the fake alma server answered."""
+
+    lock: Lock = field(default_factory=Lock)
+    requests: dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+
+    def count(self, operation: str, *, error: bool = False) -> None:
+        """Count the request of the operation."""
+        with self.lock:
+            self.requests[operation] = self.requests.get(operation, 0) + 1
+            self.errors += error
+
+
+class FakeAlmaHandler(BaseHTTPRequestHandler):
+    """Answer the requests like the alma apis."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "FakeAlmaHTTPServer"
+
+    def log_message(self, *_: object) -> None:
+        """Do not log the requests, it would distort the measurements."""
+
+    def do_GET(self) -> None:
+        """Answer the rest record and sru search requests."""
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        fields = self.server.config.fields
+
+        if url.path == "/almaws/v1/bibs":
+            self.answer("rest_get", lambda: rest_bibs(query["mms_id"][0], fields))
+        elif url.path.startswith("/view/sru/"):
+            self.answer("sru_get", lambda: self.sru_response(query))
+        else:
+            self.send(HTTPStatus.NOT_FOUND, "<error>not found</error>")
+
+    def do_PUT(self) -> None:
+        """Answer the rest update request with the sent record."""
+        self.read_body()
+        mms_id = urlsplit(self.path).path.rsplit("/", 1)[-1]
+        self.answer("rest_put", lambda: rest_bibs(mms_id, self.server.config.fields))
+
+    def do_POST(self) -> None:
+        """Answer the rest create request with a new record."""
+        self.read_body()
+        mms_id = mms_ids(1)[0]
+        self.answer("rest_post", lambda: rest_bibs(mms_id, self.server.config.fields))
+
+    def read_body(self) -> bytes:
+        """Read the request body to keep the connection usable."""
+        return self.rfile.read(int(self.headers.get("content-length", 0)))
+
+    def answer(self, operation: str, build: Callable[[], str]) -> None:
+        """Send the built body after the latency or an error by the error rate."""
+        config = self.server.config
+        sleep(config.latency)
+
+        error = self.server.draw_error()
+        self.server.stats.count(operation, error=error)
+
+        if error:
+            self.send(HTTPStatus.SERVICE_UNAVAILABLE, "<error>unavailable</error>")
+        else:
+            self.send(HTTPStatus.OK, build())
+
+    def sru_response(self, query: dict[str, list[str]]) -> str:
+        """Build the sru page of the cql query."""
+        cql = query.get("query", [""])[0]
+        start = int(query.get("startRecord", ["1"])[0])
+        maximum = int(query.get("maximumRecords", ["50"])[0])
+        terms = SRU_TERM.findall(cql)
+        fields = self.server.config.fields
+
+        if terms and terms[0][0] == "modification_date":
+            total = self.server.config.modified_records
+            ids = mms_ids(total)[start - 1 : start - 1 + maximum]
+            next_position = start + maximum if start - 1 + maximum < total else None
+            return sru_page(ids, next_position, fields)
+
+        ids = [
+            value.removeprefix("cms-")
+            for _, value in terms
+            if not value.startswith("new-")
+        ]
+        return sru_page(ids[start - 1 : start - 1 + maximum], fields=fields)
+
+    def send(self, status: HTTPStatus, body: str) -> None:
+        """Send the xml body."""
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/xml")
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeAlmaHTTPServer(ThreadingHTTPServer):
+    """Threading http server with the config and stats of the fake alma."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], config: FakeAlmaConfig) -> None:
+        """Create object FakeAlmaHTTPServer."""
+        super().__init__(address, FakeAlmaHandler)
+        self.config = config
+        self.stats = FakeAlmaStats()
+        self.random = Random(config.seed)  # noqa: S311
+        self.lock = Lock()
+
+    def draw_error(self) -> bool:
+        """Draw if the request fails according to the error rate."""
+        with self.lock:
+            return self.random.random() < self.config.error_rate
+
+
+class FakeAlma:
+    """Fake alma server running in a background thread.
+
+    with FakeAlma(FakeAlmaConfig(latency=0.02)) as alma:
+        config = AlmaSRUConfig("mms_id", alma.url, "INST")
+    """
+
+    def __init__(self, config: FakeAlmaConfig | None = None, port: int = 0) -> None:
+        """Create object FakeAlma, port 0 takes a free port."""
+        self.server = FakeAlmaHTTPServer(
+            ("127.0.0.1", port),
+            config or FakeAlmaConfig(),
+        )
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Get the url of the server, it is the api host and the sru domain."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def config(self) -> FakeAlmaConfig:
+        """Get the config, it can be changed while the server runs."""
+        return self.server.config
+
+    @property
+    def stats(self) -> FakeAlmaStats:
+        """Get the answered requests."""
+        return self.server.stats
+
+    def __enter__(self) -> Self:
+        """Start the server."""
+        self.thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@command()
+@option("--port", default=8000, help="port to listen on")
+@option("--latency", default=0.0, help="seconds every response is delayed")
+@option("--error-rate", default=0.0, help="share of requests answered with 503")
+@option("--fields", default=40, help="datafields per record")
+def main(port: int, latency: float, error_rate: float, fields: int) -> None:
+    """Run the fake alma server until it is interrupted."""
+    config = FakeAlmaConfig(latency=latency, error_rate=error_rate, fields=fields)
+    with FakeAlma(config, port) as alma:
+        size = len(marc_record(mms_ids(1)[0], fields))
+        echo(f"fake alma on {alma.url}, {size / 1024:.1f} KiB per record")
+        try:
+            alma.thread.join()
+        except KeyboardInterrupt:
+            echo(f"answered {alma.stats.requests}, {alma.stats.errors} errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Checkpoints to resume interrupted task runs."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from datetime import timedelta
+from threading import Lock
+
+from redis import Redis
+
+
+class CheckpointStore(ABC):
+    """Checkpoint store, keeps the processed pids and the cursor of a run."""
+
+    @abstractmethod
+    def load(self, key: str) -> tuple[set[str], dict[str, int]]:
+        """Get the processed pids and the cursor of the run."""
+
+    @abstractmethod
+    def add(self, key: str, pid: str) -> None:
+        """Store the pid as processed."""
+
+    @abstractmethod
+    def set_cursor(self, key: str, **cursor: int) -> None:
+        """Store the cursor values of the run."""
+
+    @abstractmethod
+    def clear(self, key: str) -> None:
+        """Remove the checkpoint of the finished run."""
+
+    @abstractmethod
+    def get_mark(self, key: str) -> str | None:
+        """Get the high-water mark of the last finished sync."""
+
+    @abstractmethod
+    def set_mark(self, key: str, mark: str) -> None:
+        """Store the high-water mark of the finished sync."""
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """In-process checkpoint store, only survives within the worker."""
+
+    def __init__(self) -> None:
+        """Create object MemoryCheckpointStore."""
+        self.lock = Lock()
+        self.pids: dict[str, set[str]] = {}
+        self.cursors: dict[str, dict[str, int]] = {}
+        self.marks: dict[str, str] = {}
+
+    def load(self, key: str) -> tuple[set[str], dict[str, int]]:
+        """Get the processed pids and the cursor of the run."""
+        with self.lock:
+            pids = set(self.pids.get(key, ()))
+            cursor = dict(self.cursors.get(key, {}))
+        return pids, cursor
+
+    def add(self, key: str, pid: str) -> None:
+        """Store the pid as processed."""
+        with self.lock:
+            self.pids.setdefault(key, set()).add(pid)
+
+    def set_cursor(self, key: str, **cursor: int) -> None:
+        """Store the cursor values of the run."""
+        with self.lock:
+            self.cursors.setdefault(key, {}).update(cursor)
+
+    def clear(self, key: str) -> None:
+        """Remove the checkpoint of the finished run."""
+        with self.lock:
+            self.pids.pop(key, None)
+            self.cursors.pop(key, None)
+
+    def get_mark(self, key: str) -> str | None:
+        """Get the high-water mark of the last finished sync."""
+        return self.marks.get(key)
+
+    def set_mark(self, key: str, mark: str) -> None:
+        """Store the high-water mark of the finished sync."""
+        self.marks[key] = mark
+
+
+class RedisCheckpointStore(CheckpointStore):
+    """Redis checkpoint store, survives restarts and redeployments."""
+
+    prefix = "alma:checkpoint"
+
+    def __init__(self, redis: Redis, ttl: int = 7 * 24 * 3600) -> None:
+        """Create object RedisCheckpointStore."""
+        self.redis = redis
+        self.ttl = timedelta(seconds=ttl)
+
+    def load(self, key: str) -> tuple[set[str], dict[str, int]]:
+        """Get the processed pids and the cursor of the run."""
+        pipe = self.redis.pipeline()
+        pipe.smembers(f"{self.prefix}:{key}:pids")
+        pipe.hgetall(f"{self.prefix}:{key}:cursor")
+        pids, cursor = pipe.execute()
+        return (
+            {pid.decode("utf-8") for pid in pids},
+            {name.decode("utf-8"): int(value) for name, value in cursor.items()},
+        )
+
+    def add(self, key: str, pid: str) -> None:
+        """Store the pid as processed."""
+        name = f"{self.prefix}:{key}:pids"
+        pipe = self.redis.pipeline()
+        pipe.sadd(name, pid)
+        pipe.expire(name, self.ttl)
+        pipe.execute()
+
+    def set_cursor(self, key: str, **cursor: int) -> None:
+        """Store the cursor values of the run."""
+        name = f"{self.prefix}:{key}:cursor"
+        pipe = self.redis.pipeline()
+        pipe.hset(name, mapping=cursor)
+        pipe.expire(name, self.ttl)
+        pipe.execute()
+
+    def clear(self, key: str) -> None:
+        """Remove the checkpoint of the finished run."""
+        self.redis.delete(f"{self.prefix}:{key}:pids", f"{self.prefix}:{key}:cursor")
+
+    def get_mark(self, key: str) -> str | None:
+        """Get the high-water mark of the last finished sync."""
+        mark = self.redis.get(f"{self.prefix}:mark:{key}")
+        return mark.decode("utf-8") if mark is not None else None
+
+    def set_mark(self, key: str, mark: str) -> None:
+        """Store the high-water mark of the finished sync, it does not expire."""
+        self.redis.set(f"{self.prefix}:mark:{key}", mark)
+
+
+class Checkpoint:
+    """Checkpoint of one run of a task and workflow.
+
+    The processed pids are loaded once when the run starts, entries with
+    a processed pid are skipped. Every processed entry is stored right
+    away, so a killed worker loses at most the entries in progress. The
+    checkpoint is removed when the run finished, a stopped run keeps it
+    and the next run with the same run id resumes.
+    """
+
+    def __init__(
+        self,
+        store: CheckpointStore,
+        task: str,
+        workflow: str | None,
+        run_id: str | None = None,
+    ) -> None:
+        """Create object Checkpoint."""
+        self.store = store
+        self.task = task
+        self.workflow = workflow or "-"
+        self.key = self.build_key(task, workflow, run_id)
+        self.lock = Lock()
+        self.done, cursor = store.load(self.key)
+        self.resumed = len(self.done)
+        self.total = cursor.get("total", 0)
+
+    @staticmethod
+    def build_key(task: str, workflow: str | None, run_id: str | None) -> str:
+        """Build the key of the run in the checkpoint store."""
+        return f"{task}:{workflow or '-'}:{run_id or 'default'}"
+
+    @property
+    def processed(self) -> int:
+        """Get the number of processed entries, including resumed ones."""
+        return len(self.done)
+
+    def pending(self, entries: Iterable) -> Iterator:
+        """Get the entries which are not processed yet."""
+        if isinstance(entries, list | tuple):
+            self.total = len(entries)
+            self.store.set_cursor(self.key, total=self.total)
+
+        return (entry for entry in entries if entry.pid not in self.done)
+
+    def mark_done(self, pid: str) -> int:
+        """Store the pid as processed and get the processed count."""
+        with self.lock:
+            self.done.add(pid)
+            processed = len(self.done)
+        self.store.add(self.key, pid)
+        return processed
+
+    def progress(self) -> str:
+        """Get the progress as text."""
+        total = self.total or "?"
+        return f"{self.processed}/{total} entries ({self.resumed} resumed)"
+
+    def clear(self) -> None:
+        """Remove the checkpoint of the finished run."""
+        self.store.clear(self.key)
@@ -9,10 +9,11 @@
 
 from csv import DictReader
 from dataclasses import dataclass
-from time import sleep
+from pathlib import Path
 from typing import cast
 
-from click import BOOL, STRING, echo, group, option, secho
+from click import BOOL, FLOAT, INT, STRING, echo, group, option, secho
+from click import Path as PathType
 from click_option_group import optgroup
 from flask import current_app
 from flask.cli import with_appcontext
@@ -22,6 +23,8 @@ from .click_param_type import CSV, JSON
 from .decorators import build_identity, build_service
 from .proxies import current_alma
 from .services import AlmaRESTService, AlmaSRUService
+from .services.bulk import BulkFieldUpdater, BulkUpdateState
+from .throttle import IndexingThrottle
 
 MAX_RETRY_COUNT = 3
 """There could be problems with opensearch connections. This is the retry counter."""
@@ -85,6 +88,19 @@ def show_import_workflows() -> None:
 @optgroup.option("--user-email", type=STRING, default="alma@tugraz.at")
 @optgroup.group("Import by file list")
 @optgroup.option("--csv-file", type=CSV())
+@optgroup.group("Indexing back-pressure")
+@optgroup.option(
+    "--max-in-flight",
+    type=INT,
+    default=None,
+    help="pending index operations allowed before waiting",
+)
+@optgroup.option(
+    "--max-wait",
+    type=FLOAT,
+    default=None,
+    help="maximum seconds to wait for the indexing after one record",
+)
 @build_service
 @build_identity
 def import_using_sru(
@@ -93,6 +109,9 @@ def import_using_sru(
     csv_file: DictReader,
     identity: Identity,
     alma_service: AlmaSRUService,
+    *,
+    max_in_flight: int | None,
+    max_wait: float | None,
 ) -> None:
     """Search on the SRU service of alma."""
     import_funcs = get_config("ALMA_REPOSITORY_RECORDS_IMPORT_FUNCS", dict)
@@ -107,6 +126,14 @@ def import_using_sru(
         return
 
     list_of_items = csv_file or [metadata]
+    throttle = IndexingThrottle(
+        (
+            max_in_flight
+            if max_in_flight is not None
+            else get_config("ALMA_IMPORT_MAX_IN_FLIGHT", int)
+        ),
+        max_wait if max_wait is not None else get_config("ALMA_IMPORT_MAX_WAIT", float),
+    )
 
     for row in list_of_items:
         if len(row["ac_number"]) == 0:
@@ -121,9 +148,11 @@ def import_using_sru(
         except RuntimeError as error:
             secho(str(error), fg=Color.error)
 
-        # cool down the opensearch indexing process. necessary for
-        # multiple imports in a short timeframe
-        sleep(100)
+        # wait until opensearch caught up with the indexing. necessary
+        # for multiple imports in a short timeframe
+        throttle.wait()
+
+    secho(throttle.report(), fg=Color.neutral)
 
 
 @alma.group()
@@ -251,13 +280,42 @@ def cli_update_repository_record(
     required=True,
     help="two columns: mms_id and new_url",
 )
-def update_url_in_alma(csv_file: DictReader) -> None:
+@option("--workers", type=INT, default=None, help="number of parallel updates")
+@option(
+    "--state-file",
+    type=PathType(dir_okay=False, path_type=Path),
+    default=None,
+    help="file to checkpoint the progress, an existing file resumes the run",
+)
+def update_url_in_alma(
+    csv_file: DictReader,
+    workers: int | None,
+    state_file: Path | None,
+) -> None:
     """Update url in remote repository records.
 
     :params csv_file (file) with two columns mms_id and new_url
     """
-    for mms_id, new_url in csv_file:
-        current_alma.alma_rest_service.update_field(mms_id, "856.4._.u", new_url)
+    updater = BulkFieldUpdater(
+        current_alma.alma_rest_service,
+        "856.4._.u",
+        workers or get_config("ALMA_BULK_UPDATE_WORKERS", int),
+        BulkUpdateState(state_file),
+    )
+    result = updater.run((row["mms_id"], row["new_url"]) for row in csv_file)
+
+    secho(
+        f"processed {result.processed} records in {result.elapsed:.1f}s "
+        f"({result.rate:.2f} records/s): {result.updated} updated, "
+        f"{result.unchanged} unchanged, {result.failed} failed, "
+        f"{result.resumed} already done",
+        fg=Color.error if result.failed or result.stopped else Color.success,
+    )
+    for mms_id, error in result.errors.items():
+        secho(f"mms_id: {mms_id}, error: {error}", fg=Color.error)
+    if result.stopped:
+        msg = f"stopped: {result.stopped}, run again with the state file to resume"
+        secho(msg, fg=Color.error)
 
 
 @update.command("field")
@@ -7,7 +7,7 @@
 
 """Invenio module to connect InvenioRDM to Alma."""
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 
 from invenio_records_resources.services.records.results import RecordItem
 
@@ -43,18 +43,32 @@ ALMA_REPOSITORY_RECORDS_IMPORT_FUNCS: dict[str, Callable[..., RecordItem]] = {}
 
 ALMA_ALMA_RECORDS_CREATE_AGGREGATORS: dict[
     str,
-    Callable[..., list[tuple[str, str]]],
+    Callable[..., Iterable[tuple[str, str]]],
 ] = {}
-"""List of aggregators with following signature: aggregator() -> list[marc_id]."""
+"""Aggregators with following signature: aggregator() -> Iterable[entry].
+
+An entry has the attributes pid and cms_id. The entries are consumed
+lazily, an aggregator should be a generator, e.g. over
+invenio_alma.utils.scan_entries. Its scroll lifetime has to cover
+processing one page of entries, size times the seconds per entry.
+Combine several with iter_aggregators.
+"""
 
 ALMA_ALMA_RECORDS_CREATE_FUNCS: dict[str, Callable[..., RecordItem]] = {}
 """The function to create record in alma."""
 
 ALMA_REPOSITORY_RECORDS_UPDATE_AGGREGATORS: dict[
     str,
-    Callable[..., list[tuple[str, str]]],
+    Callable[..., Iterable[tuple[str, str]]],
 ] = {}
-"""List of aggregators with following signature: aggregator() -> list[tuple[marc_id, alma_id]]."""
+"""Aggregators with following signature: aggregator() -> Iterable[entry].
+
+An entry has the attributes pid and cms_id. The entries are consumed
+lazily, an aggregator should be a generator, e.g. over
+invenio_alma.utils.scan_entries. Its scroll lifetime has to cover
+processing one page of entries, size times the seconds per entry.
+Combine several with iter_aggregators.
+"""
 
 ALMA_REPOSITORY_RECORDS_UPDATE_FUNCS: dict[str, Callable[..., RecordItem]] = {}
 """This is a callable to make the update process dependend on the workflow."""
@@ -85,3 +99,207 @@ ALMA_SRU_INSTITUTION_CODE = ""
 
 This is the code that acts as a reference for the institution in Alma.
 """
+
+ALMA_HTTP_POOL_CONNECTIONS: int = 10
+"""Number of per host connection pools kept by the alma http sessions."""
+
+ALMA_HTTP_POOL_MAXSIZE: int = 10
+"""Maximum number of connections kept open per host.
+
+This should be at least as big as the number of threads which use the
+same service concurrently.
+"""
+
+ALMA_HTTP_POOL_BLOCK: bool = False
+"""Block if the per host connection limit is reached instead of opening a new one."""
+
+ALMA_HTTP_KEEP_ALIVE: bool = True
+"""Keep the connections to the alma hosts alive between requests."""
+
+ALMA_HTTP_ACCEPT_ENCODING: str = "gzip, deflate"
+"""Compressions accepted for the responses, empty asks for uncompressed ones.
+
+The responses are decompressed while they are streamed into the parser.
+"""
+
+ALMA_HTTP_COMPRESS_REQUESTS: bool = False
+"""Send the PUT and POST bodies gzip compressed.
+
+Only enable it if the alma host accepts content-encoding gzip requests.
+"""
+
+ALMA_TASK_CONCURRENCY: int = 1
+"""Number of entries the create and update tasks process at the same time.
+
+The default 1 processes the entries one after the other. With a higher
+value the entries are processed by a thread pool. The aggregator is
+consumed only as fast as the threads process the entries.
+ALMA_HTTP_POOL_MAXSIZE should be at least this value.
+"""
+
+ALMA_TASK_CHUNK_SIZE: int = 0
+"""Entries per chunk sub-task of the create and update tasks.
+
+The default 0 processes all entries in the task itself. With a chunk
+size the task splits the entries into chunks and dispatches them as
+sub-tasks over all celery workers, a chord callback sums up the counts.
+This needs a celery result backend.
+"""
+
+ALMA_TASK_MAX_PARALLEL_CHUNKS: int = 4
+"""Chunk sub-tasks of one run processed at the same time, 0 is unlimited.
+
+Every sub-task uses ALMA_TASK_CONCURRENCY threads, keep the product
+within the rate limit of alma.
+"""
+
+ALMA_SYNC_INCREMENTAL: bool = False
+"""Update only the repository records whose alma record was modified.
+
+The update task searches alma for the records modified since the start
+of the last finished incremental run of the workflow and processes only
+the matching entries. The first run processes all entries. A run with
+failed entries keeps the mark, the next run retries them. The mark is
+kept in the checkpoint store, use ALMA_REDIS_URL to persist it. The create
+task is never incremental.
+"""
+
+ALMA_METRICS_EXPORTER: str = ""
+"""Exporter of the metrics of the alma calls and the task runs.
+
+The metrics are request durations per operation (sru_get, rest_get,
+rest_put, rest_post), errors by status code, response bytes, parse
+durations and the entries per outcome and per second of every workflow.
+"memory" keeps them in the process, "prometheus" registers them in the
+default registry of prometheus-client. An instance of MetricsExporter
+plugs in another backend. Empty drops the metrics.
+"""
+
+ALMA_DUPLICATE_INDEX_MAX_AGE: int = 600
+"""Seconds the duplicate check of a cms id is answered from the index.
+
+The create task looks up the cms ids of ALMA_DUPLICATE_INDEX_BATCH_SIZE
+entries at once with batched sru searches of the local field 995, then
+is_duplicate_in_alma answers from the index instead of one sru search
+per entry. After max age the cms id is looked up again. The index is per
+process. 0 disables the index.
+"""
+
+ALMA_DUPLICATE_INDEX_BATCH_SIZE: int = 500
+"""Entries of the create task whose cms ids are looked up at once."""
+
+ALMA_FINGERPRINT_SEARCH_KEY: str = ""
+"""Sru search key of the cms ids of the update aggregator entries.
+
+If it is set, the update task fetches the alma record of an entry and
+skips the update if the hash of its normalized marcxml is the same as at
+the last successful update. The finished log reports the unchanged
+entries. Enable the record cache, then the update function gets the
+fetched record from the cache. The hashes are kept in redis if
+ALMA_REDIS_URL is set. Empty disables the change detection.
+"""
+
+ALMA_CHECKPOINT_TTL: int = 7 * 24 * 3600
+"""Seconds the checkpoint of a stopped task run is kept to resume it.
+
+The create and update tasks store every processed pid. A run which was
+killed or stopped resumes with the unprocessed entries. The checkpoints
+survive a restart of the workers only if ALMA_REDIS_URL is set.
+"""
+
+ALMA_CHECKPOINT_LOG_INTERVAL: int = 100
+"""Number of processed entries between two progress log messages."""
+
+ALMA_REDIS_URL: str = ""
+"""Redis url for the state shared between the workers.
+
+If it is empty the state is kept per process. Set it to share e.g. the
+rate limit between all celery workers, like redis://localhost:6379/0.
+"""
+
+ALMA_RATE_LIMIT_PER_SECOND: float = 25.0
+"""Maximum number of calls per second to one alma api key or sru domain.
+
+0 disables the per second limit.
+"""
+
+ALMA_RATE_LIMIT_BURST: int = 25
+"""Number of calls which could be sent at once before the rate limit applies."""
+
+ALMA_RATE_LIMIT_DAILY: int = 0
+"""Number of calls per day allowed for the api key.
+
+0 means the limit is only taken from the X-Exl-Api-Remaining header.
+"""
+
+ALMA_RATE_LIMIT_DAILY_SLOWDOWN: int = 10000
+"""Remaining daily calls below which the calls are spread over the rest of the day."""
+
+ALMA_RATE_LIMIT_DAILY_RESERVE: int = 1000
+"""Remaining daily calls which are not used by invenio-alma.
+
+If only the reserve is left the services raise AlmaQuotaExceededError
+instead of using up the quota.
+"""
+
+ALMA_RETRY_MAX_ATTEMPTS: int = 3
+"""Attempts per alma request, including the first one. 1 disables retries.
+
+Connection errors, timeouts, 429 and 5xx responses are retried. POST
+requests are only retried if alma could not have received them.
+"""
+
+ALMA_RETRY_BACKOFF_FACTOR: float = 0.5
+"""Seconds of the first backoff, doubled with every attempt and jittered."""
+
+ALMA_RETRY_MAX_BACKOFF: float = 30.0
+"""Upper bound of the backoff, also the longest Retry-After which is honored."""
+
+ALMA_CIRCUIT_FAILURE_THRESHOLD: int = 5
+"""Consecutive failures after which the calls to an alma host fail fast.
+
+Connection errors, timeouts and 5xx responses count as failures. While
+the circuit is open the services raise AlmaCircuitOpenError, the tasks
+stop and reschedule themselves. 0 disables the circuit breaker. The state
+is shared over ALMA_REDIS_URL if it is set.
+"""
+
+ALMA_CIRCUIT_RESET_TIMEOUT: float = 60.0
+"""Seconds the circuit stays open before probe calls are let through."""
+
+ALMA_CIRCUIT_HALF_OPEN_PROBES: int = 1
+"""Probe calls let through per reset timeout while the circuit is half open."""
+
+ALMA_CIRCUIT_RESCHEDULE_DELAY: int = 600
+"""Minimum seconds before a task stopped by an open circuit runs again."""
+
+ALMA_IMPORT_MAX_IN_FLIGHT: int = 10
+"""Pending index operations allowed before the sru import waits for opensearch."""
+
+ALMA_IMPORT_MAX_WAIT: float = 300.0
+"""Maximum seconds the sru import waits for opensearch after one record."""
+
+ALMA_RECORD_CACHE_TTL: int = 600
+"""Seconds a sru lookup is cached, 0 disables the record cache.
+
+The cache is kept in redis if ALMA_REDIS_URL is set, otherwise per
+process. Records updated or created over the rest service are removed
+from the cache.
+"""
+
+ALMA_RECORD_CACHE_NEGATIVE_TTL: int = 300
+"""Seconds a sru lookup which did not find a record is cached."""
+
+ALMA_RECORD_CACHE_MAXSIZE: int = 1024
+"""Maximum number of lookups kept in the per process record cache."""
+
+ALMA_RECORD_CACHE_VALIDATOR_TTL: int = 86400
+"""Seconds the ETag and Last-Modified validators of a response are kept.
+
+After the record cache expired, the next request of the url is sent with
+If-None-Match/If-Modified-Since and a 304 not modified response is served
+from the records cached with the validators.
+"""
+
+ALMA_BULK_UPDATE_WORKERS: int = 4
+"""Number of records the bulk field update processes at the same time."""
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Executors to process aggregator entries."""
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import BoundedSemaphore
+
+from flask import current_app
+
+
+def run_entries(
+    entries: Iterable,
+    process: Callable[..., None],
+    concurrency: int = 1,
+    abort_on: tuple[type[Exception], ...] = (),
+) -> None:
+    """Process the entries with a bounded number of worker threads.
+
+    The process function is responsible to handle the errors of one
+    entry. Exceptions which escape it are logged and do not stop the
+    other entries, except they are of a type listed in abort_on.
+
+    The entries are consumed lazily. A new entry is only taken from the
+    iterable if a slot is free, so a slow alma does not lead to an
+    unbounded queue of waiting entries.
+
+    :param entries (Iterable): aggregator entries
+    :param process (Callable): function to process one entry
+    :param concurrency (int): number of worker threads, 1 means serial
+    :param abort_on (tuple): exception types which stop the processing
+
+    :raises the first exception of a type in abort_on
+    """
+    if concurrency <= 1:
+        for entry in entries:
+            _process_entry(process, entry, abort_on)
+        return
+
+    app = current_app._get_current_object()  # type: ignore[attr-defined]  # noqa: SLF001
+    slots = BoundedSemaphore(concurrency * 2)
+    aborted: list[Exception] = []
+
+    def worker(entry: object) -> None:
+        with app.app_context():
+            try:
+                _process_entry(process, entry, abort_on)
+            except abort_on as error:
+                aborted.append(error)
+
+    def release(_: Future) -> None:
+        slots.release()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for entry in entries:
+            slots.acquire()
+            if aborted:
+                slots.release()
+                break
+            future = executor.submit(worker, entry)
+            future.add_done_callback(release)
+
+    if aborted:
+        raise aborted[0]
+
+
+def _process_entry(
+    process: Callable[..., None],
+    entry: object,
+    abort_on: tuple[type[Exception], ...],
+) -> None:
+    """Process one entry and isolate unexpected errors."""
+    try:
+        process(entry)
+    except abort_on:
+        raise
+    except Exception:
+        msg = "ERROR: unexpected error while processing entry %s"
+        current_app.logger.exception(msg, entry)
@@ -7,15 +7,46 @@
 
 """Invenio module to connect InvenioRDM to Alma."""
 
+import atexit
 from dataclasses import dataclass
 from typing import cast
 
 from flask import Blueprint, Flask, current_app
 
 from . import config
+from .checkpoints import CheckpointStore, MemoryCheckpointStore, RedisCheckpointStore
 from .resources import AlmaResource, AlmaResourceConfig
 from .services import AlmaRESTService, AlmaSRUService
-from .services.config import AlmaRESTConfig, AlmaSRUConfig
+from .services.backends import redis_from_url
+from .services.cache import AlmaRecordCache, MemoryRecordCache, RedisRecordCache
+from .services.circuit import (
+    AlmaCircuitBreaker,
+    MemoryCircuitStore,
+    RedisCircuitStore,
+)
+from .services.config import (
+    AlmaCircuitConfig,
+    AlmaRateLimitConfig,
+    AlmaRESTConfig,
+    AlmaRetryConfig,
+    AlmaSessionConfig,
+    AlmaSRUConfig,
+)
+from .services.duplicates import AlmaDuplicateIndex
+from .services.fingerprints import (
+    AlmaFingerprints,
+    MemoryFingerprintStore,
+    RedisFingerprintStore,
+)
+from .services.metrics import AlmaMetrics, MetricsExporter, get_exporter
+from .services.ratelimit import (
+    AlmaRateLimiter,
+    MemoryRateLimitStore,
+    RedisRateLimitStore,
+    rate_limit_key,
+)
+from .services.retry import AlmaRetryPolicy
+from .services.session import AlmaSession
 
 
 @dataclass(frozen=True)
@@ -31,7 +62,12 @@ class InvenioAlma:
     """invenio-alma extension."""
 
     _alma_rest_service: AlmaRESTService | None = None
+    _alma_sru_service: AlmaSRUService | None = None
     _alma_resource: AlmaResource | None = None
+    _alma_record_cache: AlmaRecordCache | None = None
+    _checkpoint_store: CheckpointStore | None = None
+    _duplicate_index: AlmaDuplicateIndex | None = None
+    _metrics: AlmaMetrics | None = None
 
     def __init__(self, app: Flask | None = None) -> None:
         """Extension initialization."""
@@ -53,6 +89,25 @@ class InvenioAlma:
         """Get alma sru service."""
         return self._alma_sru_service
 
+    @property
+    def checkpoint_store(self) -> CheckpointStore:
+        """Get the checkpoint store of the task runs."""
+        if not self._checkpoint_store:
+            self._checkpoint_store = MemoryCheckpointStore()
+        return self._checkpoint_store
+
+    @property
+    def metrics(self) -> AlmaMetrics:
+        """Get the metrics of the alma calls and the task runs."""
+        if not self._metrics:
+            self._metrics = AlmaMetrics()
+        return self._metrics
+
+    @property
+    def duplicate_index(self) -> AlmaDuplicateIndex | None:
+        """Get the index of the cms ids with a record in alma, None if disabled."""
+        return self._duplicate_index
+
     @property
     def alma_resource(self) -> AlmaResource | AlmaResourceMock:
         """Return the alma resource."""
@@ -68,6 +123,7 @@ class InvenioAlma:
         self.init_services(app)
         self.init_resources(app)
         app.extensions["invenio-alma"] = self
+        atexit.register(self.close)
 
     @staticmethod
     def init_config(app: Flask) -> None:
@@ -76,6 +132,128 @@ class InvenioAlma:
             if k.startswith("ALMA_"):
                 app.config.setdefault(k, getattr(config, k))
 
+    @staticmethod
+    def build_session(app: Flask) -> AlmaSession:
+        """Build a connection pooled http session."""
+        session_config = AlmaSessionConfig(
+            pool_connections=app.config["ALMA_HTTP_POOL_CONNECTIONS"],
+            pool_maxsize=app.config["ALMA_HTTP_POOL_MAXSIZE"],
+            pool_block=app.config["ALMA_HTTP_POOL_BLOCK"],
+            keep_alive=app.config["ALMA_HTTP_KEEP_ALIVE"],
+            accept_encoding=app.config["ALMA_HTTP_ACCEPT_ENCODING"],
+            compress_requests=app.config["ALMA_HTTP_COMPRESS_REQUESTS"],
+        )
+        return AlmaSession(session_config)
+
+    @staticmethod
+    def build_rate_limiter(app: Flask, *key_parts: str) -> AlmaRateLimiter:
+        """Build a rate limiter for the api key and host."""
+        rate_limit_config = AlmaRateLimitConfig(
+            per_second=app.config["ALMA_RATE_LIMIT_PER_SECOND"],
+            burst=app.config["ALMA_RATE_LIMIT_BURST"],
+            daily_limit=app.config["ALMA_RATE_LIMIT_DAILY"],
+            daily_slowdown=app.config["ALMA_RATE_LIMIT_DAILY_SLOWDOWN"],
+            daily_reserve=app.config["ALMA_RATE_LIMIT_DAILY_RESERVE"],
+        )
+
+        if redis_url := app.config["ALMA_REDIS_URL"]:
+            store = RedisRateLimitStore(redis_from_url(redis_url))
+        else:
+            store = MemoryRateLimitStore()
+
+        return AlmaRateLimiter(rate_limit_config, rate_limit_key(*key_parts), store)
+
+    @staticmethod
+    def build_retry_policy(app: Flask) -> AlmaRetryPolicy:
+        """Build the retry policy for transient alma failures."""
+        retry_config = AlmaRetryConfig(
+            max_attempts=app.config["ALMA_RETRY_MAX_ATTEMPTS"],
+            backoff_factor=app.config["ALMA_RETRY_BACKOFF_FACTOR"],
+            max_backoff=app.config["ALMA_RETRY_MAX_BACKOFF"],
+        )
+        return AlmaRetryPolicy(retry_config)
+
+    @staticmethod
+    def build_circuit_breaker(app: Flask, host: str) -> AlmaCircuitBreaker | None:
+        """Build the circuit breaker for the host, None if it is disabled."""
+        failure_threshold = app.config["ALMA_CIRCUIT_FAILURE_THRESHOLD"]
+
+        if failure_threshold <= 0:
+            return None
+
+        circuit_config = AlmaCircuitConfig(
+            failure_threshold=failure_threshold,
+            reset_timeout=app.config["ALMA_CIRCUIT_RESET_TIMEOUT"],
+            half_open_probes=app.config["ALMA_CIRCUIT_HALF_OPEN_PROBES"],
+        )
+
+        if redis_url := app.config["ALMA_REDIS_URL"]:
+            store = RedisCircuitStore(redis_from_url(redis_url))
+        else:
+            store = MemoryCircuitStore()
+
+        return AlmaCircuitBreaker(circuit_config, rate_limit_key(host), store)
+
+    @staticmethod
+    def build_checkpoint_store(app: Flask) -> CheckpointStore:
+        """Build the checkpoint store, persistent if redis is configured."""
+        if redis_url := app.config["ALMA_REDIS_URL"]:
+            ttl = app.config["ALMA_CHECKPOINT_TTL"]
+            return RedisCheckpointStore(redis_from_url(redis_url), ttl)
+
+        return MemoryCheckpointStore()
+
+    @staticmethod
+    def build_fingerprints(app: Flask) -> AlmaFingerprints | None:
+        """Build the fingerprints of the imported records, None if disabled."""
+        if not app.config["ALMA_FINGERPRINT_SEARCH_KEY"]:
+            return None
+
+        if redis_url := app.config["ALMA_REDIS_URL"]:
+            return AlmaFingerprints(RedisFingerprintStore(redis_from_url(redis_url)))
+
+        return AlmaFingerprints(MemoryFingerprintStore())
+
+    @staticmethod
+    def build_metrics(app: Flask) -> AlmaMetrics:
+        """Build the metrics with the configured exporter."""
+        exporter = app.config["ALMA_METRICS_EXPORTER"]
+
+        if not isinstance(exporter, MetricsExporter):
+            exporter = get_exporter(exporter or "noop")
+
+        return AlmaMetrics(exporter)
+
+    @staticmethod
+    def build_duplicate_index(
+        app: Flask,
+        sru_service: AlmaSRUService,
+    ) -> AlmaDuplicateIndex | None:
+        """Build the duplicate index of the create task, None if disabled."""
+        max_age = app.config["ALMA_DUPLICATE_INDEX_MAX_AGE"]
+
+        if max_age <= 0:
+            return None
+
+        return AlmaDuplicateIndex(sru_service, max_age)
+
+    @staticmethod
+    def build_record_cache(app: Flask) -> AlmaRecordCache | None:
+        """Build the record cache, None if it is disabled."""
+        ttl = app.config["ALMA_RECORD_CACHE_TTL"]
+        negative_ttl = app.config["ALMA_RECORD_CACHE_NEGATIVE_TTL"]
+        validator_ttl = app.config["ALMA_RECORD_CACHE_VALIDATOR_TTL"]
+
+        if ttl <= 0:
+            return None
+
+        if redis_url := app.config["ALMA_REDIS_URL"]:
+            redis = redis_from_url(redis_url)
+            return RedisRecordCache(redis, ttl, negative_ttl, validator_ttl)
+
+        maxsize = app.config["ALMA_RECORD_CACHE_MAXSIZE"]
+        return MemoryRecordCache(maxsize, ttl, negative_ttl, validator_ttl)
+
     def init_services(self, app: Flask) -> None:
         """Initialize service."""
         api_key = app.config["ALMA_API_KEY"]
@@ -87,8 +265,33 @@ class InvenioAlma:
         institution_code = app.config["ALMA_SRU_INSTITUTION_CODE"]
         sru_config = AlmaSRUConfig("", domain, institution_code)
 
-        self._alma_rest_service = AlmaRESTService(config=rest_config)
-        self._alma_sru_service = AlmaSRUService(config=sru_config)
+        self._alma_record_cache = self.build_record_cache(app)
+        self._checkpoint_store = self.build_checkpoint_store(app)
+        self._metrics = self.build_metrics(app)
+
+        self._alma_rest_service = AlmaRESTService(
+            config=rest_config,
+            session=self.build_session(app),
+            rate_limiter=self.build_rate_limiter(app, api_key, api_host),
+            cache=self._alma_record_cache,
+            retry=self.build_retry_policy(app),
+            circuit=self.build_circuit_breaker(app, api_host),
+            metrics=self._metrics,
+        )
+        self._alma_sru_service = AlmaSRUService(
+            config=sru_config,
+            session=self.build_session(app),
+            rate_limiter=self.build_rate_limiter(app, domain, institution_code),
+            cache=self._alma_record_cache,
+            retry=self.build_retry_policy(app),
+            circuit=self.build_circuit_breaker(app, domain),
+            fingerprints=self.build_fingerprints(app),
+            metrics=self._metrics,
+        )
+        self._duplicate_index = self.build_duplicate_index(
+            app,
+            self._alma_sru_service,
+        )
 
     def init_resources(self, app: Flask) -> None:
         """Initialize resources."""
@@ -97,7 +300,24 @@ class InvenioAlma:
         institution_code = cast(str, app.config.get("ALMA_SRU_INSTITUTION_CODE"))
         config = AlmaSRUConfig(search_key, domain, institution_code)
 
+        sru = self.alma_sru_service.service
+        service = AlmaSRUService(
+            config=config,
+            session=sru.session,
+            rate_limiter=sru.rate_limiter,
+            cache=self._alma_record_cache,
+            retry=sru.retry,
+            circuit=sru.circuit,
+            metrics=sru.metrics,
+        )
+
         self._alma_resource = AlmaResource(
-            service=AlmaSRUService(config=config),
+            service=service,
             config=AlmaResourceConfig,
         )
+
+    def close(self) -> None:
+        """Close the pooled http connections of the services."""
+        for service in (self._alma_rest_service, self._alma_sru_service):
+            if service:
+                service.close()
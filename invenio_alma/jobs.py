@@ -9,7 +9,8 @@
 
 from invenio_jobs.jobs import JobType, PredefinedArgsSchema
 from invenio_jobs.models import Job
-from marshmallow.fields import String
+from marshmallow.fields import Boolean, Integer, String
+from marshmallow.validate import Range
 
 from .tasks import create_alma_records, update_repository_records
 
@@ -29,6 +30,45 @@ class AlmaPredefinedArgsSchema(PredefinedArgsSchema):
         },
     )
 
+    chunk_size = Integer(
+        allow_none=True,
+        load_default=None,
+        validate=Range(min=0),
+        metadata={
+            "description": "entries per sub-task, 0 runs in one task, "
+            "empty takes ALMA_TASK_CHUNK_SIZE",
+        },
+    )
+
+    max_parallel_chunks = Integer(
+        allow_none=True,
+        load_default=None,
+        validate=Range(min=0),
+        metadata={
+            "description": "sub-tasks running at the same time, 0 is unlimited, "
+            "empty takes ALMA_TASK_MAX_PARALLEL_CHUNKS",
+        },
+    )
+
+
+class AlmaUpdateArgsSchema(AlmaPredefinedArgsSchema):
+    """Alma update args schema."""
+
+    job_arg_schema = String(
+        metadata={"type": "hidden"},
+        dump_default="AlmaUpdateArgsSchema",
+        load_default="AlmaUpdateArgsSchema",
+    )
+
+    incremental = Boolean(
+        allow_none=True,
+        load_default=None,
+        metadata={
+            "description": "only update records modified in alma since the last "
+            "incremental run, empty takes ALMA_SYNC_INCREMENTAL",
+        },
+    )
+
 
 class CreateAlmaRecordsJob(JobType):
     """Create alma records job."""
@@ -44,12 +84,23 @@ class CreateAlmaRecordsJob(JobType):
     @classmethod
     def build_task_arguments(
         cls,
-        job_obj: Job,  # noqa: ARG003
+        job_obj: Job,
         workflow: str | None = None,
+        chunk_size: int | None = None,
+        max_parallel_chunks: int | None = None,
         **__: dict,
-    ) -> dict[str, str]:
-        """Define extra arguments to be injected on task execution."""
-        return {"workflow": workflow}
+    ) -> dict[str, str | int | None]:
+        """Define extra arguments to be injected on task execution.
+
+        The run id is the job id, a new run of a job which was stopped
+        resumes from its checkpoint instead of restarting.
+        """
+        return {
+            "workflow": workflow,
+            "run_id": str(job_obj.id),
+            "chunk_size": chunk_size,
+            "max_parallel_chunks": max_parallel_chunks,
+        }
 
 
 class UpdateRepositoryRecordsJob(JobType):
@@ -61,14 +112,28 @@ class UpdateRepositoryRecordsJob(JobType):
 
     task = update_repository_records
 
-    arguments_schema = AlmaPredefinedArgsSchema
+    arguments_schema = AlmaUpdateArgsSchema
 
     @classmethod
     def build_task_arguments(
         cls,
-        job_obj: Job,  # noqa: ARG003
+        job_obj: Job,
         workflow: str | None = None,
+        chunk_size: int | None = None,
+        max_parallel_chunks: int | None = None,
+        *,
+        incremental: bool | None = None,
         **__: dict,
-    ) -> dict[str, str]:
-        """Define extra arguments to be injected on task execution."""
-        return {"workflow": workflow}
+    ) -> dict[str, str | int | None]:
+        """Define extra arguments to be injected on task execution.
+
+        The run id is the job id, a new run of a job which was stopped
+        resumes from its checkpoint instead of restarting.
+        """
+        return {
+            "workflow": workflow,
+            "run_id": str(job_obj.id),
+            "chunk_size": chunk_size,
+            "max_parallel_chunks": max_parallel_chunks,
+            "incremental": incremental,
+        }
@@ -20,7 +20,11 @@ from flask_resources import (
     route,
 )
 
-from ..services.errors import AlmaAPIError  # noqa: TID252
+from ..services.errors import (  # noqa: TID252
+    AlmaAPIError,
+    AlmaCircuitOpenError,
+    AlmaQuotaExceededError,
+)
 from .config import AlmaResourceConfig
 
 request_view_args = request_parser(from_conf("request_view_args"), location="view_args")
@@ -61,8 +65,12 @@ class AlmaResource(Resource):
         record_id = resource_requestctx.view_args["record_id"]
         type_id = resource_requestctx.view_args["type"]
 
-        self.service.config.search_key = self.config.record_id_search_key[type_id]
+        search_key = self.config.record_id_search_key[type_id]
         try:
-            return self.service.get_record(record_id), 200
+            return self.service.get_record(record_id, search_key), 200
+        except AlmaCircuitOpenError:
+            abort(503)
+        except AlmaQuotaExceededError:
+            abort(429)
         except AlmaAPIError:
             abort(404)
@@ -7,13 +7,22 @@
 
 """Invenio service to connect InvenioRDM to Alma."""
 
-from .errors import AlmaAPIError, AlmaRESTError
+from .errors import (
+    AlmaAPIError,
+    AlmaCircuitOpenError,
+    AlmaQuotaExceededError,
+    AlmaRecordNotFoundError,
+    AlmaRESTError,
+)
 from .rest import AlmaRESTService
 from .sru import AlmaSRUService
 
 __all__ = (
     "AlmaAPIError",
+    "AlmaCircuitOpenError",
+    "AlmaQuotaExceededError",
     "AlmaRESTError",
     "AlmaRESTService",
+    "AlmaRecordNotFoundError",
     "AlmaSRUService",
 )
@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+
+"""Asyncio Alma services.
+
+The services share the url building, the error types and the parsing
+with the synchronous services. They need the async extra (httpx).
+"""
+
+from asyncio import Semaphore, gather, to_thread
+from collections.abc import Awaitable, Iterable
+from http import HTTPStatus
+from io import BytesIO
+from xml.etree.ElementTree import Element
+
+from httpx import AsyncClient, Limits, ReadTimeout, Response
+
+from .base import AlmaRecordParser, AlmaService
+from .config import AlmaRESTConfig, AlmaSessionConfig, AlmaSRUConfig
+from .errors import AlmaAPIError, AlmaRESTError
+from .metrics import AlmaMetrics
+from .parsers import XMLParser, tostring
+from .ratelimit import AlmaRateLimiter
+from .rest import AlmaRESTService, AlmaRESTUrls
+from .sru import (
+    SRU_NAMESPACES,
+    SRU_NEXT_POSITION,
+    SRU_RECORDS_XPATH,
+    AlmaSRUUrls,
+    match_records,
+)
+
+
+def build_client(
+    config: AlmaSessionConfig | None = None,
+    timeout: int = 30,
+) -> AsyncClient:
+    """Build a connection pooled async http client."""
+    config = config or AlmaSessionConfig()
+    limits = Limits(
+        max_connections=config.pool_maxsize,
+        max_keepalive_connections=config.pool_maxsize if config.keep_alive else 0,
+    )
+    return AsyncClient(limits=limits, timeout=timeout)
+
+
+async def bounded_gather(awaitables: Iterable[Awaitable], concurrency: int) -> list:
+    """Await all awaitables with at most concurrency running at once.
+
+    Exceptions are returned in place of the results.
+    """
+    semaphore = Semaphore(concurrency)
+
+    async def bounded(awaitable: Awaitable) -> object:
+        async with semaphore:
+            return await awaitable
+
+    return await gather(*(bounded(a) for a in awaitables), return_exceptions=True)
+
+
+class AsyncAlmaAPIBase:
+    """Alma remote base service on asyncio.
+
+    The http transport is its own, the parsing of the responses is shared
+    with the synchronous services by the AlmaRecordParser.
+    """
+
+    api = "alma"
+    """Name of the api in the metrics operations, e.g. sru_get."""
+
+    def __init__(
+        self,
+        xpath_to_records: str,
+        namespaces: dict | None = None,
+        *,
+        client: AsyncClient | None = None,
+        timeout: int = 30,
+        rate_limiter: AlmaRateLimiter | None = None,
+        parser: XMLParser | None = None,
+        metrics: AlmaMetrics | None = None,
+    ) -> None:
+        """Create async alma api base service."""
+        self.client = client or build_client(timeout=timeout)
+        self.rate_limiter = rate_limiter
+        self.records = AlmaRecordParser(
+            xpath_to_records,
+            namespaces,
+            api=self.api,
+            parser=parser,
+            metrics=metrics,
+        )
+
+    @property
+    def headers(self) -> dict:
+        """Headers, the client negotiates the compression."""
+        return {"content-type": "application/xml", "accept": "application/xml"}
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        data: bytes | None = None,
+    ) -> Response:
+        """Send request over the pooled client.
+
+        The rate limiter waits in a thread to not block the event loop.
+        """
+        if self.rate_limiter:
+            await to_thread(self.rate_limiter.acquire)
+
+        response = await self.client.request(
+            method,
+            url,
+            content=data,
+            headers=self.headers,
+        )
+
+        if self.rate_limiter:
+            self.rate_limiter.update(response)
+
+        return response
+
+    async def fetch(self, url: str) -> Response:
+        """Alma base api get request without parsing the response.
+
+        :raises AlmaAPIError if request was not successful
+        """
+        try:
+            response = await self.request("GET", url)
+        except ReadTimeout as exc:
+            raise AlmaAPIError(
+                code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                msg="readtimeout",
+            ) from exc
+
+        if response.status_code >= HTTPStatus.BAD_REQUEST:
+            raise AlmaAPIError(code=response.status_code, msg=response.text)
+
+        return response
+
+    async def get(self, url: str) -> list[Element]:
+        """Alma base api get request.
+
+        :raises AlmaAPIError if request was not successful
+        """
+        response = await self.fetch(url)
+        return self.records.extract_alma_records(response.text)
+
+    async def get_records(
+        self,
+        url: str,
+        fields: dict[str, str] | None = None,
+    ) -> list[Element]:
+        """Alma base api get request, records missing in the response are no error.
+
+        :param fields (dict): filled with the leaf elements under the root
+        """
+        response = await self.fetch(url)
+        return list(self.records.iter_alma_records(BytesIO(response.content), fields))
+
+    async def aclose(self) -> None:
+        """Close the pooled http connections."""
+        await self.client.aclose()
+
+
+class AsyncAlmaREST(AsyncAlmaAPIBase):
+    """Alma REST service class on asyncio."""
+
+    api = "rest"
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        client: AsyncClient | None = None,
+        rate_limiter: AlmaRateLimiter | None = None,
+        parser: XMLParser | None = None,
+    ) -> None:
+        """Create object AsyncAlmaREST."""
+        super().__init__(
+            ".//bib/record",
+            client=client,
+            timeout=timeout,
+            rate_limiter=rate_limiter,
+            parser=parser,
+        )
+
+    async def send(self, method: str, url: str, data: bytes) -> str:
+        """Alma rest api put or post request.
+
+        :raises AlmaRESTError if request was not successful
+        """
+        try:
+            response = await self.request(method, url, data)
+        except ReadTimeout as exc:
+            raise AlmaRESTError(
+                code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                msg="readtimeout",
+            ) from exc
+
+        if response.status_code >= HTTPStatus.BAD_REQUEST:
+            raise AlmaRESTError(code=response.status_code, msg=response.text)
+
+        return response.text
+
+    async def put(self, url: str, data: bytes) -> str:
+        """Alma rest api put request."""
+        return await self.send("PUT", url, data)
+
+    async def post(self, url: str, data: bytes) -> str:
+        """Alma rest api post request."""
+        return await self.send("POST", url, data)
+
+
+class AsyncAlmaSRU(AsyncAlmaAPIBase):
+    """Alma SRU service class on asyncio."""
+
+    api = "sru"
+
+    def __init__(
+        self,
+        client: AsyncClient | None = None,
+        rate_limiter: AlmaRateLimiter | None = None,
+        parser: XMLParser | None = None,
+    ) -> None:
+        """Create object AsyncAlmaSRU."""
+        super().__init__(
+            SRU_RECORDS_XPATH,
+            SRU_NAMESPACES,
+            client=client,
+            rate_limiter=rate_limiter,
+            parser=parser,
+        )
+
+
+class AsyncAlmaRESTService(AlmaService):
+    """Alma rest service on asyncio."""
+
+    def __init__(
+        self,
+        config: AlmaRESTConfig,
+        urls: AlmaRESTUrls | None = None,
+        service: AsyncAlmaREST | None = None,
+        *,
+        client: AsyncClient | None = None,
+        rate_limiter: AlmaRateLimiter | None = None,
+        concurrency: int = 10,
+    ) -> None:
+        """Create object AsyncAlmaRESTService."""
+        self.config = config
+        self.urls = urls or AlmaRESTUrls(config)
+        self.service = service or AsyncAlmaREST(
+            self.config.timeout,
+            client=client,
+            rate_limiter=rate_limiter,
+        )
+        self.concurrency = concurrency
+
+    async def get_record(self, mms_id: str) -> list[Element]:
+        """Get record from alma."""
+        return await self.service.get(self.urls.url_get(mms_id))
+
+    async def update_alma_record(self, mms_id: str, record: Element) -> str:
+        """Update the record on alma side."""
+        data = b"<bib>" + tostring(record) + b"</bib>"
+        return await self.service.put(self.urls.url_put(mms_id), data)
+
+    async def create_record(self, record: Element) -> str:
+        """Create record in alma."""
+        data = b"<bib>" + tostring(record) + b"</bib>"
+        return await self.service.post(self.urls.url_post(), data)
+
+    async def update_field(
+        self,
+        mms_id: str,
+        field_json_path: str,
+        new_subfield_value: str,
+    ) -> str | None:
+        """Update field, the record is only sent if the value changed."""
+        record = (await self.get_record(mms_id))[0]
+        field = AlmaRESTService.get_field(record, field_json_path)
+        if field.text == new_subfield_value:
+            return None
+        AlmaRESTService.replace_field(field, new_subfield_value)
+        return await self.update_alma_record(mms_id, record)
+
+    async def get_records(
+        self,
+        mms_ids: Iterable[str],
+    ) -> dict[str, list[Element] | BaseException]:
+        """Get many records at once, failed ones are mapped to their error."""
+        mms_ids = list(dict.fromkeys(mms_ids))
+        results = await bounded_gather(
+            (self.get_record(mms_id) for mms_id in mms_ids),
+            self.concurrency,
+        )
+        return dict(zip(mms_ids, results, strict=True))
+
+    async def update_fields(
+        self,
+        rows: Iterable[tuple[str, str]],
+        field_json_path: str,
+    ) -> dict[str, str | BaseException | None]:
+        """Update the field of many records (mms_id, new_value) at once."""
+        rows = list(rows)
+        results = await bounded_gather(
+            (
+                self.update_field(mms_id, field_json_path, value)
+                for mms_id, value in rows
+            ),
+            self.concurrency,
+        )
+        return {
+            mms_id: result for (mms_id, _), result in zip(rows, results, strict=True)
+        }
+
+    async def aclose(self) -> None:
+        """Close the pooled http connections."""
+        await self.service.aclose()
+
+
+class AsyncAlmaSRUService(AlmaService):
+    """Alma sru service on asyncio."""
+
+    def __init__(
+        self,
+        config: AlmaSRUConfig,
+        urls: AlmaSRUUrls | None = None,
+        service: AsyncAlmaSRU | None = None,
+        *,
+        client: AsyncClient | None = None,
+        rate_limiter: AlmaRateLimiter | None = None,
+        concurrency: int = 10,
+    ) -> None:
+        """Create object AsyncAlmaSRUService."""
+        self.config = config
+        self.urls = urls or AlmaSRUUrls(config)
+        self.service = service or AsyncAlmaSRU(client=client, rate_limiter=rate_limiter)
+        self.concurrency = concurrency
+
+    async def get_record(
+        self,
+        search_value: str,
+        search_key: str | None = None,
+    ) -> list[Element]:
+        """Get the record."""
+        return await self.service.get(self.urls.url(search_value, search_key))
+
+    async def search(self, search_values: list[str], search_key: str) -> list[Element]:
+        """Get all records of the search values by paging through the results."""
+        records: list[Element] = []
+        next_position: str | None = "1"
+
+        while next_position:
+            url = self.urls.url_batch(search_values, search_key, int(next_position))
+            fields: dict[str, str] = {}
+            records += await self.service.get_records(url, fields)
+            next_position = fields.get(SRU_NEXT_POSITION)
+
+        return records
+
+    async def get_records(
+        self,
+        search_values: Iterable[str],
+        search_key: str | None = None,
+    ) -> dict[str, list[Element]]:
+        """Get the records of many search values with batched, concurrent requests.
+
+        :raises AlmaAPIError if one of the batches failed
+        """
+        search_key = search_key or self.urls.search_key
+        batches = list(self.urls.batches(dict.fromkeys(search_values), search_key))
+        pages = await bounded_gather(
+            (self.search(batch, search_key) for batch in batches),
+            self.concurrency,
+        )
+
+        results: dict[str, list[Element]] = {}
+        for batch, records in zip(batches, pages, strict=True):
+            if isinstance(records, BaseException):
+                raise records
+
+            results.update(match_records(records, batch, search_key))
+
+        return results
+
+    async def aclose(self) -> None:
+        """Close the pooled http connections."""
+        await self.service.aclose()
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+
+"""Shared storage backends of the alma services."""
+
+from functools import cache
+
+from redis import Redis
+
+
+@cache
+def redis_from_url(url: str) -> Redis:
+    """Get a redis client for the url.
+
+    The client is cached per url, so all services of a process share the
+    same connection pool.
+    """
+    return Redis.from_url(url)
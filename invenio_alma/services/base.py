@@ -8,71 +8,355 @@
 
 """Alma Base Service."""
 
+from collections.abc import Iterator
+from functools import cached_property
 from http import HTTPStatus
-from xml.etree.ElementTree import Element, fromstring
+from time import perf_counter
+from typing import IO
+from xml.etree.ElementTree import Element
 
-from requests.api import get
-from requests.exceptions import ReadTimeout
+from requests import Response
+from requests.exceptions import ConnectionError, ReadTimeout, Timeout  # noqa: A004
 
-from .errors import AlmaAPIError
+from .cache import CONDITIONAL_HEADERS, AlmaRecordCache
+from .circuit import AlmaCircuitBreaker
+from .config import AlmaRetryConfig
+from .errors import AlmaAPIError, AlmaRecordNotFoundError
+from .metrics import AlmaMetrics
+from .parsers import XMLParser, default_parser, tostring
+from .ratelimit import AlmaRateLimiter
+from .retry import AlmaRetryPolicy
+from .session import AlmaSession
+from .tracing import tracing
 
 
 class AlmaService:
     """Base class for type hints."""
 
 
-class AlmaAPIBase:
-    """Alma remote base service."""
+class AlmaRecordParser:
+    """Parse the alma responses and extract the records.
+
+    It does not depend on the http transport and is shared by the
+    synchronous and the asyncio services.
+    """
 
-    def __init__(self, xpath_to_records: str, namespaces: dict | None = None) -> None:
-        """Create alma api base service."""
+    def __init__(
+        self,
+        xpath_to_records: str,
+        namespaces: dict | None = None,
+        *,
+        api: str = "alma",
+        parser: XMLParser | None = None,
+        metrics: AlmaMetrics | None = None,
+    ) -> None:
+        """Create object AlmaRecordParser.
+
+        The parser defaults to lxml if it is installed, otherwise to the
+        ElementTree of the standard library.
+        """
         self.xpath_to_records = xpath_to_records
         self.namespaces = namespaces or {}
+        self.api = api
+        self.parser = parser or default_parser()
+        self.metrics = metrics or AlmaMetrics()
+
+    def parse_alma_record(self, data: str | bytes) -> Element:
+        """Parse Alma record."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        start = perf_counter()
+        record = self.parser.fromstring(data)
+        self.metrics.observe_parse(self.api, perf_counter() - start)
+        return record
+
+    @cached_property
+    def record_path(self) -> tuple[str, ...]:
+        """Get the expanded tags of the xpath to the records.
+
+        e.g. .//srw:recordData/slim:record becomes
+        ({http://www.loc.gov/zing/srw/}recordData, {http://www.loc.gov/MARC21/slim}record)
+        """
+        tags = []
+        for step in self.xpath_to_records.removeprefix(".//").split("/"):
+            prefix, _, name = step.rpartition(":")
+            tags.append(f"{{{self.namespaces[prefix]}}}{name}" if prefix else name)
+        return tuple(tags)
+
+    def iter_alma_records(
+        self,
+        stream: IO[bytes],
+        fields: dict[str, str] | None = None,
+    ) -> Iterator[Element]:
+        """Extract records incrementally from a stream.
+
+        Each record is yielded as soon as it is parsed. Afterwards it and
+        its already parsed ancestors are removed from the tree, so the
+        memory is bounded by one record and not by the whole response.
+
+        :param stream (IO): response stream
+        :param fields (dict): if given, it is filled with the text of the
+            leaf elements directly under the root, e.g. the number of records
+
+        :return Iterator: extracted records
+        """
+        depth = len(self.record_path)
+        stack: list[Element] = []
+        contains_record: list[bool] = []
+
+        for event, element in self.parser.iterparse(stream, ("start", "end")):
+            if event == "start":
+                stack.append(element)
+                contains_record.append(False)
+                continue
+
+            stack.pop()
+            is_ancestor = contains_record.pop()
+            tags = (*(e.tag for e in stack[len(stack) - depth + 1 :]), element.tag)
+
+            if len(stack) >= depth - 1 and tags == self.record_path:
+                yield element
+                is_ancestor = True
+            elif fields is not None and not is_ancestor and len(stack) == 1:
+                fields[element.tag] = element.text or ""
+
+            if is_ancestor and stack:
+                stack[-1].remove(element)
+                contains_record[-1] = True
+
+    def extract_alma_records(self, data: str) -> list[Element]:
+        """Extract record from request.
+
+        :param data (str): result list
+
+        :return lxml.Element: extracted record
+        """
+        with tracing.span(f"alma.{self.api}.extract_records"):
+            record = self.parse_alma_record(data)
+
+            # extract single record
+            bibs = list(
+                record.iterfind(self.xpath_to_records, namespaces=self.namespaces),
+            )
+
+            if len(bibs) == 0:
+                msg = f"xpath: {self.xpath_to_records} does not find records."
+                raise AlmaRecordNotFoundError(code=HTTPStatus.NOT_FOUND, msg=msg)
+
+            return bibs
+
+
+class AlmaAPIBase:
+    """Alma remote base service."""
+
+    api = "alma"
+    """Name of the api in the metrics operations, e.g. sru_get."""
+
+    def __init__(
+        self,
+        xpath_to_records: str,
+        namespaces: dict | None = None,
+        *,
+        session: AlmaSession | None = None,
+        timeout: int = 30,
+        rate_limiter: AlmaRateLimiter | None = None,
+        parser: XMLParser | None = None,
+        retry: AlmaRetryPolicy | None = None,
+        circuit: AlmaCircuitBreaker | None = None,
+        cache: AlmaRecordCache | None = None,
+        metrics: AlmaMetrics | None = None,
+    ) -> None:
+        """Create alma api base service.
+
+        The responses are parsed by an AlmaRecordParser with the parser.
+        With a cache the get requests are conditional and a not modified
+        response is served from it.
+        """
+        self.session = session or AlmaSession()
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retry = retry or AlmaRetryPolicy(AlmaRetryConfig(max_attempts=1))
+        self.circuit = circuit
+        self.cache = cache
+        self.metrics = metrics or AlmaMetrics()
+        self.records = AlmaRecordParser(
+            xpath_to_records,
+            namespaces,
+            api=self.api,
+            parser=parser,
+            metrics=self.metrics,
+        )
 
     @property
     def headers(self) -> dict:
-        """Headers."""
+        """Headers.
+
+        The compressed response is decompressed while it is parsed.
+        """
         return {
             "content-type": "application/xml",
             "accept": "application/xml",
+            "accept-encoding": self.session.config.accept_encoding or "identity",
         }
 
-    @staticmethod
-    def parse_alma_record(data: str) -> Element:
+    @property
+    def xpath_to_records(self) -> str:
+        """Get the xpath to the records within the responses."""
+        return self.records.xpath_to_records
+
+    @property
+    def namespaces(self) -> dict:
+        """Get the namespaces of the responses."""
+        return self.records.namespaces
+
+    @property
+    def parser(self) -> XMLParser:
+        """Get the xml parser."""
+        return self.records.parser
+
+    def parse_alma_record(self, data: str | bytes) -> Element:
         """Parse Alma record."""
-        data = data.encode("utf-8")
+        return self.records.parse_alma_record(data)
 
-        return fromstring(data)  # noqa: S314
+    def iter_alma_records(
+        self,
+        stream: IO[bytes],
+        fields: dict[str, str] | None = None,
+    ) -> Iterator[Element]:
+        """Extract records incrementally from a stream."""
+        return self.records.iter_alma_records(stream, fields)
 
     def extract_alma_records(self, data: str) -> list[Element]:
-        """Extract record from request.
+        """Extract record from request."""
+        return self.records.extract_alma_records(data)
 
-        :param data (str): result list
+    def request(
+        self,
+        method: str,
+        url: str,
+        data: str | None = None,
+        *,
+        stream: bool = False,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """Send request over the pooled session.
 
-        :return lxml.Element: extracted record
+        :param method (str): http method
+        :param url (str): url to api
+        :param data (str): payload
+        :param stream (bool): do not read the response body
+        :param headers (dict): headers in addition to the default headers
+
+        Failed requests are retried according to the retry policy. The
+        circuit breaker counts the outcome after the last attempt. The
+        metrics get the duration over all attempts, until the headers of
+        a streamed response.
+
+        :raises AlmaQuotaExceededError if the daily quota is used up
+        :raises AlmaCircuitOpenError if alma is considered unavailable
+
+        :return Response: response object
         """
-        record = self.parse_alma_record(data)
+        with tracing.span(f"alma.{self.api}.request", method=method) as span:
+            if self.circuit:
+                self.circuit.before_request()
 
-        # extract single record
-        bibs = list(record.iterfind(self.xpath_to_records, namespaces=self.namespaces))
+            operation = f"{self.api}_{method.lower()}"
+            start = perf_counter()
 
-        if len(bibs) == 0:
-            msg = f"xpath: {self.xpath_to_records} does not find records."
-            raise AlmaAPIError(code=HTTPStatus.INTERNAL_SERVER_ERROR, msg=msg)
+            try:
+                response = self.request_with_retry(
+                    method,
+                    url,
+                    data,
+                    stream=stream,
+                    headers=headers,
+                )
+            except (ConnectionError, Timeout) as error:
+                self.metrics.count_error(operation, type(error).__name__)
+                if self.circuit:
+                    self.circuit.record_failure()
+                raise
 
-        return bibs
+            size = int(response.headers.get("content-length") or 0)
+            self.metrics.observe_request(operation, perf_counter() - start, size)
+            if response.status_code >= HTTPStatus.BAD_REQUEST:
+                self.metrics.count_error(operation, response.status_code)
 
-    def get(self, url: str) -> list[Element]:
-        """Alma base api get request.
+            if self.circuit:
+                self.circuit.record_response(response)
+
+            if span:
+                span.set_attribute("status_code", response.status_code)
+
+            return response
+
+    def request_with_retry(
+        self,
+        method: str,
+        url: str,
+        data: str | None = None,
+        *,
+        stream: bool = False,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """Send the request and retry it according to the retry policy."""
+        headers = {**self.headers, **(headers or {})}
+
+        if data is not None:
+            data, body_headers = self.session.compress_body(data)
+            headers.update(body_headers)
+        attempt = 1
+
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            try:
+                response = self.session.request(
+                    method,
+                    url,
+                    data=data,
+                    headers=headers,
+                    timeout=self.timeout,
+                    stream=stream,
+                )
+            except (ConnectionError, Timeout) as error:
+                wait = self.retry.retry_error(method, error, attempt)
+                if wait is None:
+                    raise
+            else:
+                if self.rate_limiter:
+                    self.rate_limiter.update(response)
+
+                wait = self.retry.retry_response(method, response, attempt)
+                if wait is None:
+                    return response
+                response.close()
+
+            self.retry.wait(wait)
+            attempt += 1
+
+    def fetch(
+        self,
+        url: str,
+        *,
+        stream: bool = False,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """Alma base api get request without parsing the response.
 
         :param url (str): url to api
+        :param stream (bool): do not read the response body
+        :param headers (dict): headers in addition to the default headers
 
-        :raises AlmaRESTError if request was not successful
+        :raises AlmaAPIError if request was not successful
 
-        :return str: response content
+        :return Response: response object
         """
         try:
-            response = get(url, headers=self.headers, timeout=30)
+            response = self.request("GET", url, stream=stream, headers=headers)
         except ReadTimeout as exc:
             raise AlmaAPIError(
                 code=HTTPStatus.INTERNAL_SERVER_ERROR,
@@ -82,4 +366,80 @@ class AlmaAPIBase:
         if response.status_code >= HTTPStatus.BAD_REQUEST:
             raise AlmaAPIError(code=response.status_code, msg=response.text)
 
-        return self.extract_alma_records(response.text)
+        return response
+
+    def get_iter(
+        self,
+        url: str,
+        fields: dict[str, str] | None = None,
+    ) -> Iterator[Element]:
+        """Alma base api get request which streams the records.
+
+        :param url (str): url to api
+        :param fields (dict): filled with the leaf elements under the root
+
+        :raises AlmaAPIError if request was not successful
+
+        :return Iterator: records as they are parsed
+        """
+        response = self.fetch(url, stream=True)
+        # decompress gzip/deflate chunk by chunk while the parser reads
+        response.raw.decode_content = True
+
+        parsing = 0.0
+        start = perf_counter()
+
+        try:
+            for record in self.iter_alma_records(response.raw, fields):
+                parsing += perf_counter() - start
+                yield record
+                start = perf_counter()
+            parsing += perf_counter() - start
+            self.metrics.observe_parse(self.api, parsing)
+        finally:
+            response.close()
+
+    def get(self, url: str) -> list[Element]:
+        """Alma base api get request.
+
+        :param url (str): url to api
+
+        With a cache the request is conditional on the validators of the
+        last response of the url. A 304 not modified response is served
+        from the records cached with the validators. The url is not added
+        to the span, it contains the api key.
+
+        :raises AlmaRESTError if request was not successful
+
+        :return str: response content
+        """
+        with tracing.span(f"alma.{self.api}.get"):
+            if not self.cache:
+                response = self.fetch(url)
+                return self.extract_alma_records(response.text)
+
+            cached = self.cache.get_validated(url)
+            headers = {}
+            if cached:
+                validators, cached_records = cached
+                headers = {
+                    CONDITIONAL_HEADERS[header]: value
+                    for header, value in validators.items()
+                }
+
+            response = self.fetch(url, headers=headers)
+
+            if cached and response.status_code == HTTPStatus.NOT_MODIFIED:
+                return [self.parse_alma_record(record) for record in cached_records]
+
+            records = self.extract_alma_records(response.text)
+
+            if validators := {
+                header: response.headers[header]
+                for header in CONDITIONAL_HEADERS
+                if response.headers.get(header)
+            }:
+                serialized = [tostring(record) for record in records]
+                self.cache.set_validated(url, validators, serialized)
+
+            return records
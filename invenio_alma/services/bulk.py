@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+
+"""Alma bulk field updates."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from json import dumps, loads
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+
+from requests import RequestException
+
+from ..executors import run_entries  # noqa: TID252
+from .errors import (
+    AlmaAPIError,
+    AlmaCircuitOpenError,
+    AlmaQuotaExceededError,
+    AlmaRESTError,
+)
+from .rest import AlmaRESTService
+from .utils import parse_jpath
+
+ABORT_ON = (AlmaCircuitOpenError, AlmaQuotaExceededError)
+"""Errors which stop the bulk update instead of failing one record."""
+
+
+@dataclass
+class BulkUpdateResult:
+    """Result of a bulk update."""
+
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    resumed: int = 0
+    stopped: str = ""
+    errors: dict[str, str] = field(default_factory=dict)
+    started: float = field(default_factory=monotonic)
+    finished: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        """Get the number of records processed in this run."""
+        return self.updated + self.unchanged + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        """Get the seconds the run took."""
+        return (self.finished or monotonic()) - self.started
+
+    @property
+    def rate(self) -> float:
+        """Get the processed records per second."""
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class BulkUpdateState:
+    """Resumable state of a bulk update.
+
+    Each finished record is appended as a json line to the state file.
+    Records which were updated or unchanged in a previous run are
+    skipped on resume, failed records are tried again.
+    """
+
+    done_states = frozenset({"updated", "unchanged"})
+
+    def __init__(self, path: Path | None = None) -> None:
+        """Create object BulkUpdateState."""
+        self.path = path
+        self.lock = Lock()
+        self.done: set[str] = set()
+
+        if path and path.is_file():
+            with path.open(encoding="utf-8") as state_file:
+                for line in state_file:
+                    entry = loads(line)
+                    if entry["state"] in self.done_states:
+                        self.done.add(entry["mms_id"])
+
+    def is_done(self, mms_id: str) -> bool:
+        """Check if the record was finished in a previous run."""
+        return mms_id in self.done
+
+    def save(self, mms_id: str, state: str, error: str = "") -> None:
+        """Append the state of the record to the state file."""
+        if not self.path:
+            return
+
+        line = dumps({"mms_id": mms_id, "state": state, "error": error})
+        with self.lock, self.path.open("a", encoding="utf-8") as state_file:
+            state_file.write(line + "\n")
+
+
+class BulkFieldUpdater:
+    """Update one field in many alma records.
+
+    GET, compare and PUT of the records run in a pool of workers, so the
+    requests of different records overlap. Records which already have the
+    new value are not sent back to alma.
+    """
+
+    def __init__(
+        self,
+        service: AlmaRESTService,
+        field_json_path: str,
+        workers: int = 4,
+        state: BulkUpdateState | None = None,
+    ) -> None:
+        """Create object BulkFieldUpdater.
+
+        :raises ValueError if the field json path is invalid
+        """
+        parse_jpath(field_json_path)
+        self.service = service
+        self.field_json_path = field_json_path
+        self.workers = workers
+        self.state = state or BulkUpdateState()
+        self.lock = Lock()
+
+    def update(self, mms_id: str, new_value: str, result: BulkUpdateResult) -> None:
+        """Update the field of one record.
+
+        :raises AlmaQuotaExceededError if the daily quota is used up
+        :raises AlmaCircuitOpenError if alma is considered unavailable
+        """
+        try:
+            response = self.service.update_field(
+                mms_id,
+                self.field_json_path,
+                new_value,
+            )
+        except ABORT_ON:
+            raise
+        except (AlmaAPIError, AlmaRESTError, RequestException, RuntimeError) as error:
+            with self.lock:
+                result.failed += 1
+                result.errors[mms_id] = str(error)
+            self.state.save(mms_id, "failed", str(error))
+            return
+
+        state = "unchanged" if response is None else "updated"
+        with self.lock:
+            setattr(result, state, getattr(result, state) + 1)
+        self.state.save(mms_id, state)
+
+    def run(self, rows: Iterable[tuple[str, str]]) -> BulkUpdateResult:
+        """Update the field of all rows (mms_id, new_value).
+
+        If alma is unavailable or the daily quota is used up, the run stops
+        and the error is kept in stopped. The rows which are not finished
+        are processed by a resumed run.
+        """
+        result = BulkUpdateResult()
+
+        def pending() -> Iterable[tuple[str, str]]:
+            for mms_id, new_value in rows:
+                if self.state.is_done(mms_id):
+                    result.resumed += 1
+                    continue
+                yield mms_id, new_value
+
+        def process(row: tuple[str, str]) -> None:
+            self.update(*row, result)
+
+        try:
+            run_entries(pending(), process, self.workers, ABORT_ON)
+        except ABORT_ON as error:
+            result.stopped = str(error)
+        result.finished = monotonic()
+        return result
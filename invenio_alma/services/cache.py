@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+
+"""Alma record cache."""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterator
+from hashlib import sha256
+from threading import Lock
+from time import monotonic
+from xml.etree.ElementTree import Element
+
+from redis import Redis
+
+SEPARATOR = b"\0"
+"""Separator of the serialized records, it can not be part of a xml document."""
+
+CONDITIONAL_HEADERS = {"ETag": "If-None-Match", "Last-Modified": "If-Modified-Since"}
+"""Validator response headers and the request headers to send them back."""
+
+
+def local_name(element: Element) -> str:
+    """Get the tag of the element without namespace.
+
+    Comments and processing instructions have no name.
+    """
+    if not isinstance(element.tag, str):
+        return ""
+    return element.tag.rpartition("}")[2]
+
+
+CACHED_SEARCH_KEYS = frozenset({"mms_id", "local_control_field_009", "local_field_995"})
+"""Search keys of the fields record_cache_keys gets the values of."""
+
+
+def record_cache_keys(record: Element) -> Iterator[tuple[str, str]]:
+    """Get the cache keys under which the record could be cached.
+
+    These are the mms_id, the ac number and the local field 995 values.
+    """
+    for field in record.iter():
+        name = local_name(field)
+        tag = field.get("tag")
+
+        if name == "controlfield" and tag == "001" and field.text:
+            yield "mms_id", field.text
+        elif name == "controlfield" and tag == "009" and field.text:
+            yield "local_control_field_009", field.text
+        elif name == "datafield" and tag == "995":
+            for subfield in field:
+                if subfield.text:
+                    yield "local_field_995", subfield.text
+
+
+def url_key(url: str) -> str:
+    """Get the cache key of the url, hashed to keep the api key out of the cache."""
+    return sha256(url.encode("utf-8")).hexdigest()[:32]
+
+
+class AlmaRecordCache(ABC):
+    """Alma record cache base class.
+
+    The records are cached serialized by (search_key, search_value). An
+    empty list caches that alma does not know a record for the key.
+    """
+
+    @abstractmethod
+    def get(self, search_key: str, search_value: str) -> list[bytes] | None:
+        """Get the cached records, None if the key is not cached."""
+
+    @abstractmethod
+    def set(self, search_key: str, search_value: str, records: list[bytes]) -> None:
+        """Cache the records, an empty list caches not found."""
+
+    @abstractmethod
+    def invalidate(self, search_key: str, search_value: str) -> None:
+        """Remove the key from the cache."""
+
+    def invalidate_record(self, record: Element) -> None:
+        """Remove all keys of the record from the cache."""
+        for search_key, search_value in record_cache_keys(record):
+            self.invalidate(search_key, search_value)
+
+    @abstractmethod
+    def get_validated(self, url: str) -> tuple[dict[str, str], list[bytes]] | None:
+        """Get the validators and the records of the last response of the url."""
+
+    @abstractmethod
+    def set_validated(
+        self,
+        url: str,
+        validators: dict[str, str],
+        records: list[bytes],
+    ) -> None:
+        """Cache the validators and the records of the response of the url."""
+
+
+class MemoryRecordCache(AlmaRecordCache):
+    """In-process LRU record cache with time to live."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: int = 600,
+        negative_ttl: int = 300,
+        validator_ttl: int = 86400,
+    ) -> None:
+        """Create object MemoryRecordCache."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.validator_ttl = validator_ttl
+        self.lock = Lock()
+        self.entries: OrderedDict[tuple[str, str], tuple[float, list[bytes]]] = (
+            OrderedDict()
+        )
+        self.validated: OrderedDict[
+            str,
+            tuple[float, dict[str, str], list[bytes]],
+        ] = OrderedDict()
+
+    def get(self, search_key: str, search_value: str) -> list[bytes] | None:
+        """Get the cached records, None if the key is not cached."""
+        key = (search_key, search_value)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            expires, records = entry
+            if expires < monotonic():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return records
+
+    def set(self, search_key: str, search_value: str, records: list[bytes]) -> None:
+        """Cache the records, an empty list caches not found."""
+        ttl = self.ttl if records else self.negative_ttl
+        key = (search_key, search_value)
+        with self.lock:
+            self.entries[key] = (monotonic() + ttl, records)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, search_key: str, search_value: str) -> None:
+        """Remove the key from the cache."""
+        with self.lock:
+            self.entries.pop((search_key, search_value), None)
+
+    def get_validated(self, url: str) -> tuple[dict[str, str], list[bytes]] | None:
+        """Get the validators and the records of the last response of the url."""
+        key = url_key(url)
+        with self.lock:
+            entry = self.validated.get(key)
+            if entry is None:
+                return None
+
+            expires, validators, records = entry
+            if expires < monotonic():
+                del self.validated[key]
+                return None
+
+            self.validated.move_to_end(key)
+            return validators, records
+
+    def set_validated(
+        self,
+        url: str,
+        validators: dict[str, str],
+        records: list[bytes],
+    ) -> None:
+        """Cache the validators and the records of the response of the url."""
+        key = url_key(url)
+        with self.lock:
+            self.validated[key] = (
+                monotonic() + self.validator_ttl,
+                validators,
+                records,
+            )
+            self.validated.move_to_end(key)
+            while len(self.validated) > self.maxsize:
+                self.validated.popitem(last=False)
+
+
+class RedisRecordCache(AlmaRecordCache):
+    """Redis record cache, shared by all processes using the same redis.
+
+    The size is bounded by the ttl and the eviction policy of redis.
+    """
+
+    prefix = "alma:records"
+
+    def __init__(
+        self,
+        redis: Redis,
+        ttl: int = 600,
+        negative_ttl: int = 300,
+        validator_ttl: int = 86400,
+    ) -> None:
+        """Create object RedisRecordCache."""
+        self.redis = redis
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.validator_ttl = validator_ttl
+
+    def name(self, search_key: str, search_value: str) -> str:
+        """Get the redis key."""
+        return f"{self.prefix}:{search_key}:{search_value}"
+
+    def get(self, search_key: str, search_value: str) -> list[bytes] | None:
+        """Get the cached records, None if the key is not cached."""
+        value = self.redis.get(self.name(search_key, search_value))
+        if value is None:
+            return None
+        return value.split(SEPARATOR) if value else []
+
+    def set(self, search_key: str, search_value: str, records: list[bytes]) -> None:
+        """Cache the records, an empty list caches not found."""
+        ttl = self.ttl if records else self.negative_ttl
+        value = SEPARATOR.join(records)
+        self.redis.set(self.name(search_key, search_value), value, ex=ttl)
+
+    def invalidate(self, search_key: str, search_value: str) -> None:
+        """Remove the key from the cache."""
+        self.redis.delete(self.name(search_key, search_value))
+
+    def get_validated(self, url: str) -> tuple[dict[str, str], list[bytes]] | None:
+        """Get the validators and the records of the last response of the url."""
+        entry = self.redis.hgetall(f"{self.prefix}:url:{url_key(url)}")
+        if not entry:
+            return None
+
+        records = entry.pop(b"records")
+        validators = {
+            header.decode("utf-8"): value.decode("utf-8")
+            for header, value in entry.items()
+        }
+        return validators, records.split(SEPARATOR) if records else []
+
+    def set_validated(
+        self,
+        url: str,
+        validators: dict[str, str],
+        records: list[bytes],
+    ) -> None:
+        """Cache the validators and the records of the response of the url."""
+        name = f"{self.prefix}:url:{url_key(url)}"
+        pipe = self.redis.pipeline()
+        pipe.delete(name)
+        pipe.hset(name, mapping={**validators, "records": SEPARATOR.join(records)})
+        pipe.expire(name, self.validator_ttl)
+        pipe.execute()
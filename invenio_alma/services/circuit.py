@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+
+"""Alma API circuit breaker."""
+
+from abc import ABC, abstractmethod
+from http import HTTPStatus
+from threading import Lock
+from time import monotonic
+
+from redis import Redis
+from requests import Response
+
+from .config import AlmaCircuitConfig
+from .errors import AlmaCircuitOpenError
+
+ALLOW_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local reset_timeout = tonumber(ARGV[1])
+local probes = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'opened', 'probes')
+local opened = tonumber(state[1]) or 0
+if opened == 0 then
+  return '0'
+end
+if now - opened < reset_timeout then
+  return tostring(reset_timeout - (now - opened))
+end
+local used = redis.call('HINCRBY', KEYS[1], 'probes', 1)
+if used >= probes then
+  redis.call('HSET', KEYS[1], 'opened', now, 'probes', 0)
+end
+return '0'
+"""
+
+FAILURE_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local threshold = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+if failures >= threshold then
+  redis.call('HSET', KEYS[1], 'opened', now, 'probes', 0)
+end
+redis.call('EXPIRE', KEYS[1], ttl)
+return failures
+"""
+
+
+class CircuitStore(ABC):
+    """Circuit store, keeps the failures and the state of the circuits.
+
+    A circuit is closed until it is opened by too many consecutive
+    failures. After the reset timeout it is half open and lets the
+    configured number of probe calls through, then it is open again until
+    a probe succeeds and closes it or the next reset timeout has passed.
+    """
+
+    @abstractmethod
+    def allow(self, key: str, reset_timeout: float, probes: int) -> float:
+        """Get the seconds until a call is allowed, 0 if it is allowed now."""
+
+    @abstractmethod
+    def failure(self, key: str, threshold: int, ttl: int) -> int:
+        """Count a failure, open the circuit at the threshold."""
+
+    @abstractmethod
+    def success(self, key: str) -> None:
+        """Close the circuit and reset the failures."""
+
+
+class MemoryCircuitStore(CircuitStore):
+    """In-process circuit store."""
+
+    def __init__(self) -> None:
+        """Create object MemoryCircuitStore."""
+        self.lock = Lock()
+        self.circuits: dict[str, dict[str, float]] = {}
+
+    def allow(self, key: str, reset_timeout: float, probes: int) -> float:
+        """Get the seconds until a call is allowed, 0 if it is allowed now."""
+        with self.lock:
+            circuit = self.circuits.get(key)
+            if not circuit or not circuit["opened"]:
+                return 0.0
+
+            now = monotonic()
+            if now - circuit["opened"] < reset_timeout:
+                return reset_timeout - (now - circuit["opened"])
+
+            circuit["probes"] += 1
+            if circuit["probes"] >= probes:
+                circuit.update(opened=now, probes=0)
+        return 0.0
+
+    def failure(self, key: str, threshold: int, ttl: int) -> int:  # noqa: ARG002
+        """Count a failure, open the circuit at the threshold."""
+        with self.lock:
+            circuit = self.circuits.setdefault(
+                key,
+                {"failures": 0, "opened": 0.0, "probes": 0},
+            )
+            circuit["failures"] += 1
+            if circuit["failures"] >= threshold:
+                circuit.update(opened=monotonic(), probes=0)
+        return int(circuit["failures"])
+
+    def success(self, key: str) -> None:
+        """Close the circuit and reset the failures."""
+        with self.lock:
+            self.circuits.pop(key, None)
+
+
+class RedisCircuitStore(CircuitStore):
+    """Redis circuit store, shared by all workers using the same redis."""
+
+    prefix = "alma:circuit"
+
+    def __init__(self, redis: Redis) -> None:
+        """Create object RedisCircuitStore."""
+        self.redis = redis
+        self.allow_script = redis.register_script(ALLOW_SCRIPT)
+        self.failure_script = redis.register_script(FAILURE_SCRIPT)
+
+    def allow(self, key: str, reset_timeout: float, probes: int) -> float:
+        """Get the seconds until a call is allowed, 0 if it is allowed now."""
+        wait = self.allow_script(
+            keys=[f"{self.prefix}:{key}"],
+            args=[reset_timeout, probes],
+        )
+        return float(wait)
+
+    def failure(self, key: str, threshold: int, ttl: int) -> int:
+        """Count a failure, open the circuit at the threshold."""
+        failures = self.failure_script(
+            keys=[f"{self.prefix}:{key}"],
+            args=[threshold, ttl],
+        )
+        return int(failures)
+
+    def success(self, key: str) -> None:
+        """Close the circuit and reset the failures."""
+        self.redis.delete(f"{self.prefix}:{key}")
+
+
+class AlmaCircuitBreaker:
+    """Circuit breaker around an alma host.
+
+    Connection errors, timeouts and 5xx responses count as failures, every
+    other response closes the circuit. While the circuit is open the calls
+    fail fast with AlmaCircuitOpenError instead of waiting for the timeout.
+    """
+
+    def __init__(
+        self,
+        config: AlmaCircuitConfig,
+        key: str,
+        store: CircuitStore | None = None,
+    ) -> None:
+        """Create object AlmaCircuitBreaker."""
+        self.config = config
+        self.key = key
+        self.store = store or MemoryCircuitStore()
+
+    def before_request(self) -> None:
+        """Check if the call is allowed.
+
+        :raises AlmaCircuitOpenError if the circuit is open
+        """
+        wait = self.store.allow(
+            self.key,
+            self.config.reset_timeout,
+            self.config.half_open_probes,
+        )
+
+        if wait > 0:
+            msg = f"alma is unavailable, next probe in {wait:.0f}s"
+            raise AlmaCircuitOpenError(
+                code=HTTPStatus.SERVICE_UNAVAILABLE,
+                msg=msg,
+                retry_after=wait,
+            )
+
+    def record_failure(self) -> None:
+        """Count a failed call."""
+        ttl = int(self.config.reset_timeout * 10) + 60
+        self.store.failure(self.key, self.config.failure_threshold, ttl)
+
+    def record_response(self, response: Response) -> None:
+        """Count the response as failure or success."""
+        if response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            self.record_failure()
+        else:
+            self.store.success(self.key)
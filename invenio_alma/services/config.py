@@ -25,10 +25,85 @@ class AlmaRESTConfig:
         return int(self.time_out)
 
 
-@dataclass
+@dataclass(frozen=True)
 class AlmaSRUConfig:
-    """Alma sru service config."""
+    """Alma sru service config.
+
+    It is frozen, a service and its urls are shared between threads. Pass
+    the search key per call to search by another key.
+    """
 
     search_key: str = ""
     domain: str = ""
     institution_code: str = ""
+    maximum_records: int = 50
+    max_url_length: int = 2000
+
+
+@dataclass
+class AlmaSessionConfig:
+    """Alma http session config.
+
+    The pool is kept per host. pool_connections is the number of host
+    pools which are cached, pool_maxsize is the number of connections
+    kept open per host. accept_encoding is sent to negotiate compressed
+    responses. With compress_requests the PUT and POST bodies of at least
+    compress_min_size bytes are sent gzip compressed.
+    """
+
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    keep_alive: bool = True
+    accept_encoding: str = "gzip, deflate"
+    compress_requests: bool = False
+    compress_min_size: int = 1024
+
+
+@dataclass
+class AlmaRateLimitConfig:
+    """Alma rate limit config.
+
+    per_second and burst configure the token bucket. daily_limit is the
+    number of calls per day, 0 means only the remaining calls reported by
+    alma are used. Below daily_slowdown remaining calls the limiter
+    spreads the calls over the rest of the day and it stops at
+    daily_reserve remaining calls or if the spread calls would wait longer
+    than max_wait.
+    """
+
+    per_second: float = 25.0
+    burst: int = 25
+    daily_limit: int = 0
+    daily_slowdown: int = 10000
+    daily_reserve: int = 1000
+    max_wait: float = 60.0
+
+
+@dataclass
+class AlmaRetryConfig:
+    """Alma retry config.
+
+    max_attempts includes the first call, 1 disables the retries. The
+    backoff is backoff_factor * 2 ** (attempt - 1), capped at max_backoff.
+    """
+
+    max_attempts: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    jitter: bool = True
+    statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+    idempotent_methods: frozenset[str] = frozenset({"GET", "HEAD", "PUT"})
+
+
+@dataclass
+class AlmaCircuitConfig:
+    """Alma circuit breaker config.
+
+    The circuit opens after failure_threshold consecutive failures and
+    lets half_open_probes calls through after reset_timeout seconds.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 60.0
+    half_open_probes: int = 1
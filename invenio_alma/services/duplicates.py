@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Index of the cms ids which already have a record in alma."""
+
+from collections.abc import Iterable
+from threading import Lock
+from time import monotonic
+
+from .sru import AlmaSRUService
+
+
+class AlmaDuplicateIndex:
+    """Index of the cms ids which already have a record in alma.
+
+    The cms ids of a batch of candidates are looked up at once with the
+    batched sru search of the local field 995. A looked up cms id is
+    answered from the index until it is older than max_age, then it is
+    looked up again. A cms id which was not preloaded is looked up on its
+    own, like before.
+
+    A set is used instead of a bloom filter, a false positive would skip
+    the creation of a record without a trace. Only the cms ids of the
+    candidates are kept and the outdated ones are dropped on preload.
+    """
+
+    search_key = "local_field_995"
+
+    def __init__(self, sru_service: AlmaSRUService, max_age: float = 600) -> None:
+        """Create object AlmaDuplicateIndex.
+
+        :param sru_service (AlmaSRUService): service to search alma
+        :param max_age (float): seconds a looked up cms id is answered from the index
+        """
+        self.sru_service = sru_service
+        self.max_age = max_age
+        self.lock = Lock()
+        self.existing: set[str] = set()
+        self.checked: dict[str, float] = {}
+        self.lookups = 0
+
+    def is_fresh(self, cms_id: str, now: float) -> bool:
+        """Check if the cms id was looked up within max_age."""
+        checked = self.checked.get(cms_id)
+        return checked is not None and now - checked < self.max_age
+
+    def preload(self, cms_ids: Iterable[str]) -> None:
+        """Look up the cms ids which are not in the index or outdated.
+
+        :raises AlmaAPIError if the sru search failed
+        """
+        now = monotonic()
+        with self.lock:
+            outdated = [
+                cms_id
+                for cms_id, checked in self.checked.items()
+                if now - checked >= self.max_age
+            ]
+            for cms_id in outdated:
+                del self.checked[cms_id]
+                self.existing.discard(cms_id)
+            missing = [
+                cms_id
+                for cms_id in dict.fromkeys(cms_ids)
+                if cms_id not in self.checked
+            ]
+
+        if not missing:
+            return
+
+        results = self.sru_service.get_records(missing, self.search_key)
+
+        with self.lock:
+            self.lookups += 1
+            for cms_id, records in results.items():
+                self.checked[cms_id] = now
+                if records:
+                    self.existing.add(cms_id)
+                else:
+                    self.existing.discard(cms_id)
+
+    def is_duplicate(self, cms_id: str) -> bool:
+        """Check if there is already a record with the cms id in alma.
+
+        :raises AlmaAPIError if the sru search failed
+        """
+        with self.lock:
+            fresh = self.is_fresh(cms_id, monotonic())
+
+        if not fresh:
+            self.preload([cms_id])
+
+        with self.lock:
+            return cms_id in self.existing
+
+    def add(self, cms_id: str) -> None:
+        """Add the cms id of a record created in alma.
+
+        The sru index of alma shows new records only after a while, the
+        created record is known to the index right away.
+        """
+        with self.lock:
+            self.checked[cms_id] = monotonic()
+            self.existing.add(cms_id)
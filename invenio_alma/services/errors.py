@@ -30,3 +30,20 @@ class AlmaSRUError(Exception):
     def __init__(self, code: int, msg: str) -> None:
         """Create alma sru error."""
         super().__init__(f"Alma SRU error code={code} msg='{msg}'")
+
+
+class AlmaQuotaExceededError(AlmaAPIError):
+    """Alma daily api quota exceeded error class."""
+
+
+class AlmaRecordNotFoundError(AlmaAPIError):
+    """Alma record not found error class."""
+
+
+class AlmaCircuitOpenError(AlmaAPIError):
+    """Alma circuit open error class, alma is considered unavailable."""
+
+    def __init__(self, code: int, msg: str, retry_after: float = 0.0) -> None:
+        """Create alma circuit open error."""
+        super().__init__(code, msg)
+        self.retry_after = retry_after
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+
+"""Fingerprints of alma records to detect unchanged records."""
+
+from abc import ABC, abstractmethod
+from hashlib import sha256
+from xml.etree.ElementTree import Element
+
+from redis import Redis
+
+from .cache import local_name
+
+IGNORED_CONTROLFIELDS = frozenset({"005"})
+"""Control fields which change without a change of the content."""
+
+LEADER_CONTENT = slice(5, None)
+"""Part of the leader without the record length."""
+
+
+def record_fingerprint(records: list[Element]) -> str:
+    """Get the hash of the normalized marc content of the records.
+
+    Namespaces, whitespace around values, the record length of the leader
+    and the time of the latest transaction (005) are not part of the hash.
+    """
+    digest = sha256()
+
+    for record in records:
+        for field in record.iter():
+            name = local_name(field)
+            text = (field.text or "").strip()
+
+            if name == "leader":
+                line = f"LDR|{text[LEADER_CONTENT]}"
+            elif name == "controlfield":
+                if field.get("tag") in IGNORED_CONTROLFIELDS:
+                    continue
+                line = f"{field.get('tag')}|{text}"
+            elif name == "datafield":
+                line = f"{field.get('tag')}|{field.get('ind1')}{field.get('ind2')}"
+            elif name == "subfield":
+                line = f"${field.get('code')}|{text}"
+            else:
+                continue
+
+            digest.update(line.encode("utf-8") + b"\n")
+
+    return digest.hexdigest()
+
+
+class FingerprintStore(ABC):
+    """Fingerprint store, keeps the fingerprint of the last imported record."""
+
+    @abstractmethod
+    def get(self, key: str) -> str | None:
+        """Get the stored fingerprint."""
+
+    @abstractmethod
+    def set(self, key: str, fingerprint: str) -> None:
+        """Store the fingerprint."""
+
+
+class MemoryFingerprintStore(FingerprintStore):
+    """In-process fingerprint store."""
+
+    def __init__(self) -> None:
+        """Create object MemoryFingerprintStore."""
+        self.fingerprints: dict[str, str] = {}
+
+    def get(self, key: str) -> str | None:
+        """Get the stored fingerprint."""
+        return self.fingerprints.get(key)
+
+    def set(self, key: str, fingerprint: str) -> None:
+        """Store the fingerprint."""
+        self.fingerprints[key] = fingerprint
+
+
+class RedisFingerprintStore(FingerprintStore):
+    """Redis fingerprint store, all fingerprints are kept in one hash."""
+
+    name = "alma:fingerprints"
+
+    def __init__(self, redis: Redis) -> None:
+        """Create object RedisFingerprintStore."""
+        self.redis = redis
+
+    def get(self, key: str) -> str | None:
+        """Get the stored fingerprint."""
+        fingerprint = self.redis.hget(self.name, key)
+        return fingerprint.decode("utf-8") if fingerprint is not None else None
+
+    def set(self, key: str, fingerprint: str) -> None:
+        """Store the fingerprint."""
+        self.redis.hset(self.name, key, fingerprint)
+
+
+class AlmaFingerprints:
+    """Change detection of alma records by their fingerprints.
+
+    A record with the same fingerprint as at the last import is unchanged,
+    the import can be skipped. The fingerprint is only stored with
+    remember after a successful import. The skipped entries are counted
+    as unchanged outcome in the finished log and the metrics of the task.
+    """
+
+    def __init__(self, store: FingerprintStore | None = None) -> None:
+        """Create object AlmaFingerprints."""
+        self.store = store or MemoryFingerprintStore()
+
+    def is_unchanged(self, key: str, records: list[Element]) -> bool:
+        """Check if the records are unchanged since the last import."""
+        return self.store.get(key) == record_fingerprint(records)
+
+    def remember(self, key: str, records: list[Element]) -> None:
+        """Store the fingerprint of the imported records."""
+        self.store.set(key, record_fingerprint(records))
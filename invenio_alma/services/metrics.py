@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Metrics of the alma calls and the task runs."""
+
+from collections import defaultdict
+from functools import cache
+from threading import Lock
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+
+METRICS = {
+    "alma_request_duration_seconds": (
+        "histogram",
+        "Duration of the alma requests including retries.",
+        ("operation",),
+    ),
+    "alma_request_errors_total": (
+        "counter",
+        "Failed alma requests by status code or connection error.",
+        ("operation", "code"),
+    ),
+    "alma_response_bytes_total": (
+        "counter",
+        "Bytes of the alma responses as sent over the wire.",
+        ("operation",),
+    ),
+    "alma_parse_duration_seconds": (
+        "histogram",
+        "Duration to parse an alma response, streamed ones include the reading.",
+        ("operation",),
+    ),
+    "alma_task_entries_total": (
+        "counter",
+        "Entries processed by the tasks by outcome.",
+        ("task", "workflow", "outcome"),
+    ),
+    "alma_task_entries_per_second": (
+        "gauge",
+        "Entries per second of the last run of the task.",
+        ("task", "workflow"),
+    ),
+}
+"""Name, kind, description and label names of the metrics."""
+
+
+class MetricsExporter:
+    """Metrics exporter, the base class drops all values."""
+
+    name = "noop"
+
+    def observe(self, name: str, value: float, labels: dict[str, str]) -> None:
+        """Add the value to the histogram."""
+
+    def inc(self, name: str, value: float, labels: dict[str, str]) -> None:
+        """Add the value to the counter."""
+
+    def set(self, name: str, value: float, labels: dict[str, str]) -> None:
+        """Set the gauge to the value."""
+
+
+class MemoryMetricsExporter(MetricsExporter):
+    """In-process metrics exporter, keeps the values to be inspected."""
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        """Create object MemoryMetricsExporter."""
+        self.lock = Lock()
+        self.observations: dict[tuple, list[float]] = defaultdict(list)
+        self.counters: dict[tuple, float] = defaultdict(float)
+        self.gauges: dict[tuple, float] = {}
+
+    @staticmethod
+    def key(name: str, labels: dict[str, str]) -> tuple:
+        """Get the key of the metric with the labels."""
+        return (name, *sorted(labels.items()))
+
+    def observe(self, name: str, value: float, labels: dict[str, str]) -> None:
+        """Add the value to the histogram."""
+        with self.lock:
+            self.observations[self.key(name, labels)].append(value)
+
+    def inc(self, name: str, value: float, labels: dict[str, str]) -> None:
+        """Add the value to the counter."""
+        with self.lock:
+            self.counters[self.key(name, labels)] += value
+
+    def set(self, name: str, value: float, labels: dict[str, str]) -> None:
+        """Set the gauge to the value."""
+        with self.lock:
+            self.gauges[self.key(name, labels)] = value
+
+
+class PrometheusMetricsExporter(MetricsExporter):
+    """Metrics exporter to the prometheus client.
+
+    The metrics are registered in the registry, the default registry is
+    served by the prometheus client, e.g. with start_http_server or the
+    multiprocess collector of the celery workers.
+    """
+
+    name = "prometheus"
+
+    def __init__(
+        self,
+        registry: "prometheus_client.CollectorRegistry | None" = None,
+    ) -> None:
+        """Create object PrometheusMetricsExporter."""
+        if prometheus_client is None:
+            msg = "the prometheus metrics exporter needs prometheus-client."
+            raise RuntimeError(msg)
+
+        kinds = {
+            "histogram": prometheus_client.Histogram,
+            "counter": prometheus_client.Counter,
+            "gauge": prometheus_client.Gauge,
+        }
+        registry = registry or prometheus_client.REGISTRY
+        self.metrics = {
+            name: kinds[kind](name, description, labels, registry=registry)
+            for name, (kind, description, labels) in METRICS.items()
+        }
+
+    def observe(self, name: str, value: float, labels: dict[str, str]) -> None:
+        """Add the value to the histogram."""
+        self.metrics[name].labels(**labels).observe(value)
+
+    def inc(self, name: str, value: float, labels: dict[str, str]) -> None:
+        """Add the value to the counter."""
+        self.metrics[name].labels(**labels).inc(value)
+
+    def set(self, name: str, value: float, labels: dict[str, str]) -> None:
+        """Set the gauge to the value."""
+        self.metrics[name].labels(**labels).set(value)
+
+
+EXPORTERS = {
+    exporter.name: exporter
+    for exporter in (MetricsExporter, MemoryMetricsExporter, PrometheusMetricsExporter)
+}
+
+
+@cache
+def get_exporter(name: str) -> MetricsExporter:
+    """Get the exporter of the name, it is created once per process.
+
+    The prometheus metrics can be registered only once per registry.
+
+    :raises ValueError if there is no exporter with the name
+    """
+    try:
+        return EXPORTERS[name]()
+    except KeyError as error:
+        msg = f"unknown metrics exporter {name}, use one of {', '.join(EXPORTERS)}."
+        raise ValueError(msg) from error
+
+
+class AlmaMetrics:
+    """Metrics of the alma calls and the task runs.
+
+    The values are passed to the exporter, the default exporter drops
+    them, so the metrics cost a clock read per call.
+    """
+
+    def __init__(self, exporter: MetricsExporter | None = None) -> None:
+        """Create object AlmaMetrics."""
+        self.exporter = exporter or MetricsExporter()
+
+    def observe_request(self, operation: str, duration: float, size: int) -> None:
+        """Record the duration and response size of the request."""
+        labels = {"operation": operation}
+        self.exporter.observe("alma_request_duration_seconds", duration, labels)
+        if size:
+            self.exporter.inc("alma_response_bytes_total", size, labels)
+
+    def count_error(self, operation: str, code: int | str) -> None:
+        """Count the failed request by status code or error name."""
+        labels = {"operation": operation, "code": str(code)}
+        self.exporter.inc("alma_request_errors_total", 1, labels)
+
+    def observe_parse(self, operation: str, duration: float) -> None:
+        """Record the duration to parse a response."""
+        labels = {"operation": operation}
+        self.exporter.observe("alma_parse_duration_seconds", duration, labels)
+
+    def count_entries(self, task: str, workflow: str, counts: dict) -> None:
+        """Count the entries of the task run by outcome."""
+        for outcome in ("succeeded", "failed", "unchanged", "skipped"):
+            if amount := counts.get(outcome, 0):
+                labels = {"task": task, "workflow": workflow, "outcome": outcome}
+                self.exporter.inc("alma_task_entries_total", amount, labels)
+
+    def set_throughput(self, task: str, workflow: str, rate: float) -> None:
+        """Set the entries per second of the task run."""
+        labels = {"task": task, "workflow": workflow}
+        self.exporter.set("alma_task_entries_per_second", rate, labels)
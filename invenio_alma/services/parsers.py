@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+
+"""Alma xml parser backends."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from threading import local
+from typing import IO
+from xml.etree import ElementTree as ET
+from xml.etree.ElementTree import Element
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover
+    etree = None
+
+
+class XMLParser(ABC):
+    """Xml parser backend base class."""
+
+    name = ""
+
+    @abstractmethod
+    def fromstring(self, data: bytes) -> Element:
+        """Parse the document."""
+
+    @abstractmethod
+    def iterparse(
+        self,
+        stream: IO[bytes],
+        events: tuple[str, ...],
+    ) -> Iterator[tuple[str, Element]]:
+        """Parse the document incrementally."""
+
+
+class ElementTreeParser(XMLParser):
+    """Xml parser backend using xml.etree.ElementTree of the standard library."""
+
+    name = "etree"
+
+    def fromstring(self, data: bytes) -> Element:
+        """Parse the document."""
+        return ET.fromstring(data)  # noqa: S314
+
+    def iterparse(
+        self,
+        stream: IO[bytes],
+        events: tuple[str, ...],
+    ) -> Iterator[tuple[str, Element]]:
+        """Parse the document incrementally."""
+        return ET.iterparse(stream, events=events)  # noqa: S314
+
+
+class LxmlParser(XMLParser):
+    """Xml parser backend using lxml.
+
+    The parser is hardened, it does not access the network, does not
+    load dtds and does not resolve entities. A lxml parser must not be
+    used by two threads at once, every thread gets its own.
+    """
+
+    name = "lxml"
+    options = {  # noqa: RUF012
+        "resolve_entities": False,
+        "no_network": True,
+        "load_dtd": False,
+        "huge_tree": False,
+    }
+
+    def __init__(self) -> None:
+        """Create object LxmlParser."""
+        self.local = local()
+
+    @property
+    def parser(self) -> "etree.XMLParser":
+        """Get the parser of the current thread."""
+        parser = getattr(self.local, "parser", None)
+        if parser is None:
+            parser = self.local.parser = etree.XMLParser(**self.options)
+        return parser
+
+    def fromstring(self, data: bytes) -> Element:
+        """Parse the document."""
+        return etree.fromstring(data, parser=self.parser)
+
+    def iterparse(
+        self,
+        stream: IO[bytes],
+        events: tuple[str, ...],
+    ) -> Iterator[tuple[str, Element]]:
+        """Parse the document incrementally."""
+        return etree.iterparse(stream, events=events, **self.options)
+
+
+def default_parser() -> XMLParser:
+    """Get the lxml parser if lxml is installed, otherwise the ElementTree one."""
+    return LxmlParser() if etree is not None else ElementTreeParser()
+
+
+def tostring(element: Element) -> bytes:
+    """Serialize the element with the library it was created with."""
+    if etree is not None and isinstance(element, etree._Element):  # noqa: SLF001
+        return etree.tostring(element)
+    return ET.tostring(element)
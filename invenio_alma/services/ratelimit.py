@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+
+"""Alma API rate limiter."""
+
+from abc import ABC, abstractmethod
+from datetime import UTC, datetime, timedelta
+from hashlib import sha256
+from math import ceil
+from threading import Lock
+from time import monotonic, sleep
+
+from redis import Redis
+from requests import Response
+
+from .config import AlmaRateLimitConfig
+from .errors import AlmaQuotaExceededError
+
+REMAINING_HEADER = "X-Exl-Api-Remaining"
+"""Header alma uses to report the remaining calls of the day."""
+
+BUCKET_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+if tokens >= 0 then
+  return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+
+def rate_limit_key(*parts: str) -> str:
+    """Build the rate limit key for the api key and host.
+
+    The parts are hashed to keep the api key out of the store.
+    """
+    return sha256("|".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def utc_day() -> str:
+    """Get the current day of the daily quota of alma, it resets at midnight UTC."""
+    return datetime.now(tz=UTC).date().isoformat()
+
+
+def seconds_until_reset() -> float:
+    """Get the seconds until the daily quota of alma resets at midnight UTC."""
+    now = datetime.now(tz=UTC)
+    midnight = (now + timedelta(days=1)).replace(
+        hour=0,
+        minute=0,
+        second=0,
+        microsecond=0,
+    )
+    return (midnight - now).total_seconds()
+
+
+class RateLimitStore(ABC):
+    """Rate limit store, keeps the state of the token buckets and quotas."""
+
+    @abstractmethod
+    def take(self, key: str, rate: float, burst: int) -> float:
+        """Take one token and return the seconds to wait for it."""
+
+    @abstractmethod
+    def increment_used(self, key: str) -> int:
+        """Count one call against the daily quota and return the used calls."""
+
+    @abstractmethod
+    def set_remaining(self, key: str, remaining: int) -> None:
+        """Store the remaining calls reported by alma."""
+
+    @abstractmethod
+    def get_remaining(self, key: str) -> int | None:
+        """Get the remaining calls reported by alma."""
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """In-process rate limit store."""
+
+    def __init__(self) -> None:
+        """Create object MemoryRateLimitStore."""
+        self.lock = Lock()
+        self.buckets: dict[str, tuple[float, float]] = {}
+        self.used: dict[str, tuple[str, int]] = {}
+        self.remaining: dict[str, tuple[str, int]] = {}
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        """Take one token and return the seconds to wait for it."""
+        with self.lock:
+            now = monotonic()
+            tokens, timestamp = self.buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - timestamp) * rate) - 1
+            self.buckets[key] = (tokens, now)
+        return max(0.0, -tokens / rate)
+
+    def increment_used(self, key: str) -> int:
+        """Count one call against the daily quota and return the used calls."""
+        today = utc_day()
+        with self.lock:
+            day, used = self.used.get(key, (today, 0))
+            used = used + 1 if day == today else 1
+            self.used[key] = (today, used)
+        return used
+
+    def set_remaining(self, key: str, remaining: int) -> None:
+        """Store the remaining calls reported by alma for the day."""
+        self.remaining[key] = (utc_day(), remaining)
+
+    def get_remaining(self, key: str) -> int | None:
+        """Get the remaining calls reported by alma, None after the reset."""
+        day, remaining = self.remaining.get(key, ("", 0))
+        return remaining if day == utc_day() else None
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """Redis rate limit store, shared by all workers using the same redis."""
+
+    prefix = "alma:ratelimit"
+
+    def __init__(self, redis: Redis) -> None:
+        """Create object RedisRateLimitStore."""
+        self.redis = redis
+        self.token_bucket = redis.register_script(BUCKET_SCRIPT)
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        """Take one token and return the seconds to wait for it."""
+        wait = self.token_bucket(
+            keys=[f"{self.prefix}:bucket:{key}"],
+            args=[rate, burst],
+        )
+        return float(wait)
+
+    def increment_used(self, key: str) -> int:
+        """Count one call against the daily quota and return the used calls."""
+        name = f"{self.prefix}:used:{key}:{utc_day()}"
+        pipe = self.redis.pipeline()
+        pipe.incr(name)
+        pipe.expire(name, timedelta(days=2))
+        used, _ = pipe.execute()
+        return int(used)
+
+    def set_remaining(self, key: str, remaining: int) -> None:
+        """Store the remaining calls reported by alma until the reset.
+
+        The value expires after an hour at the latest, alma reports it
+        again with the next response.
+        """
+        name = f"{self.prefix}:remaining:{key}:{utc_day()}"
+        ttl = min(3600, ceil(seconds_until_reset()))
+        self.redis.set(name, remaining, ex=max(1, ttl))
+
+    def get_remaining(self, key: str) -> int | None:
+        """Get the remaining calls reported by alma, None after the reset."""
+        remaining = self.redis.get(f"{self.prefix}:remaining:{key}:{utc_day()}")
+        return int(remaining) if remaining is not None else None
+
+
+class AlmaRateLimiter:
+    """Token bucket rate limiter with a daily quota governor.
+
+    The limiter paces the calls to the configured calls per second. If a
+    daily limit is configured or alma reports the remaining calls, the
+    limiter spreads the remaining calls over the rest of the day once the
+    slowdown threshold is reached and stops before the reserve is used.
+    """
+
+    def __init__(
+        self,
+        config: AlmaRateLimitConfig,
+        key: str,
+        store: RateLimitStore | None = None,
+    ) -> None:
+        """Create object AlmaRateLimiter."""
+        self.config = config
+        self.key = key
+        self.store = store or MemoryRateLimitStore()
+
+    def consume_quota(self) -> int | None:
+        """Count the call against the quota and get the remaining calls."""
+        remaining = self.store.get_remaining(self.key)
+
+        if self.config.daily_limit > 0:
+            used = self.store.increment_used(self.key)
+            counted = self.config.daily_limit - used
+            remaining = counted if remaining is None else min(remaining, counted)
+
+        return remaining
+
+    def quota_wait(self) -> float:
+        """Get the seconds to wait to keep the daily quota.
+
+        :raises AlmaQuotaExceededError if only the reserve is left or the
+            calls would have to wait longer than max_wait
+        """
+        remaining = self.consume_quota()
+
+        if remaining is None or remaining > self.config.daily_slowdown:
+            return 0.0
+
+        available = remaining - self.config.daily_reserve
+        if available <= 0:
+            msg = f"daily quota reached, {remaining} calls remaining"
+            raise AlmaQuotaExceededError(code=429, msg=msg)
+
+        wait = seconds_until_reset() / available
+        if wait > self.config.max_wait:
+            msg = f"daily quota nearly reached, {remaining} calls remaining"
+            raise AlmaQuotaExceededError(code=429, msg=msg)
+
+        return wait
+
+    def acquire(self) -> None:
+        """Wait until the next call is allowed.
+
+        :raises AlmaQuotaExceededError if the daily quota is used up
+        """
+        wait = self.quota_wait()
+
+        if self.config.per_second > 0:
+            wait = max(
+                wait,
+                self.store.take(self.key, self.config.per_second, self.config.burst),
+            )
+
+        if wait > 0:
+            sleep(min(wait, self.config.max_wait))
+
+    def update(self, response: Response) -> None:
+        """Update the remaining calls from the alma response header."""
+        remaining = response.headers.get(REMAINING_HEADER)
+
+        if remaining is not None and remaining.isdigit():
+            self.store.set_remaining(self.key, int(remaining))
@@ -9,15 +9,22 @@
 """Alma REST Service."""
 
 from http import HTTPStatus
-from xml.etree.ElementTree import Element, tostring
+from xml.etree.ElementTree import Element
 
-from requests.api import post, put
 from requests.exceptions import ReadTimeout
 
 from .base import AlmaAPIBase, AlmaService
+from .cache import AlmaRecordCache
+from .circuit import AlmaCircuitBreaker
 from .config import AlmaRESTConfig
 from .errors import AlmaRESTError
-from .utils import jpath_to_xpath
+from .metrics import AlmaMetrics
+from .parsers import XMLParser, tostring
+from .ratelimit import AlmaRateLimiter
+from .retry import AlmaRetryPolicy
+from .session import AlmaSession
+from .tracing import tracing
+from .utils import find_fields
 
 
 class AlmaRESTUrls:
@@ -61,10 +68,32 @@ class AlmaRESTUrls:
 class AlmaREST(AlmaAPIBase):
     """Alma REST service class."""
 
-    def __init__(self, timeout: int = 30) -> None:
+    api = "rest"
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        *,
+        session: AlmaSession | None = None,
+        rate_limiter: AlmaRateLimiter | None = None,
+        parser: XMLParser | None = None,
+        retry: AlmaRetryPolicy | None = None,
+        circuit: AlmaCircuitBreaker | None = None,
+        cache: AlmaRecordCache | None = None,
+        metrics: AlmaMetrics | None = None,
+    ) -> None:
         """Create object AlmaREST."""
-        super().__init__(".//bib/record")
-        self.timeout = timeout
+        super().__init__(
+            ".//bib/record",
+            session=session,
+            timeout=timeout,
+            rate_limiter=rate_limiter,
+            parser=parser,
+            retry=retry,
+            circuit=circuit,
+            cache=cache,
+            metrics=metrics,
+        )
 
     def put(self, url: str, data: str) -> str:
         """Alma rest api put request.
@@ -76,14 +105,15 @@ class AlmaREST(AlmaAPIBase):
 
         :return str: response content
         """
-        try:
-            response = put(url, data, headers=self.headers, timeout=self.timeout)
-        except ReadTimeout as exc:
-            raise AlmaRESTError(code=500, msg="readtimeout") from exc
+        with tracing.span("alma.rest.put"):
+            try:
+                response = self.request("PUT", url, data)
+            except ReadTimeout as exc:
+                raise AlmaRESTError(code=500, msg="readtimeout") from exc
 
-        if response.status_code >= HTTPStatus.BAD_REQUEST:
-            raise AlmaRESTError(code=response.status_code, msg=response.text)
-        return response.text
+            if response.status_code >= HTTPStatus.BAD_REQUEST:
+                raise AlmaRESTError(code=response.status_code, msg=response.text)
+            return response.text
 
     def post(self, url: str, data: str) -> None:
         """Alma rest api post request.
@@ -95,18 +125,19 @@ class AlmaREST(AlmaAPIBase):
 
         :return str: response content
         """
-        try:
-            response = post(url, data, headers=self.headers, timeout=self.timeout)
-        except ReadTimeout as exc:
-            raise AlmaRESTError(
-                code=HTTPStatus.INTERNAL_SERVER_ERROR,
-                msg="readtimeout",
-            ) from exc
+        with tracing.span("alma.rest.post"):
+            try:
+                response = self.request("POST", url, data)
+            except ReadTimeout as exc:
+                raise AlmaRESTError(
+                    code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                    msg="readtimeout",
+                ) from exc
 
-        if response.status_code >= HTTPStatus.BAD_REQUEST:
-            raise AlmaRESTError(code=response.status_code, msg=response.text)
+            if response.status_code >= HTTPStatus.BAD_REQUEST:
+                raise AlmaRESTError(code=response.status_code, msg=response.text)
 
-        return response.text
+            return response.text
 
 
 class AlmaRESTService(AlmaService):
@@ -117,11 +148,41 @@ class AlmaRESTService(AlmaService):
         config: AlmaRESTConfig,
         urls: AlmaRESTUrls | None = None,
         service: AlmaREST | None = None,
+        *,
+        session: AlmaSession | None = None,
+        rate_limiter: AlmaRateLimiter | None = None,
+        cache: AlmaRecordCache | None = None,
+        retry: AlmaRetryPolicy | None = None,
+        circuit: AlmaCircuitBreaker | None = None,
+        metrics: AlmaMetrics | None = None,
     ) -> None:
         """Create object from AlmaRESTService."""
         self.config = config
         self.urls = urls or AlmaRESTUrls(config)
-        self.service = service or AlmaREST(self.config.timeout)
+        self.service = service or AlmaREST(
+            self.config.timeout,
+            session=session,
+            rate_limiter=rate_limiter,
+            retry=retry,
+            circuit=circuit,
+            cache=cache,
+            metrics=metrics,
+        )
+        self.cache = cache
+
+    @property
+    def session(self) -> AlmaSession:
+        """Get the pooled http session."""
+        return self.service.session
+
+    @property
+    def retry_stats(self) -> dict[str, float]:
+        """Get the retry counters."""
+        return self.service.retry.stats.as_dict()
+
+    def close(self) -> None:
+        """Close the pooled http connections."""
+        self.session.close()
 
     def get_record(self, mms_id: str) -> list[Element]:
         """Get Record from alma."""
@@ -133,14 +194,18 @@ class AlmaRESTService(AlmaService):
         record: Element,
         field_json_path: str,
     ) -> Element:
-        """Get field by json path and subfield value if it is set."""
-        xpath = jpath_to_xpath(field_json_path)
-        field = record.xpath(xpath)
+        """Get field by json path and subfield value if it is set.
 
-        # ATTENTION: check about multiple results
-        # allowed only one field, otherwise we have a problem and should sys.exit()
+        :raises RuntimeError if not exactly one field matches
+        """
+        fields = find_fields(record, field_json_path)
+
+        # allowed only one field, otherwise the wrong one could be changed
+        if len(fields) != 1:
+            msg = f"{len(fields)} fields match '{field_json_path}', expected one"
+            raise RuntimeError(msg)
 
-        return field
+        return fields[0]
 
     @staticmethod
     def replace_field(
@@ -153,30 +218,47 @@ class AlmaRESTService(AlmaService):
         """
         field.text = new_subfield_value
 
+    def invalidate_cache(self, record: Element, mms_id: str | None = None) -> None:
+        """Remove the cached sru results which are touched by the record."""
+        if not self.cache:
+            return
+
+        if mms_id:
+            self.cache.invalidate("mms_id", mms_id)
+        self.cache.invalidate_record(record)
+
     def update_alma_record(self, mms_id: str, record: Element) -> str:
         """Update the record on alma side."""
-        data = tostring(record)
+        data = b"<bib>" + tostring(record) + b"</bib>"
         url_put = self.urls.url_put(mms_id)
-        return self.service.put(url_put, data)
+        response = self.service.put(url_put, data)
+        self.invalidate_cache(record, mms_id)
+        return response
 
     def create_alma_record(self, record: Element) -> str:
         """Create alma record."""
-        bib = Element("bib")
-        bib.append(record)
-
-        data = tostring(bib)
+        data = b"<bib>" + tostring(record) + b"</bib>"
         url_post = self.urls.url_post()
-        return self.service.post(url_post, data)
+        response = self.service.post(url_post, data)
+        self.invalidate_cache(record)
+        return response
 
     def update_field(
         self,
         mms_id: str,
         field_json_path: str,
         new_subfield_value: str,
-    ) -> str:
-        """Update field."""
-        record = self.get_record(mms_id)
+    ) -> str | None:
+        """Update field.
+
+        The record is only sent back to alma if the value changed.
+
+        :return str | None: response content, None if the value was already set
+        """
+        record = self.get_record(mms_id)[0]
         field = self.get_field(record, field_json_path)  # reference
+        if field.text == new_subfield_value:
+            return None
         self.replace_field(field, new_subfield_value)  # in-place
         return self.update_alma_record(mms_id, record)
 
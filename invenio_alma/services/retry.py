@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+
+"""Alma API retry policy."""
+
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from random import uniform
+from threading import Lock
+from time import sleep
+
+from requests import Response
+from requests.exceptions import ConnectionError, ConnectTimeout, Timeout  # noqa: A004
+
+from .config import AlmaRetryConfig
+
+
+class RetryStats:
+    """Counters of the retries, to see how much time goes into retries."""
+
+    def __init__(self) -> None:
+        """Create object RetryStats."""
+        self.lock = Lock()
+        self.retries = 0
+        self.exhausted = 0
+        self.waited = 0.0
+
+    def count_retry(self, wait: float) -> None:
+        """Count one retry and the time waited for it."""
+        with self.lock:
+            self.retries += 1
+            self.waited += wait
+
+    def count_exhausted(self) -> None:
+        """Count a call which failed after the last attempt."""
+        with self.lock:
+            self.exhausted += 1
+
+    def as_dict(self) -> dict[str, float]:
+        """Get the counters."""
+        return {
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+            "waited": self.waited,
+        }
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse the Retry-After header, either seconds or a http date."""
+    if not value:
+        return None
+
+    if value.isdigit():
+        return float(value)
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, (date - datetime.now(tz=UTC)).total_seconds())
+
+
+class AlmaRetryPolicy:
+    """Retry policy with exponential backoff and full jitter.
+
+    Connection errors, timeouts and the configured status codes are
+    retried for idempotent methods. Not idempotent methods (POST creates
+    a new record) are only retried if alma could not have processed the
+    request, which is a connect timeout or a 429 too many requests.
+    """
+
+    def __init__(self, config: AlmaRetryConfig | None = None) -> None:
+        """Create object AlmaRetryPolicy."""
+        self.config = config or AlmaRetryConfig()
+        self.stats = RetryStats()
+
+    def is_idempotent(self, method: str) -> bool:
+        """Check if the method could be sent twice without side effects."""
+        return method.upper() in self.config.idempotent_methods
+
+    def backoff(self, attempt: int) -> float:
+        """Get the seconds to wait before the next attempt."""
+        backoff = min(
+            self.config.max_backoff,
+            self.config.backoff_factor * 2 ** (attempt - 1),
+        )
+        return uniform(0, backoff) if self.config.jitter else backoff  # noqa: S311
+
+    def retry_error(self, method: str, error: Exception, attempt: int) -> float | None:
+        """Get the seconds to wait before retrying the failed request.
+
+        :return float | None: seconds to wait, None if it should not be retried
+        """
+        if not isinstance(error, ConnectionError | Timeout):
+            return None
+
+        if not self.is_idempotent(method) and not isinstance(error, ConnectTimeout):
+            return None
+
+        return self.next_wait(attempt)
+
+    def retry_response(
+        self,
+        method: str,
+        response: Response,
+        attempt: int,
+    ) -> float | None:
+        """Get the seconds to wait before retrying the request of the response.
+
+        :return float | None: seconds to wait, None if it should not be retried
+        """
+        status = response.status_code
+
+        if status not in self.config.statuses:
+            return None
+
+        if not self.is_idempotent(method) and status != 429:  # noqa: PLR2004
+            return None
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after and retry_after > self.config.max_backoff:
+            self.stats.count_exhausted()
+            return None
+
+        wait = self.next_wait(attempt)
+        if wait is None:
+            return None
+
+        return max(wait, retry_after or 0.0)
+
+    def next_wait(self, attempt: int) -> float | None:
+        """Get the backoff or None if all attempts are used."""
+        if attempt >= self.config.max_attempts:
+            self.stats.count_exhausted()
+            return None
+        return self.backoff(attempt)
+
+    def wait(self, seconds: float) -> None:
+        """Wait before the next attempt and count the retry."""
+        self.stats.count_retry(seconds)
+        sleep(seconds)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+
+"""Alma HTTP session."""
+
+from gzip import compress
+from threading import Lock
+from typing import Any
+
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+
+from .config import AlmaSessionConfig
+
+
+class AlmaSession:
+    """Connection pooled, keep-alive http session.
+
+    The underlying requests session is created lazily on first use. This
+    keeps the session out of the celery parent process, so every forked
+    worker opens its own connections.
+    """
+
+    def __init__(self, config: AlmaSessionConfig | None = None) -> None:
+        """Create object AlmaSession."""
+        self.config = config or AlmaSessionConfig()
+        self._session: Session | None = None
+        self._lock = Lock()
+
+    @property
+    def session(self) -> Session:
+        """Get the pooled requests session."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self.create_session()
+        return self._session
+
+    def create_session(self) -> Session:
+        """Create requests session with mounted pool adapters."""
+        session = Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=self.config.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        if not self.config.keep_alive:
+            session.headers["connection"] = "close"
+
+        return session
+
+    def compress_body(self, data: str | bytes) -> tuple[str | bytes, dict[str, str]]:
+        """Compress the request body if it is enabled and worth it.
+
+        :return tuple: the body and the headers to send with it
+        """
+        if not self.config.compress_requests:
+            return data, {}
+
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        if len(data) < self.config.compress_min_size:
+            return data, {}
+
+        return compress(data, compresslevel=5), {"content-encoding": "gzip"}
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Response:  # noqa: ANN401
+        """Send request over the pooled session."""
+        return self.session.request(method, url, **kwargs)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
@@ -10,54 +10,211 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date
+from functools import partial
+from http import HTTPStatus
+from urllib.parse import quote
 from xml.etree.ElementTree import Element
 
 from .base import AlmaAPIBase, AlmaService
+from .cache import (
+    CACHED_SEARCH_KEYS,
+    AlmaRecordCache,
+    local_name,
+    record_cache_keys,
+)
+from .circuit import AlmaCircuitBreaker
 from .config import AlmaSRUConfig
+from .errors import AlmaRecordNotFoundError
+from .fingerprints import AlmaFingerprints
+from .metrics import AlmaMetrics
+from .parsers import XMLParser, tostring
+from .ratelimit import AlmaRateLimiter
+from .retry import AlmaRetryPolicy
+from .session import AlmaSession
+
+SRU_NAMESPACES = {
+    "srw": "http://www.loc.gov/zing/srw/",
+    "slim": "http://www.loc.gov/MARC21/slim",
+}
+"""Namespaces of the sru responses."""
+
+SRU_RECORDS_XPATH = ".//srw:recordData/slim:record"
+"""Xpath to the marc records within the sru responses."""
+
+SRU_NEXT_POSITION = f"{{{SRU_NAMESPACES['srw']}}}nextRecordPosition"
+"""Tag of the start of the next page within the sru responses."""
 
 
 class AlmaSRUUrls:
-    """Alma SRU urls."""
+    """Alma SRU urls.
+
+    The urls are built per call from the arguments, the object keeps no
+    state of a call and can be shared between threads.
+    """
 
     def __init__(self, config: AlmaSRUConfig) -> None:
         """Create object AlmaSRUUrls."""
         self.config = config
-        self.search_key = config.search_key
-        self.search_value = ""
+
+    @property
+    def search_key(self) -> str:
+        """Default search key."""
+        return self.config.search_key
 
     @property
     def base_url(self) -> str:
         """Base url."""
         return f"{self.config.domain}/view/sru/{self.config.institution_code}"
 
-    @property
-    def query(self) -> str:
+    def query(self, search_value: str, search_key: str) -> str:
         """Query."""
-        return f"query=alma.{self.search_key}={self.search_value}"
+        return f"query=alma.{search_key}={search_value}"
 
-    @property
-    def parameters(self) -> str:
+    def parameters(self, search_value: str, search_key: str) -> str:
         """Parameters."""
-        return f"version=1.2&operation=searchRetrieve&{self.query}"
+        query = self.query(search_value, search_key)
+        return f"version=1.2&operation=searchRetrieve&{query}"
 
     def url(self, search_value: str, search_key: str | None = None) -> str:
-        """Alma sru url to retrieve record by search value."""
-        self.search_value = search_value
-        if search_key:
-            self.search_key = search_key
-        return f"{self.base_url}?{self.parameters}"
+        """Alma sru url to retrieve record by search value.
+
+        :param search_value (str): value to search for
+        :param search_key (str): alma search index, defaults to the config
+        """
+        parameters = self.parameters(search_value, search_key or self.search_key)
+        return f"{self.base_url}?{parameters}"
+
+    def url_batch(
+        self,
+        search_values: list[str],
+        search_key: str,
+        start_record: int = 1,
+    ) -> str:
+        """Alma sru url to retrieve the records of all search values at once.
+
+        The search values are combined with the cql or operator.
+        """
+        cql = " or ".join(f"alma.{search_key}={value}" for value in search_values)
+        return self.url_cql(cql, start_record)
+
+    def url_modified_since(self, since: date, start_record: int = 1) -> str:
+        """Alma sru url to retrieve the records modified on or after the date."""
+        cql = f"alma.modification_date>={since.isoformat()}"
+        return self.url_cql(cql, start_record)
+
+    def url_cql(self, cql: str, start_record: int = 1) -> str:
+        """Alma sru url to retrieve a page of the records of the cql query."""
+        parameters = (
+            "version=1.2&operation=searchRetrieve"
+            f"&maximumRecords={self.config.maximum_records}"
+            f"&startRecord={start_record}"
+            f"&query={quote(cql, safe='=.')}"
+        )
+        return f"{self.base_url}?{parameters}"
+
+    def batches(
+        self,
+        search_values: Iterable[str],
+        search_key: str,
+    ) -> Iterator[list[str]]:
+        """Pack the search values into batches within the url length limit."""
+        batch: list[str] = []
+
+        for search_value in search_values:
+            url = self.url_batch([*batch, search_value], search_key)
+            if batch and len(url) > self.config.max_url_length:
+                yield batch
+                batch = []
+            batch.append(search_value)
+
+        if batch:
+            yield batch
+
+
+def record_values(record: Element, search_key: str) -> set[str]:
+    """Get the values of the field which is searched by the search key.
+
+    These are the 001 for mms_id, the 009 for local_control_field_009 and
+    the 995 subfields for local_field_995, like the keys of the record
+    cache. A value in another field, e.g. a parent mms id in 773$w, does not
+    count. For other search keys all control fields and subfields count.
+    """
+    if search_key in CACHED_SEARCH_KEYS:
+        return {value for key, value in record_cache_keys(record) if key == search_key}
+
+    return {
+        field.text
+        for field in record.iter()
+        if local_name(field) in {"controlfield", "subfield"} and field.text
+    }
+
+
+def normalize_value(value: str) -> str:
+    """Normalize a search value to compare it with the value of a field."""
+    return value.strip().casefold()
+
+
+def match_records(
+    records: Iterable[Element],
+    search_values: list[str],
+    search_key: str,
+) -> dict[str, list[Element]]:
+    """Map the records of a batched search back to the search values.
+
+    The values are compared normalized, without surrounding whitespace and
+    case-insensitive, like the sru index of alma. All records of a search
+    for a single value belong to it, alma found them by the value. Search
+    values without a record are mapped to an empty list.
+    """
+    found: dict[str, list[Element]] = {value: [] for value in search_values}
+
+    if len(search_values) == 1:
+        found[search_values[0]].extend(records)
+        return found
+
+    normalized: dict[str, list[str]] = {}
+    for value in search_values:
+        normalized.setdefault(normalize_value(value), []).append(value)
+
+    for record in records:
+        values = {normalize_value(value) for value in record_values(record, search_key)}
+        for value in values & normalized.keys():
+            for search_value in normalized[value]:
+                found[search_value].append(record)
+
+    return found
 
 
 class AlmaSRU(AlmaAPIBase):
     """Alma SRU Service class."""
 
-    def __init__(self) -> None:
+    api = "sru"
+
+    def __init__(
+        self,
+        *,
+        session: AlmaSession | None = None,
+        rate_limiter: AlmaRateLimiter | None = None,
+        parser: XMLParser | None = None,
+        retry: AlmaRetryPolicy | None = None,
+        circuit: AlmaCircuitBreaker | None = None,
+        cache: AlmaRecordCache | None = None,
+        metrics: AlmaMetrics | None = None,
+    ) -> None:
         """Create object AlmaSRU."""
-        namespaces = {
-            "srw": "http://www.loc.gov/zing/srw/",
-            "slim": "http://www.loc.gov/MARC21/slim",
-        }
-        super().__init__(".//srw:recordData/slim:record", namespaces)
+        super().__init__(
+            SRU_RECORDS_XPATH,
+            SRU_NAMESPACES,
+            session=session,
+            rate_limiter=rate_limiter,
+            parser=parser,
+            retry=retry,
+            circuit=circuit,
+            cache=cache,
+            metrics=metrics,
+        )
 
 
 class AlmaSRUService(AlmaService):
@@ -68,17 +225,153 @@ class AlmaSRUService(AlmaService):
         config: AlmaSRUConfig,
         urls: AlmaSRUUrls | None = None,
         service: AlmaSRU | None = None,
+        *,
+        session: AlmaSession | None = None,
+        rate_limiter: AlmaRateLimiter | None = None,
+        cache: AlmaRecordCache | None = None,
+        retry: AlmaRetryPolicy | None = None,
+        circuit: AlmaCircuitBreaker | None = None,
+        fingerprints: AlmaFingerprints | None = None,
+        metrics: AlmaMetrics | None = None,
     ) -> None:
-        """Create object AlmaSRUService."""
+        """Create object AlmaSRUService.
+
+        The fingerprints detect alma records which are unchanged since
+        they were imported into the repository.
+        """
         self.config = config
         self.urls = urls or AlmaSRUUrls(config)
-        self.service = service or AlmaSRU()
+        self.service = service or AlmaSRU(
+            session=session,
+            rate_limiter=rate_limiter,
+            retry=retry,
+            circuit=circuit,
+            cache=cache,
+            metrics=metrics,
+        )
+        self.cache = cache
+        self.fingerprints = fingerprints
+
+    @property
+    def session(self) -> AlmaSession:
+        """Get the pooled http session."""
+        return self.service.session
+
+    @property
+    def retry_stats(self) -> dict[str, float]:
+        """Get the retry counters."""
+        return self.service.retry.stats.as_dict()
+
+    def close(self) -> None:
+        """Close the pooled http connections."""
+        self.session.close()
 
     def get_record(
         self,
         search_value: str,
         search_key: str | None = None,
     ) -> list[Element]:
-        """Get the record."""
+        """Get the record.
+
+        If a cache is configured, the records and not found results are
+        served from the cache.
+
+        :raises AlmaRecordNotFoundError if alma does not know the record
+        """
+        if not self.cache:
+            url = self.urls.url(search_value, search_key)
+            return self.service.get(url)
+
+        search_key = search_key or self.urls.search_key
+        cached = self.cache.get(search_key, search_value)
+
+        if cached == []:
+            msg = f"{search_key}={search_value} not found (cached)"
+            raise AlmaRecordNotFoundError(code=HTTPStatus.NOT_FOUND, msg=msg)
+
+        if cached is not None:
+            return [self.service.parse_alma_record(record) for record in cached]
+
         url = self.urls.url(search_value, search_key)
-        return self.service.get(url)
+        try:
+            records = self.service.get(url)
+        except AlmaRecordNotFoundError:
+            self.cache.set(search_key, search_value, [])
+            raise
+
+        self.cache.set(search_key, search_value, [tostring(r) for r in records])
+        return records
+
+    def search(self, search_values: list[str], search_key: str) -> Iterator[Element]:
+        """Stream all records of the search values by paging through the results."""
+        return self.paginate(partial(self.urls.url_batch, search_values, search_key))
+
+    def search_modified_since(self, since: date) -> Iterator[Element]:
+        """Stream all records modified in alma on or after the date."""
+        return self.paginate(partial(self.urls.url_modified_since, since))
+
+    def modified_since(self, since: date) -> set[str]:
+        """Get the identifiers of the records modified on or after the date.
+
+        The identifiers are the mms_id, the ac number and the local field
+        995 values. The modified records are removed from the cache.
+        """
+        identifiers: set[str] = set()
+
+        for record in self.search_modified_since(since):
+            identifiers.update(value for _, value in record_cache_keys(record))
+            if self.cache:
+                self.cache.invalidate_record(record)
+
+        return identifiers
+
+    def paginate(self, url_at: Callable[[int], str]) -> Iterator[Element]:
+        """Stream the records of all pages, url_at builds the url of a page."""
+        next_position: str | None = "1"
+
+        while next_position:
+            url = url_at(int(next_position))
+            fields: dict[str, str] = {}
+            yield from self.service.get_iter(url, fields)
+            next_position = fields.get(SRU_NEXT_POSITION)
+
+    def get_records(
+        self,
+        search_values: Iterable[str],
+        search_key: str | None = None,
+    ) -> dict[str, list[Element]]:
+        """Get the records of many search values with few sru requests.
+
+        The search values are packed into batches and each returned record
+        is mapped back to the search values it contains, see match_records.
+        Search values without a record are mapped to an empty list.
+
+        :param search_values (Iterable): values to search for
+        :param search_key (str): alma search index, e.g. local_field_995
+
+        :return dict: records per search value
+        """
+        search_key = search_key or self.urls.search_key
+        results: dict[str, list[Element]] = {}
+        missing: list[str] = []
+
+        for search_value in dict.fromkeys(search_values):
+            cached = self.cache.get(search_key, search_value) if self.cache else None
+            if cached is None:
+                missing.append(search_value)
+            else:
+                results[search_value] = [
+                    self.service.parse_alma_record(record) for record in cached
+                ]
+
+        for batch in self.urls.batches(missing, search_key):
+            found = match_records(self.search(batch, search_key), batch, search_key)
+
+            if self.cache:
+                for value, records in found.items():
+                    serialized = [tostring(record) for record in records]
+                    self.cache.set(search_key, value, serialized)
+
+            results.update(found)
+
+        return results
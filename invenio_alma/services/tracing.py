@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tracing of the tasks, the workflow functions and the alma calls."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+try:
+    from opentelemetry import context, propagate, trace
+except ImportError:  # pragma: no cover
+    context = propagate = trace = None
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+except ImportError:  # pragma: no cover
+    TracerProvider = None
+
+
+class AlmaTracing:
+    """Tracing with opentelemetry, a no-op if it is not installed.
+
+    The spans go to the global tracer provider which the application
+    configures, e.g. with the opentelemetry-instrument launcher. Without
+    a configured provider the spans are not recorded.
+    """
+
+    name = "invenio_alma"
+
+    def __init__(self) -> None:
+        """Create object AlmaTracing."""
+        self.provider = None
+
+    @property
+    def enabled(self) -> bool:
+        """Check if opentelemetry is installed."""
+        return trace is not None
+
+    def use_provider(self, provider: "trace.TracerProvider | None") -> None:
+        """Trace with the provider instead of the global one, None resets it."""
+        self.provider = provider
+
+    def in_memory_exporter(self) -> "InMemorySpanExporter":
+        """Trace into an in-memory exporter to inspect the finished spans.
+
+        It needs the opentelemetry sdk and is meant for tests.
+        """
+        if TracerProvider is None:
+            msg = "the in-memory span exporter needs opentelemetry-sdk."
+            raise RuntimeError(msg)
+
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        self.use_provider(provider)
+        return exporter
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        parent: "context.Context | None" = None,
+        **attributes: str | int,
+    ) -> Iterator["trace.Span | None"]:
+        """Run the block in a span, child of the parent or the current span.
+
+        Exceptions are recorded on the span and raised again.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        tracer = trace.get_tracer(self.name, tracer_provider=self.provider)
+        with tracer.start_as_current_span(
+            name,
+            context=parent,
+            attributes=attributes,
+        ) as span:
+            yield span
+
+    def current(self) -> "context.Context | None":
+        """Get the current context to continue it in another thread."""
+        return context.get_current() if self.enabled else None
+
+    def inject(self) -> dict[str, str]:
+        """Get the current context as carrier for a celery sub-task."""
+        carrier: dict[str, str] = {}
+        if self.enabled:
+            propagate.inject(carrier)
+        return carrier
+
+    def extract(self, carrier: dict[str, str] | None) -> "context.Context | None":
+        """Get the context of the carrier sent by the parent task."""
+        if not self.enabled or not carrier:
+            return None
+        return propagate.extract(carrier)
+
+
+tracing = AlmaTracing()
+"""Tracing of the process."""
@@ -1,14 +1,104 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2022 Graz University of Technology.
+# Copyright (C) 2022-2026 Graz University of Technology.
 #
 # invenio-alma is free software; you can redistribute it and/or modify it
 # under the terms of the MIT License; see LICENSE file for more details.
 
 """Alma utils."""
 
+from functools import lru_cache
+from xml.etree.ElementTree import Element
 
-def jpath_to_xpath(field_json_path: str) -> str:  # noqa: ARG001
-    """Convert json path to xpath."""
-    msg = "not yet implemented"
-    raise RuntimeError(msg)
+from .parsers import etree
+
+BLANK = "_"
+"""Placeholder for a blank indicator, e.g. 856.4._.u"""
+
+WILDCARD = "*"
+"""Placeholder which matches every tag, indicator or subfield code."""
+
+
+def parse_jpath(field_json_path: str) -> tuple[str, str, str, str]:
+    """Parse the json path into tag, ind1, ind2 and subfield code.
+
+    The form is tag.ind1.ind2.subfield, e.g. 100.1._.u. Missing trailing
+    parts are wildcards, so 856 matches every 856 datafield.
+
+    :raises ValueError if the path has not the expected form
+    """
+    parts = field_json_path.split(".")
+    if not 1 <= len(parts) <= 4 or not all(parts):  # noqa: PLR2004
+        msg = f"field json path '{field_json_path}' has not the form tag.ind1.ind2.subfield"
+        raise ValueError(msg)
+
+    tag, ind1, ind2, code = parts + [WILDCARD] * (4 - len(parts))
+
+    if len(tag) != 3 and tag != WILDCARD:  # noqa: PLR2004
+        msg = f"field json path '{field_json_path}' has an invalid tag"
+        raise ValueError(msg)
+
+    return tag, ind1, ind2, code
+
+
+def _predicate(name: str, value: str) -> str:
+    """Build the attribute predicate, empty for the wildcard."""
+    if value == WILDCARD:
+        return ""
+    value = " " if value == BLANK else value
+    return f"[@{name}='{value}']"
+
+
+def _is_controlfield(tag: str) -> bool:
+    """Check if the tag is a control field tag (001-009)."""
+    return tag.startswith("00") and tag != WILDCARD
+
+
+@lru_cache(maxsize=256)
+def jpath_to_xpath(field_json_path: str) -> str:
+    """Convert json path to xpath.
+
+    The xpath ignores namespaces, so it works for records of the sru
+    (MARC21 slim namespace) and of the rest api (no namespace).
+    """
+    tag, ind1, ind2, code = parse_jpath(field_json_path)
+
+    if _is_controlfield(tag):
+        return f".//*[local-name()='controlfield']{_predicate('tag', tag)}"
+
+    datafield = (
+        ".//*[local-name()='datafield']"
+        f"{_predicate('tag', tag)}{_predicate('ind1', ind1)}{_predicate('ind2', ind2)}"
+    )
+    return f"{datafield}/*[local-name()='subfield']{_predicate('code', code)}"
+
+
+@lru_cache(maxsize=256)
+def jpath_to_elementpath(field_json_path: str) -> str:
+    """Convert json path to ElementPath of xml.etree.ElementTree.
+
+    ElementTree keeps the compiled paths in its own cache.
+    """
+    tag, ind1, ind2, code = parse_jpath(field_json_path)
+
+    if _is_controlfield(tag):
+        return f".//{{*}}controlfield{_predicate('tag', tag)}"
+
+    datafield = (
+        ".//{*}datafield"
+        f"{_predicate('tag', tag)}{_predicate('ind1', ind1)}{_predicate('ind2', ind2)}"
+    )
+    return f"{datafield}/{{*}}subfield{_predicate('code', code)}"
+
+
+@lru_cache(maxsize=256)
+def compile_jpath(field_json_path: str) -> "etree.XPath":
+    """Compile the json path once into a lxml XPath object."""
+    return etree.XPath(jpath_to_xpath(field_json_path))
+
+
+def find_fields(record: Element, field_json_path: str) -> list[Element]:
+    """Find the (sub)fields of the record which match the json path."""
+    if hasattr(record, "xpath"):
+        return compile_jpath(field_json_path)(record)
+    return record.findall(jpath_to_elementpath(field_json_path))
@@ -1,24 +1,52 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2021-2025 Graz University of Technology.
+# Copyright (C) 2021-2026 Graz University of Technology.
 #
 # invenio-alma is free software; you can redistribute it and/or modify it
 # under the terms of the MIT License; see LICENSE file for more details.
 
 """Celery Tasks for invenio-alma."""
 
-from celery import shared_task
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from datetime import UTC, date, datetime
+from itertools import islice
+from math import ceil
+from threading import Lock
+from time import perf_counter
+from typing import NamedTuple
+
+from celery import Task, chain, chord, shared_task
 from flask import current_app
 from invenio_access.permissions import system_identity
 
+from .checkpoints import Checkpoint
+from .executors import run_entries
 from .proxies import current_alma
+from .services import (
+    AlmaAPIError,
+    AlmaCircuitOpenError,
+    AlmaQuotaExceededError,
+    AlmaRecordNotFoundError,
+    AlmaSRUService,
+)
+from .services.tracing import tracing
 
+ABORT_ON = (AlmaQuotaExceededError, AlmaCircuitOpenError)
 
-@shared_task(ignore_result=True)
-def create_alma_records(workflow: str | None = None) -> None:
-    """Create records within alma from repository records."""
-    current_app.logger.info("start creating records in alma")
 
+class TaskEntry(NamedTuple):
+    """Aggregator entry as it is sent to the chunk sub-tasks."""
+
+    pid: str
+    cms_id: str
+
+
+def create_workflow(workflow: str | None) -> tuple[str, Callable, Callable] | None:
+    """Get the workflow, aggregator and create function, None if misconfigured.
+
+    The create function returns the outcome, succeeded or failed.
+    """
     aggregators = current_app.config["ALMA_ALMA_RECORDS_CREATE_AGGREGATORS"]
     create_funcs = current_app.config["ALMA_ALMA_RECORDS_CREATE_FUNCS"]
 
@@ -26,18 +54,18 @@ def create_alma_records(workflow: str | None = None) -> None:
         if list(create_funcs.keys()).pop() != list(aggregators.keys()).pop():
             msg = "ERROR: create_funcs and aggregators are not configured with same workflow."
             current_app.logger.error(msg)
-            return
+            return None
         workflow = list(create_funcs.keys()).pop()
 
     if not aggregators:
         msg = "ERROR: variable ALMA_REPOSITORY_RECORDS_CREATE_AGGREGATORS not set."
         current_app.logger.error(msg)
-        return
+        return None
 
     if not create_funcs:
         msg = "ERROR: variable ALMA_ALMA_RECORDS_CREATE_FUNCS not set"
         current_app.logger.error(msg)
-        return
+        return None
 
     alma_service = current_alma.alma_rest_service
 
@@ -47,23 +75,32 @@ def create_alma_records(workflow: str | None = None) -> None:
     except KeyError:
         msg = "ERROR: creating record in alma with type %s didn't work."
         current_app.logger.error(msg, workflow)
-        return
+        return None
+
+    duplicate_index = current_alma.duplicate_index
 
-    for entry in aggregator():
+    def create(entry: tuple) -> str:
         try:
-            create_func(system_identity, entry.pid, entry.cms_id, alma_service)
+            with tracing.span("alma.task.create_func", pid=entry.pid):
+                create_func(system_identity, entry.pid, entry.cms_id, alma_service)
             msg = "record %s has been updated successfully."
             current_app.logger.info(msg, entry.pid)
+            if duplicate_index:
+                duplicate_index.add(entry.cms_id)
         except (RuntimeError, RuntimeWarning) as error:
             msg = "ERROR: creating record in alma. (marcid: %s, cms_id: %s, error: %s)"
             current_app.logger.error(msg, entry.pid, entry.cms_id, error)
+            return "failed"
+        return "succeeded"
 
+    return workflow, aggregator, create
 
-@shared_task(ignore_result=True)
-def update_repository_records(workflow: str | None = None) -> None:
-    """Update records within the repository from alma records."""
-    current_app.logger.info("start updating records in repository from alma")
 
+def update_workflow(workflow: str | None) -> tuple[str, Callable, Callable] | None:
+    """Get the workflow, aggregator and update function, None if misconfigured.
+
+    The update function returns the outcome, succeeded, failed or unchanged.
+    """
     aggregators = current_app.config["ALMA_REPOSITORY_RECORDS_UPDATE_AGGREGATORS"]
     update_funcs = current_app.config["ALMA_REPOSITORY_RECORDS_UPDATE_FUNCS"]
 
@@ -71,18 +108,18 @@ def update_repository_records(workflow: str | None = None) -> None:
         if list(update_funcs.keys()).pop() != list(aggregators.keys()).pop():
             msg = "ERROR: update_funcs and aggregators are not configured with same workflow."
             current_app.logger.error(msg)
-            return
+            return None
         workflow = list(update_funcs.keys()).pop()
 
     if not aggregators:
         msg = "ERROR: variable ALMA_REPOSITORY_RECORDS_UPDATE_AGGREGATORS not set."
         current_app.logger.error(msg)
-        return
+        return None
 
     if not update_funcs:
         msg = "ERROR: variable ALMA_REPOSITORY_RECORDS_UPDATE_FUNCS not set."
         current_app.logger.error(msg)
-        return
+        return None
 
     alma_service = current_alma.alma_sru_service
 
@@ -92,14 +129,491 @@ def update_repository_records(workflow: str | None = None) -> None:
     except KeyError:
         msg = "ERROR: updating record in alma with type %s didn't work."
         current_app.logger.error(msg, workflow)
-        return
+        return None
 
-    for entry in aggregator():
+    def update(entry: tuple) -> str:
         try:
-            update_func(system_identity, entry.pid, entry.cms_id, alma_service)
+            with tracing.span("alma.task.update_func", pid=entry.pid):
+                update_func(system_identity, entry.pid, entry.cms_id, alma_service)
             msg = "record %s has been updated successfully."
             current_app.logger.info(msg, entry.pid)
         except (RuntimeError, RuntimeWarning) as error:
             msg = "ERROR: updating records within the repository."
             msg += " (marc21_id: %s, cms_id: %s, error: %s)"
             current_app.logger.error(msg, entry.pid, entry.cms_id, error)
+            return "failed"
+        return "succeeded"
+
+    task = update_repository_records.name
+    return workflow, aggregator, skip_unchanged(update, alma_service, task, workflow)
+
+
+def skip_unchanged(
+    update: Callable,
+    alma_service: AlmaSRUService,
+    task: str,
+    workflow: str,
+) -> Callable:
+    """Skip the entries whose alma record is unchanged since the last update.
+
+    The alma record is fetched by the cms id before the update, with the
+    record cache the update function gets it from the cache. The
+    fingerprint is stored after a successful update. It is kept per task
+    and workflow, another workflow updating the same record is not skipped.
+    """
+    fingerprints = alma_service.fingerprints
+    search_key = current_app.config["ALMA_FINGERPRINT_SEARCH_KEY"]
+
+    if not fingerprints or not search_key:
+        return update
+
+    def update_changed(entry: tuple) -> str:
+        key = f"{task}:{workflow}:{search_key}:{entry.cms_id}"
+        try:
+            records = alma_service.get_record(entry.cms_id, search_key)
+        except AlmaRecordNotFoundError:
+            return update(entry)
+
+        if fingerprints.is_unchanged(key, records):
+            msg = "record %s is unchanged in alma, update skipped."
+            current_app.logger.info(msg, entry.pid)
+            return "unchanged"
+
+        outcome = update(entry)
+        if outcome == "succeeded":
+            fingerprints.remember(key, records)
+        return outcome
+
+    return update_changed
+
+
+def preload_duplicates(entries: Iterable) -> Iterator:
+    """Look up the cms ids of the entries in bulk before they are created.
+
+    The duplicate index is filled batch by batch as the entries are
+    consumed. If a lookup fails, is_duplicate_in_alma looks up the cms ids
+    of the batch one by one.
+    """
+    duplicate_index = current_alma.duplicate_index
+    if duplicate_index is None:
+        yield from entries
+        return
+
+    batch_size = current_app.config["ALMA_DUPLICATE_INDEX_BATCH_SIZE"]
+    for batch in chunked(entries, batch_size):
+        try:
+            duplicate_index.preload(entry.cms_id for entry in batch)
+        except ABORT_ON:
+            raise
+        except AlmaAPIError as error:
+            msg = "duplicate lookup of %s cms ids failed. (error: %s)"
+            current_app.logger.warning(msg, len(batch), error)
+        yield from batch
+
+
+def reschedule(task: Task, kwargs: dict, error: AlmaCircuitOpenError) -> None:
+    """Reschedule the task after the circuit to alma could be closed again.
+
+    The rescheduled task resumes the checkpoint of the stopped run.
+    """
+    delay = current_app.config["ALMA_CIRCUIT_RESCHEDULE_DELAY"]
+    countdown = max(delay, ceil(error.retry_after))
+    task.apply_async(kwargs=kwargs, countdown=countdown)
+    msg = "alma is unavailable, %s rescheduled in %ss. (error: %s)"
+    current_app.logger.warning(msg, task.name, countdown, error)
+
+
+def run_checkpointed(
+    entries: Iterable,
+    process: Callable,
+    checkpoint: Checkpoint,
+    counts: Counter,
+) -> None:
+    """Process the entries, mark them in the checkpoint and log the progress.
+
+    Failed entries are not marked, a resumed run processes them again. The
+    outcomes and the entries per second of the run are added to the
+    metrics, also if the run is stopped. Every entry is traced in a span,
+    child of the span of the run, also in the threads of the pool.
+
+    :param counts (Counter): counts the outcomes returned by process
+
+    :raises AlmaQuotaExceededError if the daily quota is used up
+    :raises AlmaCircuitOpenError if alma is considered unavailable
+    """
+    concurrency = current_app.config["ALMA_TASK_CONCURRENCY"]
+    interval = current_app.config["ALMA_CHECKPOINT_LOG_INTERVAL"]
+    lock = Lock()
+    parent = tracing.current()
+
+    def process_entry(entry: tuple) -> None:
+        try:
+            with tracing.span("alma.task.entry", parent, pid=entry.pid) as span:
+                outcome = process(entry)
+                if span:
+                    span.set_attribute("outcome", outcome)
+        except ABORT_ON:
+            raise
+        except Exception:
+            with lock:
+                counts["failed"] += 1
+            raise
+
+        with lock:
+            counts[outcome] += 1
+
+        if outcome == "failed":
+            return
+
+        if checkpoint.mark_done(entry.pid) % interval == 0:
+            msg = "progress %s: %s"
+            current_app.logger.info(msg, checkpoint.key, checkpoint.progress())
+
+    before = Counter(counts)
+    start = perf_counter()
+
+    try:
+        run_entries(entries, process_entry, concurrency, ABORT_ON)
+    finally:
+        processed = counts - before
+        elapsed = perf_counter() - start
+        metrics = current_alma.metrics
+        metrics.count_entries(checkpoint.task, checkpoint.workflow, processed)
+        if elapsed > 0:
+            rate = processed.total() / elapsed
+            metrics.set_throughput(checkpoint.task, checkpoint.workflow, rate)
+
+
+def open_checkpoint(task_name: str, workflow: str, run_id: str | None) -> Checkpoint:
+    """Open the checkpoint of the run, log if a stopped run is resumed."""
+    checkpoint = Checkpoint(current_alma.checkpoint_store, task_name, workflow, run_id)
+    if checkpoint.resumed:
+        msg = "resume %s: %s"
+        current_app.logger.info(msg, checkpoint.key, checkpoint.progress())
+    return checkpoint
+
+
+def chunked(entries: Iterable, chunk_size: int) -> Iterator[list]:
+    """Split the entries into lists of chunk_size entries."""
+    iterator = iter(entries)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def modified_entries(task_name: str, workflow: str, entries: Iterable) -> Iterable:
+    """Keep the entries of the records modified in alma since the last sync.
+
+    The high-water mark is the start date of the last finished sync of
+    the workflow. Without a mark all entries are kept. The records are
+    searched with the modification date of alma, which has the precision
+    of a day, the changes of the day of the last sync are synced again.
+    """
+    mark = current_alma.checkpoint_store.get_mark(f"{task_name}:{workflow}")
+
+    if mark is None:
+        msg = "no high-water mark for %s:%s, sync all entries"
+        current_app.logger.info(msg, task_name, workflow)
+        return entries
+
+    sru_service = current_alma.alma_sru_service
+    modified = sru_service.modified_since(date.fromisoformat(mark))
+
+    msg = "%s identifiers of records modified in alma since %s"
+    current_app.logger.info(msg, len(modified), mark)
+
+    return (
+        entry for entry in entries if entry.cms_id in modified or entry.pid in modified
+    )
+
+
+def finish_sync(task_name: str, workflow: str, mark: str | None, failed: int) -> None:
+    """Store the high-water mark of the finished incremental sync.
+
+    The mark is kept if entries failed, the next sync finds their records
+    modified since the mark again.
+    """
+    if not mark:
+        return
+
+    if failed:
+        msg = "high-water mark of %s:%s kept, %s entries failed"
+        current_app.logger.warning(msg, task_name, workflow, failed)
+        return
+
+    current_alma.checkpoint_store.set_mark(f"{task_name}:{workflow}", mark)
+
+
+def dispatch_chunks(
+    task: Task,
+    kwargs: dict,
+    entries: Iterable,
+    chunk_size: int,
+    max_parallel_chunks: int,
+    *,
+    mark: str | None = None,
+) -> None:
+    """Process the entries in chunks by sub-tasks over the worker pool.
+
+    The chunks are distributed round robin over max_parallel_chunks
+    chains, a chain processes its chunks one after the other. A chord
+    callback sums up the counts of all chunks, which needs a celery
+    result backend. The chunks continue the trace of the run.
+    """
+    signatures = [
+        process_chunk.s(
+            task_name=task.name,
+            workflow=kwargs["workflow"],
+            run_id=kwargs["run_id"],
+            entries=[TaskEntry(entry.pid, entry.cms_id) for entry in chunk],
+            trace_context=tracing.inject(),
+        )
+        for chunk in chunked(entries, chunk_size)
+    ]
+
+    if not signatures:
+        summarize_chunks([], task_name=task.name, kwargs=kwargs, mark=mark)
+        return
+
+    lanes = min(max_parallel_chunks or len(signatures), len(signatures))
+    chains = [chain(*signatures[lane::lanes]) for lane in range(lanes)]
+    callback = summarize_chunks.s(task_name=task.name, kwargs=kwargs, mark=mark)
+    chord(chains)(callback)
+
+    msg = "dispatched %s chunks of %s entries for %s in %s parallel chains"
+    current_app.logger.info(msg, len(signatures), chunk_size, task.name, lanes)
+
+
+def run_task(task: Task, kwargs: dict) -> None:
+    """Run the workflow of the task, serial or dispatched in chunks.
+
+    The processed entries are checkpointed under the workflow and run id.
+    A run with the same run id as a stopped run resumes it. An incremental
+    run only processes the entries of records modified in alma since the
+    last finished incremental run, only tasks which sync from alma support
+    it.
+    """
+    workflow_builder, stop_msg, syncs_from_alma = WORKFLOWS[task.name]
+    resolved = workflow_builder(kwargs["workflow"])
+    if resolved is None:
+        return
+
+    workflow, aggregator, process = resolved
+    kwargs = {**kwargs, "workflow": workflow}
+    checkpoint = open_checkpoint(task.name, workflow, kwargs["run_id"])
+    entries = checkpoint.pending(aggregator())
+
+    mark = None
+    incremental = kwargs.get("incremental")
+    if incremental is None:
+        incremental = current_app.config["ALMA_SYNC_INCREMENTAL"]
+    if incremental and syncs_from_alma:
+        mark = datetime.now(tz=UTC).date().isoformat()
+        entries = modified_entries(task.name, workflow, entries)
+
+    chunk_size = kwargs["chunk_size"]
+    if chunk_size is None:
+        chunk_size = current_app.config["ALMA_TASK_CHUNK_SIZE"]
+
+    if chunk_size > 0:
+        max_parallel_chunks = kwargs["max_parallel_chunks"]
+        if max_parallel_chunks is None:
+            max_parallel_chunks = current_app.config["ALMA_TASK_MAX_PARALLEL_CHUNKS"]
+        dispatch_chunks(
+            task,
+            kwargs,
+            entries,
+            chunk_size,
+            max_parallel_chunks,
+            mark=mark,
+        )
+        return
+
+    counts = Counter()
+    try:
+        entries = PREPARE_ENTRIES.get(task.name, iter)(entries)
+        run_checkpointed(entries, process, checkpoint, counts)
+    except AlmaCircuitOpenError as error:
+        reschedule(task, kwargs, error)
+    except AlmaQuotaExceededError as error:
+        current_app.logger.error(stop_msg, error)
+    else:
+        msg = "finished %s: %s, %s succeeded, %s failed, %s unchanged"
+        progress = checkpoint.progress()
+        current_app.logger.info(
+            msg,
+            checkpoint.key,
+            progress,
+            counts["succeeded"],
+            counts["failed"],
+            counts["unchanged"],
+        )
+        checkpoint.clear()
+        finish_sync(task.name, workflow, mark, counts["failed"])
+
+
+@shared_task(ignore_result=True)
+def create_alma_records(
+    workflow: str | None = None,
+    run_id: str | None = None,
+    chunk_size: int | None = None,
+    max_parallel_chunks: int | None = None,
+) -> None:
+    """Create records within alma from repository records.
+
+    With a chunk_size > 0 the entries are processed by chunk sub-tasks,
+    None takes the value of ALMA_TASK_CHUNK_SIZE.
+    """
+    current_app.logger.info("start creating records in alma")
+    kwargs = {
+        "workflow": workflow,
+        "run_id": run_id,
+        "chunk_size": chunk_size,
+        "max_parallel_chunks": max_parallel_chunks,
+    }
+    with tracing.span("alma.task.run", task=create_alma_records.name):
+        run_task(create_alma_records, kwargs)
+
+
+@shared_task(ignore_result=True)
+def update_repository_records(
+    workflow: str | None = None,
+    run_id: str | None = None,
+    chunk_size: int | None = None,
+    max_parallel_chunks: int | None = None,
+    *,
+    incremental: bool | None = None,
+) -> None:
+    """Update records within the repository from alma records.
+
+    With a chunk_size > 0 the entries are processed by chunk sub-tasks,
+    None takes the value of ALMA_TASK_CHUNK_SIZE. An incremental run only
+    updates the records modified in alma since the last incremental run,
+    None takes the value of ALMA_SYNC_INCREMENTAL.
+    """
+    current_app.logger.info("start updating records in repository from alma")
+    kwargs = {
+        "workflow": workflow,
+        "run_id": run_id,
+        "chunk_size": chunk_size,
+        "max_parallel_chunks": max_parallel_chunks,
+        "incremental": incremental,
+    }
+    with tracing.span("alma.task.run", task=update_repository_records.name):
+        run_task(update_repository_records, kwargs)
+
+
+@shared_task(ignore_result=False)
+def process_chunk(
+    counts: dict | None = None,
+    *,
+    task_name: str,
+    workflow: str,
+    run_id: str | None,
+    entries: list,
+    trace_context: dict | None = None,
+) -> dict:
+    """Process one chunk of entries and add its counts to the previous ones.
+
+    Once a chunk stopped on an exhausted quota or an open circuit, the
+    following chunks of the chain are skipped. The trace context continues
+    the trace of the dispatching run.
+    """
+    counts = Counter(counts or {})
+    chunk = (TaskEntry(*entry) for entry in entries)
+
+    if counts["stopped"]:
+        counts["skipped"] += len(entries)
+        skipped = {"skipped": len(entries)}
+        current_alma.metrics.count_entries(task_name, workflow, skipped)
+        return dict(counts)
+
+    resolved = WORKFLOWS[task_name][0](workflow)
+    if resolved is None:
+        counts["failed"] += len(entries)
+        return dict(counts)
+
+    _, _, process = resolved
+    checkpoint = Checkpoint(current_alma.checkpoint_store, task_name, workflow, run_id)
+
+    parent = tracing.extract(trace_context)
+
+    try:
+        with tracing.span("alma.task.chunk", parent, task=task_name):
+            pending = PREPARE_ENTRIES.get(task_name, iter)(checkpoint.pending(chunk))
+            run_checkpointed(pending, process, checkpoint, counts)
+    except AlmaCircuitOpenError as error:
+        counts["stopped"] = 1
+        # at least 1, summarize_chunks only reschedules for a retry_after
+        counts["retry_after"] = max(1, ceil(error.retry_after))
+    except AlmaQuotaExceededError as error:
+        counts["stopped"] = 1
+        current_app.logger.error(WORKFLOWS[task_name][1], error)
+
+    return dict(counts)
+
+
+@shared_task(ignore_result=True)
+def summarize_chunks(
+    results: list[dict],
+    *,
+    task_name: str,
+    kwargs: dict,
+    mark: str | None = None,
+) -> None:
+    """Sum up the counts of the chunks and finish or reschedule the run."""
+    totals = Counter()
+    for result in results:
+        totals.update(result)
+
+    msg = "finished %s in %s chains: %s succeeded, %s failed, %s unchanged"
+    msg += ", %s skipped"
+    current_app.logger.info(
+        msg,
+        task_name,
+        len(results),
+        totals["succeeded"],
+        totals["failed"],
+        totals["unchanged"],
+        totals["skipped"],
+    )
+
+    if not totals["stopped"]:
+        key = Checkpoint.build_key(task_name, kwargs["workflow"], kwargs["run_id"])
+        current_alma.checkpoint_store.clear(key)
+        finish_sync(task_name, kwargs["workflow"], mark, totals["failed"])
+        return
+
+    if retry_after := max(result.get("retry_after", 0) for result in results):
+        task = TASKS[task_name]
+        msg = f"alma unavailable in {totals['stopped']} chains"
+        error = AlmaCircuitOpenError(code=503, msg=msg, retry_after=retry_after)
+        reschedule(task, kwargs, error)
+
+
+TASKS = {
+    create_alma_records.name: create_alma_records,
+    update_repository_records.name: update_repository_records,
+}
+
+WORKFLOWS = {
+    create_alma_records.name: (
+        create_workflow,
+        "ERROR: stopped creating records in alma. (error: %s)",
+        False,
+    ),
+    update_repository_records.name: (
+        update_workflow,
+        "ERROR: stopped updating records in repository. (error: %s)",
+        True,
+    ),
+}
+"""Workflow builder, stop message and if the task supports incremental syncs.
+
+Only a task which syncs from alma can be incremental, the records to be
+created in alma are not modified in alma yet.
+"""
+
+PREPARE_ENTRIES = {
+    create_alma_records.name: preload_duplicates,
+}
+"""Prepare the pending entries of a task before they are processed."""
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-alma is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Back-pressure on the repository indexing."""
+
+from collections.abc import Callable
+from time import monotonic, sleep
+
+from invenio_search.proxies import current_search_client
+
+
+def pending_index_operations() -> int:
+    """Get the number of pending index operations of the search cluster.
+
+    It is the sum of the queued and active write operations over all
+    nodes and the pending cluster tasks (e.g. mapping updates).
+    """
+    thread_pools = current_search_client.cat.thread_pool(
+        thread_pool_patterns="write",
+        params={"format": "json", "h": "active,queue"},
+    )
+    writes = sum(int(pool["active"]) + int(pool["queue"]) for pool in thread_pools)
+    health = current_search_client.cluster.health()
+    return writes + int(health["number_of_pending_tasks"])
+
+
+class IndexingThrottle:
+    """Adaptive throttle which waits only as long as the indexing needs.
+
+    After each imported record the throttle probes the pending index
+    operations. As long as they are within the max_in_flight window the
+    next record is imported immediately, otherwise the throttle waits
+    with an increasing interval until the cluster caught up.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 10,
+        max_wait: float = 300.0,
+        probe: Callable[[], int] = pending_index_operations,
+    ) -> None:
+        """Create object IndexingThrottle."""
+        self.max_in_flight = max_in_flight
+        self.max_wait = max_wait
+        self.probe = probe
+        self.started = monotonic()
+        self.processed = 0
+        self.waited = 0.0
+
+    def wait(self) -> None:
+        """Count the processed record and wait until the indexing caught up."""
+        self.processed += 1
+        interval = 0.5
+        deadline = monotonic() + self.max_wait
+
+        while self.probe() > self.max_in_flight and monotonic() < deadline:
+            sleep(interval)
+            self.waited += interval
+            interval = min(interval * 2, 10.0)
+
+    @property
+    def elapsed(self) -> float:
+        """Get the seconds since the throttle started."""
+        return monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Get the achieved rate in records per second."""
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def report(self) -> str:
+        """Report the achieved rate."""
+        return (
+            f"processed {self.processed} records in {self.elapsed:.1f}s "
+            f"({self.rate:.2f} records/s, {self.waited:.1f}s waited for indexing)"
+        )
@@ -9,33 +9,124 @@
 
 from __future__ import annotations
 
-import functools
-from collections.abc import Callable
+from collections.abc import Callable, Hashable, Iterable, Iterator
 from datetime import datetime
+from itertools import chain
+from operator import attrgetter
+
+from invenio_search.engine import search
+from invenio_search.proxies import current_search_client
+from invenio_search.utils import prefix_index
 
 from .proxies import current_alma
-from .services.errors import AlmaAPIError
+from .services.errors import (
+    AlmaAPIError,
+    AlmaCircuitOpenError,
+    AlmaQuotaExceededError,
+)
+
 
+def is_duplicate_in_alma(cms_id: str) -> bool:
+    """Check if there is already a record in alma.
 
-def is_duplicate_in_alma(cms_id: str) -> None:
-    """Check if there is already a record in alma."""
+    With the duplicate index the check is answered from the cms ids which
+    the create task looked up in bulk.
+    """
     sru_service = current_alma.alma_sru_service
     search_key = "local_field_995"
 
     try:
+        if index := current_alma.duplicate_index:
+            return index.is_duplicate(cms_id)
         record = sru_service.get_record(cms_id, search_key)
         return len(record) > 0
+    except (AlmaCircuitOpenError, AlmaQuotaExceededError):
+        raise
     except AlmaAPIError:
         return False
 
 
-def apply_aggregators(aggregators: list[Callable[[], list]]) -> list:
-    """Apply aggregators."""
+def apply_aggregators(
+    aggregators: Iterable[Callable[[], Iterable]],
+    *,
+    unique: bool = False,
+) -> list:
+    """Apply aggregators and collect their entries in a list.
+
+    With unique the entries with an already seen pid are skipped.
+    """
+    return list(iter_aggregators(aggregators, unique=unique))
+
+
+def iter_aggregators(
+    aggregators: Iterable[Callable[[], Iterable]],
+    *,
+    unique: bool = False,
+) -> Iterator:
+    """Apply aggregators lazily one after the other.
+
+    An aggregator is only called when the entries of the previous one are
+    consumed. With unique the entries with an already seen pid are skipped.
+    """
+    entries = chain.from_iterable(aggregator() for aggregator in aggregators)
+    return unique_entries(entries) if unique else entries
+
+
+def unique_entries(
+    entries: Iterable,
+    key: Callable[..., Hashable] = attrgetter("pid"),
+) -> Iterator:
+    """Skip the entries with an already seen key.
+
+    Only the keys are kept in memory, not the entries.
+    """
+    seen: set[Hashable] = set()
+    for entry in entries:
+        entry_key = key(entry)
+        if entry_key in seen:
+            continue
+        seen.add(entry_key)
+        yield entry
+
+
+def scan_entries(
+    index: str,
+    query: dict,
+    to_entry: Callable[[dict], tuple],
+    *,
+    size: int = 100,
+    scroll: str = "30m",
+) -> Iterator:
+    """Stream the hits of the query as entries for the aggregators.
+
+    The hits are fetched page by page with a scroll cursor, so only one
+    page is held in memory. The next page is fetched after the task
+    processed the entries of the page, each costs at least one alma call.
+    The scroll lifetime has to cover processing a whole page, otherwise the
+    cursor expires and the run fails, e.g. 100 entries at 0.6s take a
+    minute. It is the building block for aggregators, e.g.
 
-    def func(accumulator: list, aggregator: Callable) -> list:
-        return accumulator + aggregator()
+        def aggregator():
+            query = {"query": {"term": {"access.record": "public"}}}
+            yield from scan_entries("rdmrecords-records", query, to_entry)
 
-    return functools.reduce(func, aggregators, [])
+    :param index (str): index name without the prefix
+    :param query (dict): search body
+    :param to_entry (Callable): builds the entry of a hit
+    :param size (int): hits per page
+    :param scroll (str): lifetime of the scroll cursor between pages, it
+        has to be longer than processing size entries
+    """
+    hits = search.helpers.scan(
+        current_search_client,
+        query=query,
+        index=prefix_index(index),
+        size=size,
+        scroll=scroll,
+        preserve_order=False,
+    )
+    for hit in hits:
+        yield to_entry(hit)
 
 
 def validate_date(date: str) -> bool:
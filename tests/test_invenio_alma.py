@@ -7,9 +7,25 @@
 
 """Module tests."""
 
+from collections import Counter
+from collections.abc import Callable, Iterator
+from types import SimpleNamespace
+
 from flask import Flask
 
 from invenio_alma import InvenioAlma, __version__
+from invenio_alma.checkpoints import Checkpoint, MemoryCheckpointStore
+from invenio_alma.executors import run_entries
+from invenio_alma.tasks import (
+    TaskEntry,
+    chunked,
+    create_alma_records,
+    run_checkpointed,
+    run_task,
+    update_repository_records,
+)
+from invenio_alma.throttle import IndexingThrottle
+from invenio_alma.utils import apply_aggregators, iter_aggregators
 
 
 def test_version() -> None:
@@ -41,3 +57,153 @@ def test_init() -> None:
 
     ext.init_app(app)
     assert "invenio-alma" in app.extensions
+
+
+def test_run_entries() -> None:
+    """Test the entries are processed concurrently with isolated errors."""
+    app = Flask("testapp")
+    processed = []
+
+    def process(entry: int) -> None:
+        if entry == 0:
+            msg = "entry fails"
+            raise ValueError(msg)
+        processed.append(entry)
+
+    with app.app_context():
+        run_entries(iter(range(10)), process, concurrency=3)
+
+    assert sorted(processed) == list(range(1, 10))
+
+
+def test_checkpoint_resume() -> None:
+    """Test a resumed run skips the entries processed by the stopped run."""
+    store = MemoryCheckpointStore()
+    entries = [SimpleNamespace(pid=str(pid)) for pid in range(5)]
+
+    checkpoint = Checkpoint(store, "task", "workflow", "run")
+    for entry in checkpoint.pending(entries[:2]):
+        checkpoint.mark_done(entry.pid)
+
+    resumed = Checkpoint(store, "task", "workflow", "run")
+    pending = [entry.pid for entry in resumed.pending(entries)]
+    assert pending == ["2", "3", "4"]
+    assert resumed.progress() == "2/5 entries (2 resumed)"
+
+    resumed.clear()
+    assert not Checkpoint(store, "task", "workflow", "run").resumed
+
+
+def test_chunked() -> None:
+    """Test the entries are split into chunks which survive serialization."""
+    entries = (TaskEntry(str(pid), f"AC{pid}") for pid in range(5))
+    chunks = list(chunked(entries, 2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert TaskEntry(*list(chunks[2][0])).cms_id == "AC4"
+
+
+def test_failed_entries_are_not_checkpointed() -> None:
+    """Test a resumed run processes the failed entries again."""
+    app = Flask("testapp")
+    ext = InvenioAlma(app)
+    entries = [TaskEntry("1", "AC1"), TaskEntry("2", "AC2")]
+    outcomes = {"1": "succeeded", "2": "failed"}
+
+    with app.app_context():
+        checkpoint = Checkpoint(ext.checkpoint_store, "task", "workflow", "run")
+        counts: Counter = Counter()
+        run_checkpointed(entries, lambda e: outcomes[e.pid], checkpoint, counts)
+
+    resumed = Checkpoint(ext.checkpoint_store, "task", "workflow", "run")
+    assert counts == {"succeeded": 1, "failed": 1}
+    assert [entry.pid for entry in resumed.pending(entries)] == ["2"]
+
+
+def test_create_task_is_not_incremental() -> None:
+    """Test the create task processes all entries with incremental syncs on."""
+    created = []
+
+    def create(_: object, pid: str, *__: object) -> None:
+        created.append(pid)
+
+    app = Flask("testapp")
+    app.config.update(
+        ALMA_SYNC_INCREMENTAL=True,
+        ALMA_DUPLICATE_INDEX_MAX_AGE=0,
+        ALMA_ALMA_RECORDS_CREATE_AGGREGATORS={
+            "wf": lambda: [TaskEntry("1", "AC1"), TaskEntry("2", "AC2")],
+        },
+        ALMA_ALMA_RECORDS_CREATE_FUNCS={"wf": create},
+    )
+    ext = InvenioAlma(app)
+    ext.checkpoint_store.set_mark(f"{create_alma_records.name}:wf", "2026-01-01")
+
+    kwargs = {"workflow": "wf", "run_id": None, "chunk_size": 0}
+    with app.app_context():
+        run_task(create_alma_records, {**kwargs, "max_parallel_chunks": None})
+
+    assert created == ["1", "2"]
+
+
+def test_failed_sync_keeps_the_mark() -> None:
+    """Test the high-water mark is kept if entries of the sync failed."""
+
+    def update(_: object, pid: str, *__: object) -> None:
+        if pid == "2":
+            msg = "update failed"
+            raise RuntimeError(msg)
+
+    app = Flask("testapp")
+    app.config.update(
+        ALMA_SYNC_INCREMENTAL=True,
+        ALMA_REPOSITORY_RECORDS_UPDATE_AGGREGATORS={
+            "wf": lambda: [TaskEntry("1", "AC1"), TaskEntry("2", "AC2")],
+        },
+        ALMA_REPOSITORY_RECORDS_UPDATE_FUNCS={"wf": update},
+    )
+    ext = InvenioAlma(app)
+    key = f"{update_repository_records.name}:wf"
+    ext.checkpoint_store.set_mark(key, "2026-01-01")
+
+    kwargs = {"workflow": "wf", "run_id": None, "chunk_size": 0}
+    with app.app_context():
+        ext.alma_sru_service.modified_since = lambda _: {"AC1", "AC2"}
+        run_task(update_repository_records, {**kwargs, "max_parallel_chunks": None})
+
+    assert ext.checkpoint_store.get_mark(key) == "2026-01-01"
+
+
+def test_apply_aggregators() -> None:
+    """Test the aggregators are chained lazily and the pids deduplicated."""
+    calls = []
+
+    def aggregator(pids: str) -> Callable[[], Iterator[TaskEntry]]:
+        def aggregate() -> Iterator[TaskEntry]:
+            calls.append(pids)
+            yield from (TaskEntry(pid, f"AC{pid}") for pid in pids)
+
+        return aggregate
+
+    entries = iter_aggregators([aggregator("ab"), aggregator("bc")], unique=True)
+    assert next(entries).pid == "a"
+    assert calls == ["ab"]
+    assert [entry.pid for entry in entries] == ["b", "c"]
+
+    assert apply_aggregators([lambda: [1, 2], lambda: [2]]) == [1, 2, 2]
+
+
+def test_indexing_throttle() -> None:
+    """Test the throttle waits only while the indexing is behind."""
+    pending = iter([20, 0, 0])
+    expected_processed = 2
+    throttle = IndexingThrottle(max_in_flight=10, probe=lambda: next(pending))
+
+    throttle.wait()
+    assert throttle.waited > 0
+
+    waited = throttle.waited
+    throttle.wait()
+    assert throttle.waited == waited
+    assert throttle.processed == expected_processed
+    assert "records/s" in throttle.report()
@@ -7,8 +7,62 @@
 
 """Test Alma Services."""
 
-from invenio_alma.services.rest import AlmaRESTConfig, AlmaRESTUrls
-from invenio_alma.services.sru import AlmaSRUConfig, AlmaSRUUrls
+import asyncio
+import gzip
+import time
+from datetime import date
+from http import HTTPStatus
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import requests
+
+from invenio_alma.services import ratelimit
+from invenio_alma.services.aio import AsyncAlmaRESTService
+from invenio_alma.services.bulk import BulkFieldUpdater, BulkUpdateState
+from invenio_alma.services.cache import MemoryRecordCache, record_cache_keys
+from invenio_alma.services.circuit import AlmaCircuitBreaker
+from invenio_alma.services.config import (
+    AlmaCircuitConfig,
+    AlmaRateLimitConfig,
+    AlmaRetryConfig,
+    AlmaSessionConfig,
+)
+from invenio_alma.services.duplicates import AlmaDuplicateIndex
+from invenio_alma.services.errors import (
+    AlmaAPIError,
+    AlmaCircuitOpenError,
+    AlmaQuotaExceededError,
+    AlmaRESTError,
+)
+from invenio_alma.services.fingerprints import AlmaFingerprints
+from invenio_alma.services.metrics import AlmaMetrics, MemoryMetricsExporter
+from invenio_alma.services.parsers import ElementTreeParser, LxmlParser, XMLParser
+from invenio_alma.services.ratelimit import (
+    REMAINING_HEADER,
+    AlmaRateLimiter,
+    MemoryRateLimitStore,
+    rate_limit_key,
+)
+from invenio_alma.services.rest import (
+    AlmaREST,
+    AlmaRESTConfig,
+    AlmaRESTService,
+    AlmaRESTUrls,
+)
+from invenio_alma.services.retry import AlmaRetryPolicy
+from invenio_alma.services.session import AlmaSession
+from invenio_alma.services.sru import (
+    AlmaSRU,
+    AlmaSRUConfig,
+    AlmaSRUService,
+    AlmaSRUUrls,
+)
+from invenio_alma.services.tracing import tracing
+from invenio_alma.services.utils import jpath_to_xpath
 
 
 def test_alma_rest_urls() -> None:
@@ -39,3 +93,468 @@ def test_alma_sru_urls() -> None:
     expected_parameters = f"version=1.2&operation=searchRetrieve&{expected_query}"
     expected = f"{domain}/view/sru/{institution_code}?{expected_parameters}"
     assert urls.url(search_value) == expected
+
+    assert "query=alma.mms_id=99" in urls.url("99", "mms_id")
+    assert urls.search_key == search_key
+
+
+def test_alma_session() -> None:
+    """Test the pooled session is shared and closed by the service."""
+    pool_maxsize = 4
+    session = AlmaSession(
+        AlmaSessionConfig(pool_maxsize=pool_maxsize, keep_alive=False),
+    )
+    config = AlmaRESTConfig("key", "https://host", "30")
+    service = AlmaRESTService(config, session=session)
+
+    assert service.session is session
+    adapter = session.session.get_adapter("https://host")
+    assert adapter._pool_maxsize == pool_maxsize
+    assert session.session.headers["connection"] == "close"
+
+    service.close()
+    assert session._session is None
+
+
+def test_alma_session_compression() -> None:
+    """Test only large request bodies are compressed and gzip is accepted."""
+    session = AlmaSession(AlmaSessionConfig(compress_requests=True))
+    body, headers = session.compress_body("<bib>" + "x" * 2000 + "</bib>")
+
+    assert gzip.decompress(body).startswith(b"<bib>")
+    assert headers == {"content-encoding": "gzip"}
+    assert session.compress_body("<bib/>") == (b"<bib/>", {})
+    assert AlmaREST(session=session).headers["accept-encoding"] == "gzip, deflate"
+
+
+def test_alma_rate_limiter() -> None:
+    """Test the token bucket and the daily quota of the rate limiter."""
+    store = MemoryRateLimitStore()
+    assert store.take("key", rate=10, burst=2) == 0
+    assert store.take("key", rate=10, burst=2) == 0
+    assert store.take("key", rate=10, burst=2) > 0
+
+    config = AlmaRateLimitConfig(per_second=0, daily_slowdown=100, daily_reserve=10)
+    limiter = AlmaRateLimiter(config, rate_limit_key("api_key", "host"))
+    limiter.acquire()
+
+    store = limiter.store
+    store.set_remaining(limiter.key, 10)
+    with pytest.raises(AlmaQuotaExceededError):
+        limiter.acquire()
+
+    limiter.config.max_wait = 0
+    store.set_remaining(limiter.key, 11)
+    with pytest.raises(AlmaQuotaExceededError):
+        limiter.acquire()
+
+
+def test_alma_rate_limiter_reset(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the remaining calls reported by alma expire at the daily reset."""
+    config = AlmaRateLimitConfig(per_second=0, daily_slowdown=100, daily_reserve=10)
+    limiter = AlmaRateLimiter(config, "key")
+    limiter.update(SimpleNamespace(headers={REMAINING_HEADER: "5"}))
+    with pytest.raises(AlmaQuotaExceededError):
+        limiter.acquire()
+
+    monkeypatch.setattr(ratelimit, "utc_day", lambda: "2999-01-01")
+    limiter.acquire()
+    assert limiter.store.get_remaining(limiter.key) is None
+
+
+def test_alma_record_cache() -> None:
+    """Test the lru, ttl and not found caching of the record cache."""
+    cache = MemoryRecordCache(maxsize=2, ttl=60, negative_ttl=60)
+    cache.set("mms_id", "1", [b"<record/>"])
+    cache.set("mms_id", "2", [])
+    cache.set("mms_id", "3", [b"<record/>"])
+
+    assert cache.get("mms_id", "1") is None
+    assert cache.get("mms_id", "2") == []
+    assert cache.get("mms_id", "3") == [b"<record/>"]
+
+    record = AlmaSRU().parse_alma_record(
+        '<record><controlfield tag="001">3</controlfield>'
+        '<datafield tag="995"><subfield code="a">cms</subfield></datafield>'
+        "</record>",
+    )
+    assert list(record_cache_keys(record)) == [
+        ("mms_id", "3"),
+        ("local_field_995", "cms"),
+    ]
+
+    cache.invalidate_record(record)
+    assert cache.get("mms_id", "3") is None
+
+
+def test_alma_sru_batches() -> None:
+    """Test the search values are packed into batches within the url limit."""
+    config = AlmaSRUConfig("", "https://domain", "code", max_url_length=200)
+    urls = AlmaSRUUrls(config)
+
+    url = urls.url_batch(["AC1", "AC2"], "local_control_field_009")
+    assert "maximumRecords=50&startRecord=1" in url
+    assert "alma.local_control_field_009=AC1%20or%20alma" in url
+
+    values = [f"AC{number:08}" for number in range(20)]
+    batches = list(urls.batches(values, "local_control_field_009"))
+    assert len(batches) > 1
+    assert [value for batch in batches for value in batch] == values
+    assert all(
+        len(urls.url_batch(batch, "local_control_field_009")) <= config.max_url_length
+        for batch in batches
+    )
+
+
+@pytest.mark.parametrize("parser", [ElementTreeParser(), LxmlParser()])
+def test_alma_api_iter_records(parser: XMLParser) -> None:
+    """Test the records are streamed and removed from the tree."""
+    sru = AlmaSRU(parser=parser)
+    records = "".join(
+        "<record><recordData>"
+        '<record xmlns="http://www.loc.gov/MARC21/slim">'
+        f'<controlfield tag="001">{mms_id}</controlfield>'
+        "</record></recordData></record>"
+        for mms_id in ("1", "2")
+    )
+    response = (
+        '<searchRetrieveResponse xmlns="http://www.loc.gov/zing/srw/">'
+        f"<numberOfRecords>2</numberOfRecords><records>{records}</records>"
+        "</searchRetrieveResponse>"
+    )
+
+    fields: dict[str, str] = {}
+    stream = BytesIO(response.encode("utf-8"))
+    mms_ids = [record[0].text for record in sru.iter_alma_records(stream, fields)]
+
+    assert mms_ids == ["1", "2"]
+    assert fields == {"{http://www.loc.gov/zing/srw/}numberOfRecords": "2"}
+
+
+def test_alma_sru_modified_since() -> None:
+    """Test the modified records are searched by date and removed from the cache."""
+    record = (
+        '<record xmlns="http://www.loc.gov/MARC21/slim">'
+        '<controlfield tag="001">99</controlfield>'
+        '<datafield tag="995"><subfield code="i">cms1</subfield></datafield>'
+        "</record>"
+    )
+    urls = []
+    cache = MemoryRecordCache()
+    cache.set("mms_id", "99", [record.encode("utf-8")])
+    config = AlmaSRUConfig("mms_id", "https://alma", "INST")
+    service = AlmaSRUService(config, cache=cache)
+
+    def get_iter(url: str, _: dict) -> list:
+        urls.append(url)
+        return [service.service.parse_alma_record(record)]
+
+    service.service.get_iter = get_iter
+
+    assert service.modified_since(date(2026, 1, 2)) == {"99", "cms1"}
+    assert "alma.modification_date%3E=2026-01-02" in urls[0]
+    assert cache.get("mms_id", "99") is None
+
+
+def test_alma_sru_get_records_by_search_key() -> None:
+    """Test a record is not mapped to an id it only cites in 773$w."""
+    record = (
+        '<record xmlns="http://www.loc.gov/MARC21/slim">'
+        '<controlfield tag="001">{}</controlfield>'
+        '<datafield tag="773"><subfield code="w">{}</subfield></datafield>'
+        "</record>"
+    )
+    service = AlmaSRUService(AlmaSRUConfig("mms_id", "https://alma", "INST"))
+    parse = service.service.parse_alma_record
+    service.service.get_iter = lambda *_: [
+        parse(record.format("1", "")),
+        parse(record.format("2", "1")),
+    ]
+
+    records = service.get_records(["1", "2"], "mms_id")
+
+    assert [len(records["1"]), len(records["2"])] == [1, 1]
+    assert records["1"][0][0].text == "1"
+
+
+def test_alma_sru_get_records_normalized() -> None:
+    """Test the 995 values match normalized and a single value by any hit."""
+    record = (
+        '<record xmlns="http://www.loc.gov/MARC21/slim">'
+        '<datafield tag="995"><subfield code="a">{}</subfield></datafield>'
+        "</record>"
+    )
+    service = AlmaSRUService(AlmaSRUConfig("mms_id", "https://alma", "INST"))
+    parse = service.service.parse_alma_record
+    service.service.get_iter = lambda *_: [parse(record.format(" ac1 "))]
+
+    records = service.get_records(["AC1", "AC2"], "local_field_995")
+    assert [len(records["AC1"]), len(records["AC2"])] == [1, 0]
+
+    service.service.get_iter = lambda *_: [parse(record.format("AC 3"))]
+    assert len(service.get_records(["AC3"], "local_field_995")["AC3"]) == 1
+
+
+def test_alma_fingerprints() -> None:
+    """Test unchanged records are detected despite a new 005 and whitespace."""
+    record = (
+        '<record xmlns="http://www.loc.gov/MARC21/slim">'
+        '<controlfield tag="005">{}</controlfield>'
+        '<datafield tag="245" ind1="1" ind2="0"><subfield code="a">{}</subfield>'
+        "</datafield></record>"
+    )
+    sru = AlmaSRU()
+    fingerprints = AlmaFingerprints()
+
+    fingerprints.remember("99", [sru.parse_alma_record(record.format("1", "T"))])
+    reimported = [sru.parse_alma_record(record.format("2", " T "))]
+    changed = [sru.parse_alma_record(record.format("2", "T2"))]
+
+    assert fingerprints.is_unchanged("99", reimported)
+    assert not fingerprints.is_unchanged("99", changed)
+
+
+def test_alma_duplicate_index() -> None:
+    """Test the cms ids are looked up in bulk and again once outdated."""
+    calls: list[list[str]] = []
+
+    class Service:
+        def get_records(self, cms_ids: list[str], _: str) -> dict[str, list]:
+            calls.append(cms_ids)
+            return {
+                cms_id: ["<record/>"] if cms_id == "1" else [] for cms_id in cms_ids
+            }
+
+    index = AlmaDuplicateIndex(Service(), max_age=60)
+    index.preload(["1", "2", "1"])
+    index.add("3")
+
+    assert (index.is_duplicate("1"), index.is_duplicate("2")) == (True, False)
+    assert index.is_duplicate("3")
+    assert calls == [["1", "2"]]
+
+    index.max_age = 0
+    assert index.is_duplicate("2") is False
+    assert calls == [["1", "2"], ["2"]]
+
+
+def test_bulk_field_updater(tmp_path: Path) -> None:
+    """Test the bulk updater skips unchanged and resumes from the state file."""
+
+    class Service:
+        def update_field(self, mms_id: str, _: str, new_value: str) -> str | None:
+            if mms_id == "error":
+                raise AlmaRESTError(code=500, msg="error")
+            if mms_id == "reset":
+                raise requests.ConnectionError
+            if mms_id == "down":
+                raise AlmaCircuitOpenError(code=503, msg="down", retry_after=60)
+            return None if new_value == "same" else "<bib/>"
+
+    rows = [("1", "new"), ("2", "same"), ("error", "new")]
+    state_file = tmp_path / "state.jsonl"
+
+    updater = BulkFieldUpdater(Service(), "856.4._.u", 1, BulkUpdateState(state_file))
+    result = updater.run(rows)
+    assert (result.updated, result.unchanged, result.failed) == (1, 1, 1)
+    assert "error" in result.errors
+
+    updater = BulkFieldUpdater(Service(), "856.4._.u", 1, BulkUpdateState(state_file))
+    result = updater.run(rows)
+    assert (result.resumed, result.failed) == (2, 1)
+
+    updater = BulkFieldUpdater(Service(), "856.4._.u", 1)
+    result = updater.run([("reset", "new"), ("down", "new"), ("3", "new")])
+    assert (result.failed, result.updated) == (1, 0)
+    assert "msg='down'" in result.stopped
+
+
+@pytest.mark.parametrize("parser", [ElementTreeParser(), LxmlParser()])
+def test_alma_rest_update_field(parser: XMLParser) -> None:
+    """Test the json path finds the subfield and only changes are put."""
+    assert jpath_to_xpath("856.4._.u") == (
+        ".//*[local-name()='datafield'][@tag='856'][@ind1='4'][@ind2=' ']"
+        "/*[local-name()='subfield'][@code='u']"
+    )
+    with pytest.raises(ValueError, match="invalid tag"):
+        jpath_to_xpath("85.4._.u")
+
+    response = (
+        "<bibs><bib><record>"
+        '<controlfield tag="001">99</controlfield>'
+        '<datafield tag="856" ind1="4" ind2=" "><subfield code="u">old</subfield>'
+        "</datafield></record></bib></bibs>"
+    )
+    puts = []
+
+    def request(method: str, _: str, **kwargs: bytes) -> SimpleNamespace:
+        if method == "PUT":
+            puts.append(kwargs["data"])
+        return SimpleNamespace(status_code=200, text=response, headers={})
+
+    config = AlmaRESTConfig("key", "https://host", "30")
+    service = AlmaRESTService(config, service=AlmaREST(parser=parser))
+    service.session.request = request
+
+    assert service.update_field("99", "856.4._.u", "old") is None
+    assert service.update_field("99", "856.4._.u", "new") is not None
+    assert len(puts) == 1
+    assert b'<subfield code="u">new</subfield>' in puts[0]
+
+
+def test_alma_retry_policy() -> None:
+    """Test transient failures are retried and POST only on 429."""
+    statuses = [503, 429, 200, 503, 503]
+
+    def request(*_: str, **__: bytes) -> SimpleNamespace:
+        status = statuses.pop(0)
+        return SimpleNamespace(
+            status_code=status,
+            text="<bibs/>",
+            headers={},
+            close=lambda: None,
+        )
+
+    config = AlmaRetryConfig(max_attempts=3, backoff_factor=0.001)
+    rest = AlmaREST(retry=AlmaRetryPolicy(config))
+    rest.session.request = request
+
+    get = rest.request("GET", "url")
+    post = rest.request("POST", "url")
+    retries = rest.retry.stats.as_dict()["retries"]
+    assert (get.status_code, post.status_code, retries) == (200, 503, 2)
+
+
+def test_alma_conditional_get() -> None:
+    """Test a not modified response is served from the validated cache."""
+    body = '<bibs><bib><record><controlfield tag="001">99</controlfield></record></bib></bibs>'
+    sent_headers = []
+
+    def request(*_: str, **kwargs: dict) -> SimpleNamespace:
+        sent_headers.append(kwargs["headers"])
+        if "If-None-Match" in kwargs["headers"]:
+            return SimpleNamespace(status_code=304, text="", headers={})
+        return SimpleNamespace(status_code=200, text=body, headers={"ETag": '"v1"'})
+
+    rest = AlmaREST(cache=MemoryRecordCache())
+    rest.session.request = request
+
+    first = rest.get("https://alma/bibs?mms_id=99")
+    second = rest.get("https://alma/bibs?mms_id=99")
+
+    assert sent_headers[1]["If-None-Match"] == '"v1"'
+    assert [record[0].text for record in (*first, *second)] == ["99", "99"]
+
+
+def test_alma_metrics() -> None:
+    """Test the requests are recorded per operation with errors and bytes."""
+    body = '<bibs><bib><record><controlfield tag="001">99</controlfield></record></bib></bibs>'
+    statuses = [200, 404]
+
+    def request(*_: str, **__: dict) -> SimpleNamespace:
+        headers = {"content-length": str(len(body))}
+        return SimpleNamespace(status_code=statuses.pop(0), text=body, headers=headers)
+
+    exporter = MemoryMetricsExporter()
+    rest = AlmaREST(metrics=AlmaMetrics(exporter))
+    rest.session.request = request
+
+    rest.get("url")
+    with pytest.raises(AlmaAPIError):
+        rest.get("url")
+
+    operation = ("operation", "rest_get")
+    durations = exporter.observations[("alma_request_duration_seconds", operation)]
+    parses = exporter.observations[
+        ("alma_parse_duration_seconds", ("operation", "rest"))
+    ]
+    errors = ("alma_request_errors_total", ("code", "404"), operation)
+    assert (len(durations), len(parses), exporter.counters[errors]) == (2, 1, 1)
+    assert exporter.counters[("alma_response_bytes_total", operation)] == 2 * len(body)
+
+
+def test_alma_tracing() -> None:
+    """Test the alma calls are traced and the context reaches a sub-task."""
+    pytest.importorskip("opentelemetry.sdk")
+    body = '<bibs><bib><record><controlfield tag="001">99</controlfield></record></bib></bibs>'
+
+    def request(*_: str, **__: dict) -> SimpleNamespace:
+        return SimpleNamespace(status_code=200, text=body, headers={})
+
+    exporter = tracing.in_memory_exporter()
+    rest = AlmaREST()
+    rest.session.request = request
+
+    try:
+        with tracing.span("alma.task.run"):
+            rest.get("url")
+            carrier = tracing.inject()
+        with tracing.span("alma.task.chunk", tracing.extract(carrier)):
+            pass
+    finally:
+        tracing.use_provider(None)
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    run = spans["alma.task.run"].context
+    assert (
+        spans["alma.rest.request"].parent.span_id
+        == spans["alma.rest.get"].context.span_id
+    )
+    assert spans["alma.rest.extract_records"].context.trace_id == run.trace_id
+    assert spans["alma.task.chunk"].parent.span_id == run.span_id
+
+
+def test_alma_circuit_breaker() -> None:
+    """Test the circuit opens on failures, fails fast and closes on a probe."""
+    statuses = [503, 503, 200, 200]
+    calls = []
+
+    def request(*_: str, **__: bytes) -> SimpleNamespace:
+        calls.append(1)
+        return SimpleNamespace(status_code=statuses.pop(0), headers={})
+
+    config = AlmaCircuitConfig(failure_threshold=2, reset_timeout=0.05)
+    rest = AlmaREST(circuit=AlmaCircuitBreaker(config, "host"))
+    rest.session.request = request
+
+    rest.request("GET", "url")
+    rest.request("GET", "url")
+    with pytest.raises(AlmaCircuitOpenError):
+        rest.request("GET", "url")
+    assert len(calls) == len(["failure", "failure"])
+
+    time.sleep(0.06)
+    assert rest.request("GET", "url").status_code == HTTPStatus.OK
+    assert "host" not in rest.circuit.store.circuits
+
+    assert rest.request("GET", "url").status_code == HTTPStatus.OK
+    assert len(calls) == len(["failure", "failure", "probe", "closed"])
+
+
+def test_async_alma_rest_service() -> None:
+    """Test the async service fetches and updates many records at once."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "PUT":
+            return httpx.Response(200, text="<bib/>")
+        mms_id = request.url.params["mms_id"]
+        if mms_id == "404":
+            return httpx.Response(404, text="not found")
+        return httpx.Response(
+            200,
+            text=f'<bibs><bib><record><controlfield tag="001">{mms_id}</controlfield>'
+            '<datafield tag="856" ind1="4" ind2=" "><subfield code="u">old</subfield>'
+            "</datafield></record></bib></bibs>",
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    config = AlmaRESTConfig("key", "https://host", "30")
+    service = AsyncAlmaRESTService(config, client=client)
+
+    records = asyncio.run(service.get_records(["1", "2", "404"]))
+    assert records["1"][0][0].text == "1"
+    assert isinstance(records["404"], AlmaAPIError)
+
+    rows = [("1", "old"), ("2", "new")]
+    results = asyncio.run(service.update_fields(rows, "856.4._.u"))
+    assert results == {"1": None, "2": "<bib/>"}